@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Tokenizer micro-benchmark: regex asosidagi `Tokenizer` ni eski belgima-belgi
+ishlaydigan lekser bilan solishtiradi (natijalar bir xilligi ham tekshiriladi).
+
+    python3 bench_tokenizer.py
+"""
+
+import time
+
+from uzdb_final import Token, TokenTuri, Tokenizer
+
+
+# Eski lekser (solishtirish uchun o'zgarishsiz nusxa)
+class EskiTokenizer:
+    KALIT_SOZLAR = Tokenizer.KALIT_SOZLAR
+    
+    def __init__(self, matn: str):
+        self.matn = matn
+        self.pozitsiya = 0
+        self.tokens: list = []
+    
+    def tokenizatsiya(self) -> list:
+        while self.pozitsiya < len(self.matn):
+            self._keyingi_token()
+        self.tokens.append(Token(TokenTuri.EOF, '', self.pozitsiya))
+        return self.tokens
+    
+    def _keyingi_token(self):
+        self._bosh_joy_otkazish()
+        if self.pozitsiya >= len(self.matn):
+            return
+        
+        ch = self.matn[self.pozitsiya]
+        
+        if ch == '=' and self._peek(1) != '=':
+            self._token_qosh(TokenTuri.TENG, '=')
+        elif ch == '!' and self._peek(1) == '=':
+            self._token_qosh(TokenTuri.TENG_EMAS, '!=', 2)
+        elif ch == '<' and self._peek(1) == '>':
+            self._token_qosh(TokenTuri.TENG_EMAS, '<>', 2)
+        elif ch == '<' and self._peek(1) == '=':
+            self._token_qosh(TokenTuri.KICHIK_TENG, '<=', 2)
+        elif ch == '>' and self._peek(1) == '=':
+            self._token_qosh(TokenTuri.KATTA_TENG, '>=', 2)
+        elif ch == '<':
+            self._token_qosh(TokenTuri.KICHIK, '<')
+        elif ch == '>':
+            self._token_qosh(TokenTuri.KATTA, '>')
+        elif ch == ',':
+            self._token_qosh(TokenTuri.VERGUL, ',')
+        elif ch == '(':
+            self._token_qosh(TokenTuri.OCHIQ_QAVS, '(')
+        elif ch == ')':
+            self._token_qosh(TokenTuri.YOPIQ_QAVS, ')')
+        elif ch == '*':
+            self._token_qosh(TokenTuri.YULDUZCHA, '*')
+        elif ch == '?':
+            self._token_qosh(TokenTuri.PARAMETR, '?')
+        elif ch == ':' and (self._peek(1).isalpha() or self._peek(1) == '_'):
+            self._parametr_oqish()
+        elif ch == "'":
+            self._satr_oqish()
+        elif ch.isdigit() or (ch == '-' and self._peek(1).isdigit()):
+            self._son_oqish()
+        elif ch.isalpha() or ch == '_':
+            self._identifikator_oqish()
+        else:
+            raise SyntaxError(f"Noma'lum belgi: '{ch}'")
+    
+    def _peek(self, offset=0) -> str:
+        pos = self.pozitsiya + offset
+        return self.matn[pos] if pos < len(self.matn) else ''
+    
+    def _bosh_joy_otkazish(self):
+        while self.pozitsiya < len(self.matn):
+            ch = self.matn[self.pozitsiya]
+            if ch in ' \t\n\r':
+                self.pozitsiya += 1
+            elif ch == '-' and self._peek(1) == '-':
+                while self.pozitsiya < len(self.matn) and self.matn[self.pozitsiya] != '\n':
+                    self.pozitsiya += 1
+            else:
+                break
+    
+    def _token_qosh(self, turi, qiymat, uzunlik=1):
+        self.tokens.append(Token(turi, qiymat, self.pozitsiya))
+        self.pozitsiya += uzunlik
+    
+    def _satr_oqish(self):
+        start = self.pozitsiya
+        self.pozitsiya += 1
+        qiymat = ''
+        while self.pozitsiya < len(self.matn):
+            ch = self.matn[self.pozitsiya]
+            if ch == "'":
+                if self._peek(1) == "'":
+                    qiymat += "'"
+                    self.pozitsiya += 2
+                else:
+                    self.pozitsiya += 1
+                    self.tokens.append(Token(TokenTuri.SATR, qiymat, start))
+                    return
+            else:
+                qiymat += ch
+                self.pozitsiya += 1
+        raise SyntaxError("Yopilmagan string")
+    
+    def _son_oqish(self):
+        start = self.pozitsiya
+        qiymat = ''
+        if self.matn[self.pozitsiya] == '-':
+            qiymat += '-'
+            self.pozitsiya += 1
+        while self.pozitsiya < len(self.matn) and self.matn[self.pozitsiya].isdigit():
+            qiymat += self.matn[self.pozitsiya]
+            self.pozitsiya += 1
+        if self.pozitsiya < len(self.matn) and self.matn[self.pozitsiya] == '.':
+            qiymat += '.'
+            self.pozitsiya += 1
+            while self.pozitsiya < len(self.matn) and self.matn[self.pozitsiya].isdigit():
+                qiymat += self.matn[self.pozitsiya]
+                self.pozitsiya += 1
+        self.tokens.append(Token(TokenTuri.SON, qiymat, start))
+    
+    def _parametr_oqish(self):
+        start = self.pozitsiya
+        self.pozitsiya += 1
+        while self.pozitsiya < len(self.matn) and (self.matn[self.pozitsiya].isalnum() or self.matn[self.pozitsiya] == '_'):
+            self.pozitsiya += 1
+        self.tokens.append(Token(TokenTuri.PARAMETR, self.matn[start + 1:self.pozitsiya], start))
+    
+    def _identifikator_oqish(self):
+        start = self.pozitsiya
+        qiymat = ''
+        while self.pozitsiya < len(self.matn):
+            ch = self.matn[self.pozitsiya]
+            if ch.isalnum() or ch in "_'":
+                qiymat += ch
+                self.pozitsiya += 1
+            else:
+                break
+        upper = qiymat.upper()
+        if upper in self.KALIT_SOZLAR:
+            self.tokens.append(Token(self.KALIT_SOZLAR[upper], qiymat, start))
+        else:
+            self.tokens.append(Token(TokenTuri.IDENTIFIKATOR, qiymat, start))
+
+
+def _ish_yuklamalari():
+    qatorlar = ", ".join(f"({i}, 'Ism {i}', 'Familiya', {20 + i % 50}, 'user{i}@mail.uz', {i * 1.5})"
+                         for i in range(5000))
+    return {
+        "oddiy TANLASH": "TANLASH ism, yosh JADVALDAN foydalanuvchilar QAYERDA yosh > 25 VA ism != 'Ali' "
+                         "TARTIBLA yosh KAMAYISH CHEGARA 10",
+        "5000 qatorli QO'SH": f"QO'SH ICHIGA foydalanuvchilar (id, ism, familiya, yosh, email, ball) QIYMATLAR {qatorlar}",
+        "uzun satr (1 MB)": "QO'SH ICHIGA matnlar (id, matn) QIYMATLAR (1, '" + "it''s uzun matn " * 65536 + "')",
+    }
+
+
+def _vaqt(lekser, sql: str, takror: int) -> float:
+    eng_yaxshi = float("inf")
+    for _ in range(takror):
+        t = time.perf_counter()
+        lekser(sql).tokenizatsiya()
+        eng_yaxshi = min(eng_yaxshi, time.perf_counter() - t)
+    return eng_yaxshi
+
+
+def main():
+    print(f"{'ish yuklamasi':<22} {'eski':>10} {'yangi':>10} {'tezlashish':>11}")
+    for nom, sql in _ish_yuklamalari().items():
+        eski_t = [(t.turi, t.qiymat, t.pozitsiya) for t in EskiTokenizer(sql).tokenizatsiya()]
+        yangi_t = [(t.turi, t.qiymat, t.pozitsiya) for t in Tokenizer(sql).tokenizatsiya()]
+        assert eski_t == yangi_t, f"{nom}: tokenlar farq qiladi"
+        takror = 200 if len(sql) < 1000 else 5
+        eski, yangi = _vaqt(EskiTokenizer, sql, takror), _vaqt(Tokenizer, sql, takror)
+        print(f"{nom:<22} {eski * 1000:>8.2f}ms {yangi * 1000:>8.2f}ms {eski / yangi:>10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,6 +7,9 @@ from uzdb_final import Executor
 import shutil
 import os
 import sys
+import threading
+import subprocess
+import gc
 
 # Windows uchun UTF-8 encoding o'rnatish
 if sys.platform == 'win32':
@@ -219,6 +222,12 @@ def test_5_order_by(db):
     result = db.bajar(sql)
     print_result("Qimmat mahsulotlar birinchi", result)
 
+    # Bir nechta ustun: kategoriya o'sish, ichida narx kamayish
+    sql = "TANLASH kategoriya, nom, narx JADVALDAN mahsulotlar TARTIBLA kategoriya OSHISH, narx KAMAYISH"
+    print(f"\n📝 SQL: {sql}")
+    result = db.bajar(sql)
+    print_result("Kategoriya, so'ng narx", result)
+
 def test_6_limit(db):
     """6️⃣ LIMIT (CHEGARA)"""
     print("\n" + "🔷"*30)
@@ -261,6 +270,558 @@ def test_7_complex_queries(db):
     result = db.bajar(sql)
     print_result("Arzon va ko'p mavjud mahsulotlar", result)
 
+def test_8_indexes(db):
+    """8️⃣ Indekslar (CREATE INDEX)"""
+    print("\n" + "🔷"*30)
+    print("TEST 8: INDEKSLAR")
+    print("🔷"*30)
+
+    # Ikkilamchi indeks
+    sql = "INDEKS_YARAT idx_foydalanuvchi JADVALDA buyurtmalar (foydalanuvchi_id)"
+    print(f"\n📝 SQL: {sql}")
+    result = db.bajar(sql)
+    print(f"   {result}")
+
+    # Foydalanuvchining buyurtmalari (indeks orqali)
+    sql = "TANLASH id, mahsulot, narx JADVALDAN buyurtmalar QAYERDA foydalanuvchi_id = 2"
+    print(f"\n📝 SQL: {sql}")
+    result = db.bajar(sql)
+    print_result("2-foydalanuvchining buyurtmalari", result)
+
+    # Oraliq (indeks orqali)
+    sql = "TANLASH id, foydalanuvchi_id JADVALDAN buyurtmalar QAYERDA foydalanuvchi_id >= 2 VA foydalanuvchi_id < 4"
+    print(f"\n📝 SQL: {sql}")
+    result = db.bajar(sql)
+    print_result("2-3 foydalanuvchilarning buyurtmalari", result)
+
+    # Asosiy kalit bo'yicha qidiruv
+    sql = "TANLASH * JADVALDAN foydalanuvchilar QAYERDA id = 5"
+    print(f"\n📝 SQL: {sql}")
+    result = db.bajar(sql)
+    print_result("id = 5", result)
+
+def test_9_bulk_insert(db):
+    """9️⃣ Ko'p qatorli qo'shish (multi-row INSERT)"""
+    print("\n" + "🔷"*30)
+    print("TEST 9: KO'P QATORLI QO'SHISH")
+    print("🔷"*30)
+
+    sql = "JADVAL_YARAT toifalar (id BUTUN_SON ASOSIY_KALIT, nom MATN)"
+    print(f"\n📝 SQL: {sql}")
+    print(f"   {db.bajar(sql)}")
+
+    # Bitta buyruqda bir nechta qator
+    sql = "QO'SH ICHIGA toifalar (id, nom) QIYMATLAR (1, 'Elektronika'), (2, 'Mebel'), (3, 'Oquv')"
+    print(f"\n📝 SQL: {sql}")
+    print(f"   {db.bajar(sql)}")
+
+    # bajar_kop - sarlavha bir marta parse qilinadi
+    sql = "QO'SH ICHIGA toifalar (id, nom)"
+    rows = [(i, f'Toifa {i}') for i in range(4, 104)]
+    print(f"\n📝 bajar_kop: {sql} + {len(rows)} ta qator")
+    print(f"   {db.bajar_kop(sql, rows)}")
+
+    # Noto'g'ri qiymat butun buyruqni rad etadi - heap'da yarim/bo'sh qator qolmaydi
+    oldin = db.bajar("TANLASH SANASH(*) JADVALDAN toifalar")
+    for yomon in ("'abc'", "1.5", "99999999999"):
+        try:
+            db.bajar(f"QO'SH ICHIGA toifalar (id, nom) QIYMATLAR (200, 'Yaxshi'), ({yomon}, 'Yomon')")
+            raise AssertionError(f"{yomon} rad etilishi kerak edi")
+        except ValueError as e:
+            print(f"   {yomon} rad etildi: {e}")
+    assert db.bajar("TANLASH SANASH(*) JADVALDAN toifalar") == oldin, "Qatorlar soni o'zgarmasligi kerak"
+
+    sql = "TANLASH * JADVALDAN toifalar QAYERDA id <= 5"
+    print(f"\n📝 SQL: {sql}")
+    result = db.bajar(sql)
+    print_result("Birinchi 5 ta toifa", result)
+
+def test_10_bulk_load(db):
+    """🔟 Fayldan yuklash (COPY)"""
+    print("\n" + "🔷"*30)
+    print("TEST 10: FAYLDAN YUKLASH")
+    print("🔷"*30)
+
+    fayl = os.path.join("test_db", "mahsulotlar.csv")
+    with open(fayl, "w", encoding="utf-8") as f:
+        f.write("id,nom,kategoriya,narx,soni\n")
+        f.write("6,Monitor,Elektronika,1500000,12\n")
+        f.write("7,Kreslo,Mebel,650000,8\n")
+        f.write("8,Daftar,Oquv,8000,300\n")
+
+    # Nisbiy nom baza papkasiga (test_db/) nisbatan ochiladi
+    sql = "YUKLASH mahsulotlar FAYLDAN 'mahsulotlar.csv'"
+    print(f"\n📝 SQL: {sql}")
+    print(f"   {db.bajar(sql)}")
+
+    sql = "TANLASH * JADVALDAN mahsulotlar QAYERDA id > 5"
+    print(f"\n📝 SQL: {sql}")
+    result = db.bajar(sql)
+    print_result("Fayldan yuklangan mahsulotlar", result)
+
+    # Baza papkasidan tashqaridagi fayl (mutlaq yoki ../ bilan) rad etiladi, mazmuni xabarga chiqmaydi
+    tashqi = os.path.join(os.path.dirname(os.path.abspath("test_db")), "tashqi.csv")
+    with open(tashqi, "w", encoding="utf-8") as f:
+        f.write("maxfiy:x:0:0\n")
+    try:
+        for yol in (tashqi, os.path.join("..", "tashqi.csv")):
+            try:
+                db.bajar(f"YUKLASH mahsulotlar FAYLDAN {yol!r}")
+                raise AssertionError(f"Tashqi fayl yuklanmasligi kerak edi: {yol}")
+            except ValueError as e:
+                assert "maxfiy" not in str(e), e
+                print(f"   Tashqi fayl rad etildi: {e}")
+    finally:
+        os.remove(tashqi)
+
+    notogri = os.path.join("test_db", "notogri.csv")
+    with open(notogri, "w", encoding="utf-8") as f:
+        f.write("maxfiy:x:0:0\n1\n")
+    try:
+        db.bajar("YUKLASH mahsulotlar FAYLDAN 'notogri.csv'")
+        raise AssertionError("Noma'lum ustun rad etilishi kerak edi")
+    except ValueError as e:
+        assert "maxfiy" not in str(e), e
+        print(f"   Noma'lum sarlavha rad etildi: {e}")
+
+    # yuklash_papkasi=None - YUKLASH umuman o'chirilgan (web interfeysdagi kabi)
+    yuklashsiz = Executor(os.path.join("test_db", "yuklashsiz"), yuklash_papkasi=None)
+    yuklashsiz.bajar("JADVAL_YARAT t (id BUTUN_SON)")
+    try:
+        yuklashsiz.bajar("YUKLASH t FAYLDAN 't.csv'")
+        raise AssertionError("YUKLASH o'chirilgan bo'lishi kerak edi")
+    except ValueError as e:
+        print(f"   {e}")
+    yuklashsiz.yopish()
+
+def test_11_columnar(db):
+    """1️⃣1️⃣ Ustunli (vektorlashgan) skan"""
+    print("\n" + "🔷"*30)
+    print("TEST 11: USTUNLI SKAN")
+    print("🔷"*30)
+
+    sql = "TANLASH id, narx, soni JADVALDAN mahsulotlar QAYERDA narx < 1000000 VA soni > 10"
+    print(f"\n📝 tanlash_ustunli: {sql}")
+    ustunlar = db.tanlash_ustunli(sql)
+    for nom, qiymatlar in ustunlar.items():
+        print(f"   {nom}: {qiymatlar.tolist()}")
+    print(f"   Jami narx: {sum(ustunlar['narx'])}")
+
+def test_12_parameters(db):
+    """1️⃣2️⃣ Parametrli so'rovlar"""
+    print("\n" + "🔷"*30)
+    print("TEST 12: PARAMETRLI SO'ROVLAR")
+    print("🔷"*30)
+
+    sql = "TANLASH ism, yosh JADVALDAN foydalanuvchilar QAYERDA yosh >= :dan VA yosh <= :gacha"
+    print(f"\n📝 SQL: {sql}  {{dan: 25, gacha: 28}}")
+    result = db.bajar(sql, {'dan': 25, 'gacha': 28})
+    print_result("Nomli parametrlar", result)
+
+    sorov = db.tayyorla("TANLASH ism, familiya JADVALDAN foydalanuvchilar QAYERDA ism = ?")
+    print(f"\n📝 tayyorla: {sorov.sql}  ('Zarina')")
+    print_result("Tayyor so'rov", sorov.bajar('Zarina'))
+
+    sorov = db.tayyorla("QO'SH ICHIGA toifalar (id, nom) QIYMATLAR (?, ?)")
+    print(f"\n📝 tayyorla: {sorov.sql}")
+    for toifa in [(104, 'Sport'), (105, 'Kiyim')]:
+        print(f"   {sorov.bajar(*toifa)}")
+
+def test_13_update(db):
+    """1️⃣3️⃣ YANGILASH"""
+    print("\n" + "🔷"*30)
+    print("TEST 13: YANGILASH (UPDATE)")
+    print("🔷"*30)
+
+    sql = "YANGILASH foydalanuvchilar BELGILASH yosh = 26, email = 'ali.valiyev@pochta.uz' QAYERDA id = 1"
+    print(f"\n📝 SQL: {sql}")
+    print(f"   {db.bajar(sql)}")
+
+    sql = "YANGILASH buyurtmalar BELGILASH foydalanuvchi_id = 3 QAYERDA foydalanuvchi_id = 2"
+    print(f"\n📝 SQL: {sql}")
+    print(f"   {db.bajar(sql)}")
+
+    sql = "TANLASH * JADVALDAN foydalanuvchilar QAYERDA id = 1"
+    print(f"\n📝 SQL: {sql}")
+    print_result("Yangilangan foydalanuvchi", db.bajar(sql))
+
+    sql = "TANLASH id, foydalanuvchi_id, mahsulot JADVALDAN buyurtmalar QAYERDA foydalanuvchi_id = 3"
+    print(f"\n📝 SQL: {sql}")
+    print_result("Indeks orqali: 3-foydalanuvchi buyurtmalari", db.bajar(sql))
+
+def test_14_delete(db):
+    """1️⃣4️⃣ O'CHIR va SIQISH"""
+    print("\n" + "🔷"*30)
+    print("TEST 14: O'CHIR VA SIQISH")
+    print("🔷"*30)
+
+    sql = "O'CHIR JADVALDAN buyurtmalar QAYERDA foydalanuvchi_id = 3"
+    print(f"\n📝 SQL: {sql}")
+    print(f"   {db.bajar(sql)}")
+
+    sql = "QO'SH ICHIGA buyurtmalar (id, foydalanuvchi_id, mahsulot, narx, sana) QIYMATLAR (100, 1, 'Sichqoncha', 150000, '2024-03-01')"
+    print(f"\n📝 SQL: {sql} (bo'shagan joyga yoziladi)")
+    print(f"   {db.bajar(sql)}")
+
+    sql = "SIQISH buyurtmalar"
+    print(f"\n📝 SQL: {sql}")
+    print(f"   {db.bajar(sql)}")
+
+    sql = "TANLASH id, foydalanuvchi_id, mahsulot JADVALDAN buyurtmalar QAYERDA foydalanuvchi_id = 1"
+    print(f"\n📝 SQL: {sql}")
+    print_result("Siqishdan keyin indeks orqali", db.bajar(sql))
+
+def test_15_aggregates(db):
+    """1️⃣5️⃣ Agregatlar va GURUHLA"""
+    print("\n" + "🔷"*30)
+    print("TEST 15: AGREGATLAR VA GURUHLA (GROUP BY)")
+    print("🔷"*30)
+
+    sql = "TANLASH SANASH(*) JADVALDAN foydalanuvchilar"
+    print(f"\n📝 SQL: {sql}")
+    print_result("Sahifa sarlavhalaridan sanash", db.bajar(sql))
+
+    sql = "TANLASH SANASH(*), ORTACHA(yosh), ENG_KICHIK(yosh), ENG_KATTA(yosh) JADVALDAN foydalanuvchilar QAYERDA yosh > 25"
+    print(f"\n📝 SQL: {sql}")
+    print_result("Shartli agregatlar", db.bajar(sql))
+
+    sql = "TANLASH kategoriya, SANASH(*), YIGINDI(soni) JADVALDAN mahsulotlar GURUHLA kategoriya TARTIBLA SANASH(*) KAMAYISH, kategoriya"
+    print(f"\n📝 SQL: {sql}")
+    print_result("Kategoriyalar bo'yicha", db.bajar(sql))
+
+def test_16_join(db):
+    """1️⃣6️⃣ Jadvallarni qo'shish (JOIN)"""
+    print("\n" + "🔷"*30)
+    print("TEST 16: QO'SHILISH (JOIN)")
+    print("🔷"*30)
+
+    sql = "TANLASH b.id, f.ism, b.mahsulot JADVALDAN buyurtmalar b QO'SHILISH foydalanuvchilar f USTIDA b.foydalanuvchi_id = f.id QAYERDA b.narx > 100000"
+    print(f"\n📝 SQL: {sql}")
+    print_result("Buyurtma egalari", db.bajar(sql))
+
+    sql = "TANLASH f.ism, b.mahsulot JADVALDAN foydalanuvchilar f CHAP QO'SHILISH buyurtmalar b USTIDA f.id = b.foydalanuvchi_id TARTIBLA f.ism"
+    print(f"\n📝 SQL: {sql}")
+    print_result("Buyurtmasizlar ham (CHAP)", db.bajar(sql))
+
+    sql = "TANLASH f.ism, SANASH(*), YIGINDI(b.narx) JADVALDAN buyurtmalar b QO'SHILISH foydalanuvchilar f USTIDA b.foydalanuvchi_id = f.id GURUHLA f.ism TARTIBLA YIGINDI(b.narx) KAMAYISH"
+    print(f"\n📝 SQL: {sql}")
+    print_result("Foydalanuvchilar bo'yicha savdo", db.bajar(sql))
+
+def test_17_explain(db):
+    """1️⃣7️⃣ So'rov rejasi (EXPLAIN)"""
+    print("\n" + "🔷"*30)
+    print("TEST 17: TUSHUNTIR (EXPLAIN / EXPLAIN ANALYZE)")
+    print("🔷"*30)
+
+    sql = "TUSHUNTIR TANLASH * JADVALDAN foydalanuvchilar QAYERDA id = 5"
+    print(f"\n📝 SQL: {sql}")
+    for r in db.bajar(sql):
+        print(f"   {r['reja']}")
+
+    sql = "TUSHUNTIR TAHLIL TANLASH f.ism, b.mahsulot JADVALDAN buyurtmalar b QO'SHILISH foydalanuvchilar f USTIDA b.foydalanuvchi_id = f.id TARTIBLA f.ism CHEGARA 3"
+    print(f"\n📝 SQL: {sql}")
+    for r in db.bajar(sql):
+        print(f"   {r['reja']}")
+
+def test_18_statistics(db):
+    """1️⃣8️⃣ Ustun statistikasi (ANALYZE)"""
+    print("\n" + "🔷"*30)
+    print("TEST 18: TAHLIL_QIL (ANALYZE)")
+    print("🔷"*30)
+
+    sql = "TAHLIL_QIL foydalanuvchilar"
+    print(f"\n📝 SQL: {sql}")
+    print(f"   {db.bajar(sql)}")
+
+    sql = "TUSHUNTIR TANLASH ism JADVALDAN foydalanuvchilar QAYERDA yosh >= 25 VA yosh < 30"
+    print(f"\n📝 SQL: {sql}")
+    for r in db.bajar(sql):
+        print(f"   {r['reja']}")
+
+    # Avtomatik yangilash so'rov ichida emas, fon oqimida; tahlil qilinmagan jadvalga tegilmaydi
+    # (fon oqimisiz ochiladi - uning ishi quyida qo'lda chaqiriladi)
+    sdb = Executor(os.path.join("test_db", "statistika"), checkpoint_oraligi=None)
+    for jadval in ("olchangan", "olchanmagan"):
+        sdb.bajar(f"JADVAL_YARAT {jadval} (id BUTUN_SON, qiymat BUTUN_SON)")
+        sdb.bajar_kop(f"QO'SH ICHIGA {jadval} (id, qiymat)", [(i, i % 10) for i in range(100)])
+    sdb.bajar("TAHLIL_QIL olchangan")
+    for jadval in ("olchangan", "olchanmagan"):
+        sdb.bajar_kop(f"QO'SH ICHIGA {jadval} (id, qiymat)", [(i, i % 10) for i in range(100, 1000)])
+        sdb.bajar(f"TANLASH * JADVALDAN {jadval} QAYERDA qiymat = 3")
+    assert sdb.statistikalar["olchangan"].qatorlar == 100, "Reja tuzish statistikani yangilamasligi kerak"
+    sdb._statistika_yangilash()
+    assert sdb.statistikalar["olchangan"].qatorlar == 1000 and "olchanmagan" not in sdb.statistikalar
+    print(f"   Fon yangilashdan keyin: olchangan ~{sdb.statistikalar['olchangan'].qatorlar:.0f} qator, "
+          f"olchanmagan - statistikasiz")
+    sdb.yopish()
+
+def test_19_result_cache(db):
+    """1️⃣9️⃣ Natija keshi"""
+    print("\n" + "🔷"*30)
+    print("TEST 19: NATIJA KESHI")
+    print("🔷"*30)
+
+    db.natija_kesh_hajmi = 64
+    sql = "TANLASH SANASH(*) JADVALDAN buyurtmalar QAYERDA narx > 100"
+    print(f"\n📝 SQL: {sql}")
+    print(f"   1-marta: {db.bajar(sql)}")
+    print(f"   2-marta: {db.bajar(sql)}")
+    print(f"   Kesh: {db.kesh_holati()}")
+
+    db.bajar("QO'SH ICHIGA buyurtmalar (id, foydalanuvchi_id, mahsulot, narx) QIYMATLAR (900, 1, 'Kesh', 500)")
+    print(f"   QO'SH dan keyin: {db.bajar(sql)}")
+    db.bajar("O'CHIR JADVALDAN buyurtmalar QAYERDA id = 900")
+    print(f"   O'CHIR dan keyin: {db.bajar(sql)}")
+    print(f"   Kesh: {db.kesh_holati()}")
+    db.natija_kesh_hajmi = 0
+
+def test_20_parallel_scan(db):
+    """2️⃣0️⃣ Parallel skan"""
+    print("\n" + "🔷"*30)
+    print("TEST 20: PARALLEL SKAN")
+    print("🔷"*30)
+
+    db.bajar("JADVAL_YARAT olchovlar (id BUTUN_SON, qurilma BUTUN_SON, qiymat HAQIQIY)")
+    fayl = os.path.join("test_db", "olchovlar.csv")
+    with open(fayl, "w", encoding="utf-8") as f:
+        f.write("id,qurilma,qiymat\n")
+        for i in range(1, 30001):
+            f.write(f"{i},{i % 5},{(i * 37) % 1000 / 10}\n")
+    sql = "YUKLASH olchovlar FAYLDAN 'olchovlar.csv'"
+    print(f"   {db.bajar(sql)}")
+
+    sql = "TANLASH qurilma, SANASH(*), ENG_KATTA(qiymat) JADVALDAN olchovlar QAYERDA qiymat > 50 GURUHLA qurilma TARTIBLA qurilma"
+    ketma_ket = db.bajar(sql)
+    db.parallel_ishchilar, db.parallel_chegara = 2, 64
+    print(f"\n📝 SQL: TUSHUNTIR {sql}")
+    for r in db.bajar("TUSHUNTIR " + sql):
+        print(f"   {r['reja']}")
+    parallel = db.bajar(sql)
+    print_result("Parallel natija", parallel)
+    print(f"   Ketma-ket skan bilan bir xil: {parallel == ketma_ket}")
+    db.parallel_ishchilar = 0
+
+def test_21_concurrency(db):
+    """2️⃣1️⃣ Bir vaqtda o'qish va yozish"""
+    print("\n" + "🔷"*30)
+    print("TEST 21: OQIMLAR (BIR VAQTDA O'QISH/YOZISH)")
+    print("🔷"*30)
+
+    db.bajar("JADVAL_YARAT hisoblar (id BUTUN_SON, qoldiq BUTUN_SON)")
+    db.bajar_kop("QO'SH ICHIGA hisoblar (id, qoldiq) QIYMATLAR (?, ?)", [(i, 100) for i in range(1, 101)])
+    xatolar, soni = [], []
+
+    def yozuvchi():
+        for i in range(101, 301):
+            db.bajar("QO'SH ICHIGA hisoblar (id, qoldiq) QIYMATLAR (?, ?)", (i, 100))
+
+    def oquvchi():
+        try:
+            for _ in range(50):
+                qatorlar = db.bajar("TANLASH SANASH(*), YIGINDI(qoldiq) JADVALDAN hisoblar")
+                n, jami = qatorlar[0]["SANASH(*)"], qatorlar[0]["YIGINDI(qoldiq)"]
+                if jami != n * 100:
+                    xatolar.append((n, jami))
+                soni.append(n)
+        except Exception as e:
+            xatolar.append(e)
+
+    oqimlar = [threading.Thread(target=oquvchi) for _ in range(4)] + [threading.Thread(target=yozuvchi)]
+    for t in oqimlar:
+        t.start()
+    for t in oqimlar:
+        t.join()
+    print(f"   4 o'quvchi, 1 yozuvchi: {len(soni)} so'rov, ko'rilgan qatorlar {min(soni)}..{max(soni)}")
+    print(f"   Har bir o'qish izchil (YIGINDI = SANASH * 100): {not xatolar}")
+    print_result("Yakuniy holat", db.bajar("TANLASH SANASH(*) JADVALDAN hisoblar"))
+
+    # Fayl qulfi: ikkinchi Executor rad etiladi; yopilmay tashlab yuborilgan Executor qulfni ushlab qolmaydi
+    try:
+        Executor("test_db")
+        raise AssertionError("Ikkinchi Executor rad etilishi kerak edi")
+    except ValueError as e:
+        print(f"   {e}")
+    papka = os.path.join("test_db", "tashlangan")
+    tashlangan = Executor(papka)
+    tashlangan.bajar("JADVAL_YARAT t (id BUTUN_SON)")
+    tashlangan.bajar("QO'SH ICHIGA t (id) QIYMATLAR (1)")
+    del tashlangan
+    gc.collect()
+    qayta = Executor(papka)
+    assert qayta.bajar("TANLASH SANASH(*) JADVALDAN t") == [{'SANASH(*)': 1}]
+    print("   Yopilmagan Executor'dan keyin baza qayta ochildi")
+    qayta.yopish()
+
+def test_22_small_buffer_pool(db):
+    """2️⃣2️⃣ Kichik buffer pool"""
+    print("\n" + "🔷"*30)
+    print("TEST 22: KICHIK BUFFER POOL")
+    print("🔷"*30)
+
+    for sigim in (1, 2, 3):
+        papka = os.path.join("test_db", f"pool_{sigim}")
+        kichik = Executor(papka, bufer_hajmi=sigim)
+        kichik.bajar("JADVAL_YARAT yozuvlar (id BUTUN_SON ASOSIY_KALIT, guruh BUTUN_SON, izoh MATN)")
+        kichik.bajar_kop("QO'SH ICHIGA yozuvlar (id, guruh, izoh) QIYMATLAR (?, ?, ?)",
+                         [(i, i % 7, 'x' * (i % 60)) for i in range(1, 601)])
+        for i in range(601, 701):
+            kichik.bajar("QO'SH ICHIGA yozuvlar (id, guruh, izoh) QIYMATLAR (?, ?, ?)", (i, i % 7, 'y' * (i % 90)))
+        kichik.bajar("O'CHIR JADVALDAN yozuvlar QAYERDA guruh = 3")
+        # O'sib boruvchi YANGILASH: qatorlar boshqa sahifalarga ko'chadi, keyin qayta ko'chadi
+        kichik.bajar("YANGILASH yozuvlar BELGILASH izoh = ? QAYERDA guruh = 5", ('z' * 200,))
+        kichik.bajar("YANGILASH yozuvlar BELGILASH izoh = ? QAYERDA guruh = 5", ('w' * 500,))
+        kichik.bajar("YANGILASH yozuvlar BELGILASH izoh = ? QAYERDA guruh = 1 VA id > 350", ('v' * 300,))
+        kutilgan = [i for i in range(1, 701) if i % 7 != 3]
+
+        def izoh(i):
+            if i % 7 == 5:
+                return 'w' * 500
+            if i % 7 == 1 and i > 350:
+                return 'v' * 300
+            return 'x' * (i % 60) if i <= 600 else 'y' * (i % 90)
+
+        kichik.yopish()
+
+        kichik = Executor(papka, bufer_hajmi=sigim)
+        qatorlar = kichik.bajar("TANLASH id, izoh JADVALDAN yozuvlar")
+        mos = (sorted(r['id'] for r in qatorlar) == kutilgan
+               and all(r['izoh'] == izoh(r['id']) for r in qatorlar))
+        print(f"   bufer_hajmi={sigim}: {len(qatorlar)} qator, qayta ochilgandan keyin mos: {mos}")
+        assert mos, f"bufer_hajmi={sigim}: ma'lumot yo'qoldi"
+        kichik.yopish()
+
+    # Ikki yozuvchi turli jadvallarda bitta kichik pool'ni bo'lishadi: qadalgan sahifalar chiqarilmaydi
+    papka = os.path.join("test_db", "pool_yozuvchilar")
+    kichik = Executor(papka, bufer_hajmi=2)
+    for jadval in ("birinchi", "ikkinchi"):
+        kichik.bajar(f"JADVAL_YARAT {jadval} (id BUTUN_SON ASOSIY_KALIT, guruh BUTUN_SON, izoh MATN)")
+        kichik.bajar_kop(f"QO'SH ICHIGA {jadval} (id, guruh, izoh)", [(i, i % 5, 'x') for i in range(300)])
+
+    def yozuvchi(jadval):
+        for k in range(20):
+            kichik.bajar(f"YANGILASH {jadval} BELGILASH izoh = ? QAYERDA guruh = ?", ('z' * (40 + 10 * k), k % 5))
+            kichik.bajar(f"QO'SH ICHIGA {jadval} (id, guruh, izoh) QIYMATLAR (?, 9, 'y')", (1000 + k,))
+
+    oqimlar = [threading.Thread(target=yozuvchi, args=(j,)) for j in ("birinchi", "ikkinchi")]
+    for t in oqimlar:
+        t.start()
+    for t in oqimlar:
+        t.join()
+    kichik.yopish()
+    kichik = Executor(papka, bufer_hajmi=2)
+    for jadval in ("birinchi", "ikkinchi"):
+        qatorlar = {r['id']: r['izoh'] for r in kichik.bajar(f"TANLASH id, izoh JADVALDAN {jadval}")}
+        kutilgan = {i: 'z' * (40 + 10 * (15 + i % 5)) for i in range(300)}
+        kutilgan.update({1000 + k: 'y' for k in range(20)})
+        assert qatorlar == kutilgan, f"{jadval}: ikki yozuvchidan keyin ma'lumot buzildi"
+    print(f"   bufer_hajmi=2, ikki parallel yozuvchi: {len(qatorlar)} qator, mos: True")
+    kichik.yopish()
+
+def test_23_wal_recovery(db):
+    """2️⃣3️⃣ WAL'dan tiklash"""
+    print("\n" + "🔷"*30)
+    print("TEST 23: WAL'DAN TIKLASH (CRASH RECOVERY)")
+    print("🔷"*30)
+
+    papka = os.path.join("test_db", "wal_tiklash")
+    # Yozuvchi jarayon yopish()siz, checkpoint'siz o'ladi - sahifalar faqat WAL'da qoladi
+    skript = f"""
+import os, sys
+sys.path.insert(0, {os.path.dirname(os.path.abspath(__file__))!r})
+from uzdb_final import Executor
+db = Executor({papka!r}, checkpoint_oraligi=None)
+db.bajar("JADVAL_YARAT hisob (id BUTUN_SON ASOSIY_KALIT, qoldiq BUTUN_SON, izoh MATN)")
+for i in range(1, 51):
+    db.bajar("QO'SH ICHIGA hisob (id, qoldiq, izoh) QIYMATLAR (?, ?, ?)", (i, i * 10, 'boshlang'))
+db.bajar("YANGILASH hisob BELGILASH izoh = 'yangilangan va ancha uzunroq izoh' QAYERDA id <= 10")
+db.bajar("O'CHIR JADVALDAN hisob QAYERDA id > 40")
+os._exit(0)
+"""
+    subprocess.run([sys.executable, "-c", skript], check=True)
+    print(f"   WAL'da yozuvlar qoldi: {os.path.getsize(os.path.join(papka, 'wal.log')) > 0}")
+
+    tiklangan = Executor(papka)
+    qatorlar = tiklangan.bajar("TANLASH * JADVALDAN hisob TARTIBLA id")
+    mos = ([r['id'] for r in qatorlar] == list(range(1, 41))
+           and all(r['qoldiq'] == r['id'] * 10 for r in qatorlar)
+           and [r['izoh'] for r in qatorlar[:11]] == ['yangilangan va ancha uzunroq izoh'] * 10 + ['boshlang'])
+    print(f"   Qayta ochilgandan keyin: {len(qatorlar)} qator, hammasi tiklandi: {mos}")
+    print_result("id = 5", tiklangan.bajar("TANLASH * JADVALDAN hisob QAYERDA id = 5"))
+
+    # Checkpoint xatosi yashirilmaydi: u tuzalguncha yozuvchi buyruqlar xato oladi, o'qish ishlaydi
+    tozalash = tiklangan.wal.tozalash
+    def buzilgan():
+        raise OSError("disk to'la")
+    tiklangan.wal.tozalash = buzilgan
+    tiklangan.bajar("QO'SH ICHIGA hisob (id, qoldiq, izoh) QIYMATLAR (100, 0, 'x')")
+    try:
+        tiklangan.checkpoint()
+        raise AssertionError("checkpoint xato berishi kerak edi")
+    except OSError:
+        pass
+    try:
+        tiklangan.bajar("QO'SH ICHIGA hisob (id, qoldiq, izoh) QIYMATLAR (101, 0, 'x')")
+        raise AssertionError("Yozish checkpoint xatosini qaytarishi kerak edi")
+    except ValueError as e:
+        print(f"   Checkpoint xatosidan keyin yozish: {e}")
+    assert len(tiklangan.bajar("TANLASH id JADVALDAN hisob")) == 41
+    tiklangan.wal.tozalash = tozalash
+    tiklangan.checkpoint()
+    print(f"   Checkpoint tiklangach: {tiklangan.bajar('''QO'SH ICHIGA hisob (id, qoldiq, izoh) QIYMATLAR (101, 0, 'x')''')}")
+    tiklangan.yopish()
+
+def test_24_index_lookups(db):
+    """2️⃣4️⃣ B+Tree indekslar: qidiruv, yagonalik, qayta ochish"""
+    print("\n" + "🔷"*30)
+    print("TEST 24: B+TREE INDEKSLAR")
+    print("🔷"*30)
+
+    papka = os.path.join("test_db", "indekslar")
+    idb = Executor(papka)
+    idb.bajar("JADVAL_YARAT talabalar (id BUTUN_SON ASOSIY_KALIT, ball BUTUN_SON, ism MATN)")
+    idb.bajar_kop("QO'SH ICHIGA talabalar (id, ball, ism)",
+                  [(i, (i * 37) % 1000, f"Talaba {i}") for i in range(1, 3001)])
+    print(f"   {idb.bajar('INDEKS_YARAT idx_ball JADVALDA talabalar (ball)')}")
+
+    nuqta = "TANLASH * JADVALDAN talabalar QAYERDA id = 1234"
+    oraliq = "TANLASH id, ball JADVALDAN talabalar QAYERDA ball >= 100 VA ball < 103"
+    kutilgan = sorted(i for i in range(1, 3001) if 100 <= (i * 37) % 1000 < 103)
+
+    def tekshir(baza, sarlavha):
+        for sql in (nuqta, oraliq):
+            reja = [r['reja'] for r in baza.bajar("TUSHUNTIR " + sql)]
+            print(f"   {sarlavha}: {sql}")
+            assert any('IndeksScan' in r for r in reja), f"Indeks ishlatilmadi: {reja}"
+            print("      indeks ishlatildi: True")
+        bitta = baza.bajar(nuqta)
+        assert bitta == [{'id': 1234, 'ball': 1234 * 37 % 1000, 'ism': 'Talaba 1234'}], bitta
+        assert sorted(r['id'] for r in baza.bajar(oraliq)) == kutilgan
+        print("      id = 1234 va ball [100, 103) natijalari to'g'ri")
+
+    tekshir(idb, "Indeks")
+
+    # Yagonalik: takroriy asosiy kalit rad etiladi, jadval o'zgarmaydi
+    for sql in ["QO'SH ICHIGA talabalar (id, ball, ism) QIYMATLAR (3001, 1, 'Yangi'), (7, 1, 'Takror')",
+                "YANGILASH talabalar BELGILASH id = 8 QAYERDA id = 9"]:
+        try:
+            idb.bajar(sql)
+            raise AssertionError(f"Xato kutilgan edi: {sql}")
+        except ValueError as e:
+            print(f"   Rad etildi: {e}")
+    soni = idb.bajar("TANLASH SANASH(*) JADVALDAN talabalar")[0]['SANASH(*)']
+    assert soni == 3000, f"Qatorlar soni o'zgardi: {soni}"
+    print(f"   Qatorlar soni o'zgarmadi: {soni}")
+    idb.yopish()
+
+    # Qayta ochilganda indeks fayllari qayta qurilmaydi, o'zidan o'qiladi
+    fayllar = {f: os.path.getmtime(os.path.join(papka, f)) for f in os.listdir(papka) if f.endswith('.idx')}
+    idb = Executor(papka)
+    tekshir(idb, "Qayta ochilgandan keyin")
+    assert all(os.path.getmtime(os.path.join(papka, f)) == t for f, t in fayllar.items()), \
+        "Indeks fayllari qayta qurildi"
+    print(f"   Indeks fayllari {sorted(fayllar)} o'zgarmadi")
+    idb.yopish()
+
 def run_all_tests():
     """Barcha testlarni ishga tushirish"""
     print("""
@@ -281,6 +842,23 @@ def run_all_tests():
         test_5_order_by(db)
         test_6_limit(db)
         test_7_complex_queries(db)
+        test_8_indexes(db)
+        test_9_bulk_insert(db)
+        test_10_bulk_load(db)
+        test_11_columnar(db)
+        test_12_parameters(db)
+        test_13_update(db)
+        test_14_delete(db)
+        test_15_aggregates(db)
+        test_16_join(db)
+        test_17_explain(db)
+        test_18_statistics(db)
+        test_19_result_cache(db)
+        test_20_parallel_scan(db)
+        test_21_concurrency(db)
+        test_22_small_buffer_pool(db)
+        test_23_wal_recovery(db)
+        test_24_index_lookups(db)
 
         print("\n" + "="*60)
         print("✅ BARCHA TESTLAR MUVAFFAQIYATLI O'TDI!")
@@ -17,14 +17,50 @@
 """
 
 import struct
+import contextlib
+import concurrent.futures
+import re
+import bisect
+import csv
+import json
+import heapq
+import itertools
+import pickle
+import tempfile
 import os
+import mmap
 import sys
 import time
 import shutil
+import zlib
+import atexit
+import weakref
+import threading
+import logging
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+import operator
+import math
+import multiprocessing
+import random
+import hashlib
+from array import array
+from itertools import compress, repeat
+from collections import OrderedDict, deque
+from collections.abc import Sequence
 from enum import Enum, auto
-from dataclasses import dataclass
+from dataclasses import dataclass, fields, is_dataclass
+from functools import cached_property
 from typing import List, Optional, Any, Dict, Tuple, Union
 
+try:
+    import numpy as np
+except ImportError:  # ixtiyoriy: ustunli skan array.array bilan ham ishlaydi
+    np = None
+
 
 # ============================================================
 # 1. TOKENIZER
@@ -37,6 +73,10 @@ class TokenTuri(Enum):
     VA = auto()
     YOKI = auto()
     TARTIBLA = auto()
+    GURUHLA = auto()
+    QOSHILISH = auto()
+    CHAP = auto()
+    USTIDA = auto()
     CHEGARA = auto()
     OSHISH = auto()
     KAMAYISH = auto()
@@ -47,6 +87,14 @@ class TokenTuri(Enum):
     BELGILASH = auto()
     OCHIR = auto()
     JADVAL_YARAT = auto()
+    INDEKS_YARAT = auto()
+    JADVALDA = auto()
+    YUKLASH = auto()
+    FAYLDAN = auto()
+    SIQISH = auto()
+    TUSHUNTIR = auto()
+    TAHLIL_QIL = auto()
+    TAHLIL = auto()
     BUTUN_SON = auto()
     MATN = auto()
     HAQIQIY = auto()
@@ -65,12 +113,15 @@ class TokenTuri(Enum):
     OCHIQ_QAVS = auto()
     YOPIQ_QAVS = auto()
     YULDUZCHA = auto()
+    NUQTA = auto()
+    PARAMETR = auto()
     IDENTIFIKATOR = auto()
     EOF = auto()
 
 
 @dataclass
 class Token:
+    __slots__ = ('turi', 'qiymat', 'pozitsiya')  # dataclass(slots=True) faqat 3.10+ da
     turi: TokenTuri
     qiymat: str
     pozitsiya: int
@@ -81,136 +132,72 @@ class Tokenizer:
         'TANLASH': TokenTuri.TANLASH, 'JADVALDAN': TokenTuri.JADVALDAN,
         'QAYERDA': TokenTuri.QAYERDA, 'VA': TokenTuri.VA, 'YOKI': TokenTuri.YOKI,
         'TARTIBLA': TokenTuri.TARTIBLA, 'CHEGARA': TokenTuri.CHEGARA,
+        'GURUHLA': TokenTuri.GURUHLA,
+        "QO'SHILISH": TokenTuri.QOSHILISH, 'QOSHILISH': TokenTuri.QOSHILISH,
+        'CHAP': TokenTuri.CHAP, 'USTIDA': TokenTuri.USTIDA,
         'OSHISH': TokenTuri.OSHISH, 'KAMAYISH': TokenTuri.KAMAYISH,
         'QOSH': TokenTuri.QOSH, "QO'SH": TokenTuri.QOSH,
         'ICHIGA': TokenTuri.ICHIGA, 'QIYMATLAR': TokenTuri.QIYMATLAR,
         'YANGILASH': TokenTuri.YANGILASH, 'BELGILASH': TokenTuri.BELGILASH,
         'OCHIR': TokenTuri.OCHIR, "O'CHIR": TokenTuri.OCHIR,
         'JADVAL_YARAT': TokenTuri.JADVAL_YARAT,
+        'INDEKS_YARAT': TokenTuri.INDEKS_YARAT, 'JADVALDA': TokenTuri.JADVALDA,
+        'YUKLASH': TokenTuri.YUKLASH, 'FAYLDAN': TokenTuri.FAYLDAN,
+        'SIQISH': TokenTuri.SIQISH,
+        'TUSHUNTIR': TokenTuri.TUSHUNTIR, 'TAHLIL': TokenTuri.TAHLIL, 'TAHLIL_QIL': TokenTuri.TAHLIL_QIL,
         'BUTUN_SON': TokenTuri.BUTUN_SON, 'MATN': TokenTuri.MATN,
         'HAQIQIY': TokenTuri.HAQIQIY, 'ASOSIY_KALIT': TokenTuri.ASOSIY_KALIT,
         'BOSH_EMAS': TokenTuri.BOSH_EMAS, 'YAGONA': TokenTuri.YAGONA,
     }
     
+    BELGILAR = {
+        '=': TokenTuri.TENG, '!=': TokenTuri.TENG_EMAS, '<>': TokenTuri.TENG_EMAS,
+        '<=': TokenTuri.KICHIK_TENG, '>=': TokenTuri.KATTA_TENG,
+        '<': TokenTuri.KICHIK, '>': TokenTuri.KATTA, ',': TokenTuri.VERGUL,
+        '(': TokenTuri.OCHIQ_QAVS, ')': TokenTuri.YOPIQ_QAVS, '*': TokenTuri.YULDUZCHA,
+        '.': TokenTuri.NUQTA, '?': TokenTuri.PARAMETR,
+    }
+    # Bitta master regex: bo'shliq va izohlar har bir token boshida yutiladi, keyin guruhlardan
+    # biri - token turi. Tartib muhim. Oxirgi XATO/OXIR har doim mos keladi, shuning uchun prefiks
+    # orqaga qaytmaydi (3.11 dagi possessive `*+` kerak emas).
+    NAQSH = re.compile(r"""
+        (?:[ \t\n\r]|--[^\n]*)*
+        (?: (?P<BELGI>!=|<>|<=|>=|=(?!=)|[<>,()*?.])
+          | (?P<SON>-?\d+(?:\.\d*)?)
+          | (?P<SATR>'[^']*(?:''[^']*)*')
+          | (?P<SOZ>[^\W\d][\w']*)
+          | (?P<PARAMETR>:[^\W\d]\w*)
+          | (?P<OCHIQ_SATR>')
+          | (?P<XATO>.)
+          | (?P<OXIR>\Z))
+    """, re.VERBOSE | re.DOTALL)
+    
     def __init__(self, matn: str):
         self.matn = matn
-        self.pozitsiya = 0
         self.tokens: List[Token] = []
     
     def tokenizatsiya(self) -> List[Token]:
-        while self.pozitsiya < len(self.matn):
-            self._keyingi_token()
-        self.tokens.append(Token(TokenTuri.EOF, '', self.pozitsiya))
-        return self.tokens
-    
-    def _keyingi_token(self):
-        self._bosh_joy_otkazish()
-        if self.pozitsiya >= len(self.matn):
-            return
-        
-        ch = self.matn[self.pozitsiya]
-        
-        if ch == '=' and self._peek(1) != '=':
-            self._token_qosh(TokenTuri.TENG, '=')
-        elif ch == '!' and self._peek(1) == '=':
-            self._token_qosh(TokenTuri.TENG_EMAS, '!=', 2)
-        elif ch == '<' and self._peek(1) == '>':
-            self._token_qosh(TokenTuri.TENG_EMAS, '<>', 2)
-        elif ch == '<' and self._peek(1) == '=':
-            self._token_qosh(TokenTuri.KICHIK_TENG, '<=', 2)
-        elif ch == '>' and self._peek(1) == '=':
-            self._token_qosh(TokenTuri.KATTA_TENG, '>=', 2)
-        elif ch == '<':
-            self._token_qosh(TokenTuri.KICHIK, '<')
-        elif ch == '>':
-            self._token_qosh(TokenTuri.KATTA, '>')
-        elif ch == ',':
-            self._token_qosh(TokenTuri.VERGUL, ',')
-        elif ch == '(':
-            self._token_qosh(TokenTuri.OCHIQ_QAVS, '(')
-        elif ch == ')':
-            self._token_qosh(TokenTuri.YOPIQ_QAVS, ')')
-        elif ch == '*':
-            self._token_qosh(TokenTuri.YULDUZCHA, '*')
-        elif ch == "'":
-            self._satr_oqish()
-        elif ch.isdigit() or (ch == '-' and self._peek(1).isdigit()):
-            self._son_oqish()
-        elif ch.isalpha() or ch == '_':
-            self._identifikator_oqish()
-        else:
-            raise SyntaxError(f"Noma'lum belgi: '{ch}'")
-    
-    def _peek(self, offset=0) -> str:
-        pos = self.pozitsiya + offset
-        return self.matn[pos] if pos < len(self.matn) else ''
-    
-    def _bosh_joy_otkazish(self):
-        while self.pozitsiya < len(self.matn):
-            ch = self.matn[self.pozitsiya]
-            if ch in ' \t\n\r':
-                self.pozitsiya += 1
-            elif ch == '-' and self._peek(1) == '-':
-                while self.pozitsiya < len(self.matn) and self.matn[self.pozitsiya] != '\n':
-                    self.pozitsiya += 1
-            else:
-                break
-    
-    def _token_qosh(self, turi, qiymat, uzunlik=1):
-        self.tokens.append(Token(turi, qiymat, self.pozitsiya))
-        self.pozitsiya += uzunlik
-    
-    def _satr_oqish(self):
-        start = self.pozitsiya
-        self.pozitsiya += 1
-        qiymat = ''
-        while self.pozitsiya < len(self.matn):
-            ch = self.matn[self.pozitsiya]
-            if ch == "'":
-                if self._peek(1) == "'":
-                    qiymat += "'"
-                    self.pozitsiya += 2
-                else:
-                    self.pozitsiya += 1
-                    self.tokens.append(Token(TokenTuri.SATR, qiymat, start))
-                    return
-            else:
-                qiymat += ch
-                self.pozitsiya += 1
-        raise SyntaxError("Yopilmagan string")
-    
-    def _son_oqish(self):
-        start = self.pozitsiya
-        qiymat = ''
-        if self.matn[self.pozitsiya] == '-':
-            qiymat += '-'
-            self.pozitsiya += 1
-        while self.pozitsiya < len(self.matn) and self.matn[self.pozitsiya].isdigit():
-            qiymat += self.matn[self.pozitsiya]
-            self.pozitsiya += 1
-        if self.pozitsiya < len(self.matn) and self.matn[self.pozitsiya] == '.':
-            qiymat += '.'
-            self.pozitsiya += 1
-            while self.pozitsiya < len(self.matn) and self.matn[self.pozitsiya].isdigit():
-                qiymat += self.matn[self.pozitsiya]
-                self.pozitsiya += 1
-        self.tokens.append(Token(TokenTuri.SON, qiymat, start))
-    
-    def _identifikator_oqish(self):
-        start = self.pozitsiya
-        qiymat = ''
-        while self.pozitsiya < len(self.matn):
-            ch = self.matn[self.pozitsiya]
-            if ch.isalnum() or ch in "_'":
-                qiymat += ch
-                self.pozitsiya += 1
-            else:
-                break
-        upper = qiymat.upper()
-        if upper in self.KALIT_SOZLAR:
-            self.tokens.append(Token(self.KALIT_SOZLAR[upper], qiymat, start))
-        else:
-            self.tokens.append(Token(TokenTuri.IDENTIFIKATOR, qiymat, start))
+        tokens, kalit_sozlar, belgilar = self.tokens, self.KALIT_SOZLAR, self.BELGILAR
+        qosh, SON, SATR = tokens.append, TokenTuri.SON, TokenTuri.SATR
+        for m in self.NAQSH.finditer(self.matn):
+            tur = m.lastgroup
+            q = m.group(tur)
+            if tur == 'BELGI':
+                qosh(Token(belgilar[q], q, m.start(tur)))
+            elif tur == 'SON':
+                qosh(Token(SON, q, m.start(tur)))
+            elif tur == 'SATR':
+                qosh(Token(SATR, q[1:-1].replace("''", "'"), m.start(tur)))
+            elif tur == 'SOZ':
+                qosh(Token(kalit_sozlar.get(q.upper(), TokenTuri.IDENTIFIKATOR), q, m.start(tur)))
+            elif tur == 'PARAMETR':
+                qosh(Token(TokenTuri.PARAMETR, q[1:], m.start(tur)))
+            elif tur == 'OCHIQ_SATR':
+                raise SyntaxError("Yopilmagan string")
+            elif tur == 'XATO':
+                raise SyntaxError(f"Noma'lum belgi: '{q}'")
+        tokens.append(Token(TokenTuri.EOF, '', len(self.matn)))
+        return tokens
 
 
 # ============================================================
@@ -229,6 +216,21 @@ class Ustun:
 class Yulduzcha:
     pass
 
+@dataclass
+class Parametr:
+    nom: Union[int, str]  # `?` uchun tartib raqami, `:nom` uchun nom
+
+AGREGATLAR = ('SANASH', 'YIGINDI', 'ORTACHA', 'ENG_KICHIK', 'ENG_KATTA')
+
+@dataclass
+class Agregat:
+    funksiya: str
+    ustun: Optional[str] = None  # None - SANASH(*)
+
+    @property
+    def nom(self) -> str:
+        return f"{self.funksiya}({self.ustun or '*'})"
+
 @dataclass
 class Taqqoslash:
     chap: Any
@@ -248,12 +250,22 @@ class TanlashBuyruq:
     shart: Any = None
     tartib: List[Tuple] = None
     chegara: int = None
+    guruh: List[str] = None
+    taxallus: Optional[str] = None
+    qoshilishlar: List['Qoshilish'] = None
+
+@dataclass
+class Qoshilish:
+    jadval: str
+    taxallus: Optional[str]
+    shart: Any
+    chap: bool = False  # CHAP QO'SHILISH: mos topilmagan chap qatorlar ham (NULL bilan)
 
 @dataclass
 class QoshBuyruq:
     jadval: str
     ustunlar: List[str]
-    qiymatlar: List[Any]
+    qiymatlar: List[List[Any]]
 
 @dataclass
 class YangilashBuyruq:
@@ -271,11 +283,88 @@ class JadvalYaratBuyruq:
     nom: str
     ustunlar: List[Dict]
 
+@dataclass
+class IndeksYaratBuyruq:
+    nom: str
+    jadval: str
+    ustun: str
+
+@dataclass
+class YuklashBuyruq:
+    jadval: str
+    fayl: str
+
+@dataclass
+class SiqishBuyruq:
+    jadval: str
+
+@dataclass
+class TahlilQilBuyruq:
+    jadval: str
+
+@dataclass
+class TushuntirBuyruq:
+    buyruq: TanlashBuyruq
+    tahlil: bool = False  # TUSHUNTIR TAHLIL - so'rov bajariladi, haqiqiy qiymatlar ham chiqadi
+
+
+def parametrlar_royxati(tugun) -> List[Union[int, str]]:
+    """AST dagi parametrlar: `?` lar uchun tartib raqamlari, `:nom` lar uchun nomlar."""
+    if isinstance(tugun, Parametr):
+        return [tugun.nom]
+    if isinstance(tugun, (list, tuple)):
+        return [p for t in tugun for p in parametrlar_royxati(t)]
+    if is_dataclass(tugun):
+        return [p for f in fields(tugun) for p in parametrlar_royxati(getattr(tugun, f.name))]
+    return []
+
+
+def parametrlarni_bogla(tugun, qiymatlar):
+    """AST nusxasi: har bir Parametr `qiymatlar[nom]` bilan almashtiriladi.
+
+    `qiymatlar` ketma-ketlik (`?` lar uchun) yoki lug'at (`:nom` lar, `?` uchun 0, 1, ...).
+    """
+    if tugun is None or isinstance(tugun, (str, int, float)):
+        return tugun
+    if isinstance(tugun, Parametr):
+        try:
+            return qiymatlar[tugun.nom]
+        except (KeyError, IndexError, TypeError):
+            belgi = f"{tugun.nom + 1}-?" if isinstance(tugun.nom, int) else f":{tugun.nom}"
+            raise ValueError(f"Parametr qiymati berilmagan: {belgi}") from None
+    if isinstance(tugun, (list, tuple)):
+        yangi = [parametrlarni_bogla(t, qiymatlar) for t in tugun]
+        if all(y is t for y, t in zip(yangi, tugun)):
+            return tugun
+        return yangi if isinstance(tugun, list) else tuple(yangi)
+    if is_dataclass(tugun):
+        # parametrsiz qismlar nusxalanmaydi - keshdagi AST bilan bo'lishiladi
+        ozgargan = {}
+        for k, v in vars(tugun).items():
+            y = parametrlarni_bogla(v, qiymatlar)
+            if y is not v:
+                ozgargan[k] = y
+        if not ozgargan:
+            return tugun
+        nusxa = object.__new__(type(tugun))
+        nusxa.__dict__.update(vars(tugun), **ozgargan)
+        return nusxa
+    return tugun
+
+
+# kesh kaliti uchun: satrlar va identifikatorlar saqlanadi, bo'shliq va izohlar bitta probelga
+_SQL_NORMAL_RE = re.compile(r"([^\W\d][\w']*)|('[^']*(?:''[^']*)*')|--[^\n]*|\s+")
+
+
+def _sql_kaliti(sql: str) -> str:
+    return _SQL_NORMAL_RE.sub(lambda m: m.group(1) or m.group(2) or ' ', sql).strip()
+
 
 class Parser:
     def __init__(self, tokens: List[Token]):
         self.tokens = tokens
         self.pos = 0
+        self.parametr_soni = 0
     
     @classmethod
     def parse(cls, sql: str):
@@ -304,17 +393,49 @@ class Parser:
         if self._tekshir(TokenTuri.YANGILASH): return self._yangilash()
         if self._tekshir(TokenTuri.OCHIR): return self._ochir()
         if self._tekshir(TokenTuri.JADVAL_YARAT): return self._jadval_yarat()
+        if self._tekshir(TokenTuri.INDEKS_YARAT): return self._indeks_yarat()
+        if self._tekshir(TokenTuri.YUKLASH): return self._yuklash()
+        if self._tekshir(TokenTuri.SIQISH): return self._siqish()
+        if self._tekshir(TokenTuri.TUSHUNTIR): return self._tushuntir()
+        if self._tekshir(TokenTuri.TAHLIL_QIL): return self._tahlil_qil()
         raise SyntaxError(f"Noma'lum buyruq: {self._joriy()}")
     
     def _tanlash(self):
         self._kutish(TokenTuri.TANLASH)
-        ustunlar = [Yulduzcha()] if self._qabul(TokenTuri.YULDUZCHA) else self._ustunlar()
+        ustunlar = [Yulduzcha()] if self._qabul(TokenTuri.YULDUZCHA) else self._tanlash_ustunlari()
         self._kutish(TokenTuri.JADVALDAN)
         jadval = self._kutish(TokenTuri.IDENTIFIKATOR).qiymat
+        taxallus = t.qiymat if (t := self._qabul(TokenTuri.IDENTIFIKATOR)) else None
+        qoshilishlar = []
+        while self._tekshir(TokenTuri.QOSHILISH, TokenTuri.CHAP):
+            qoshilishlar.append(self._qoshilish())
         shart = self._ifoda() if self._qabul(TokenTuri.QAYERDA) else None
+        guruh = None
+        if self._qabul(TokenTuri.GURUHLA):
+            guruh = [self._nom()]
+            while self._qabul(TokenTuri.VERGUL):
+                guruh.append(self._nom())
         tartib = self._tartib() if self._qabul(TokenTuri.TARTIBLA) else None
-        chegara = int(self._kutish(TokenTuri.SON).qiymat) if self._qabul(TokenTuri.CHEGARA) else None
-        return TanlashBuyruq(ustunlar, jadval, shart, tartib, chegara)
+        chegara = None
+        if self._qabul(TokenTuri.CHEGARA):
+            t = self._qabul(TokenTuri.PARAMETR)
+            chegara = self._parametr(t) if t else int(self._kutish(TokenTuri.SON).qiymat)
+        return TanlashBuyruq(ustunlar, jadval, shart, tartib, chegara, guruh, taxallus, qoshilishlar or None)
+    
+    def _qoshilish(self):
+        chap = bool(self._qabul(TokenTuri.CHAP))
+        self._kutish(TokenTuri.QOSHILISH)
+        jadval = self._kutish(TokenTuri.IDENTIFIKATOR).qiymat
+        taxallus = t.qiymat if (t := self._qabul(TokenTuri.IDENTIFIKATOR)) else None
+        self._kutish(TokenTuri.USTIDA)
+        return Qoshilish(jadval, taxallus, self._ifoda(), chap)
+    
+    def _nom(self) -> str:
+        """Ustun nomi, ixtiyoriy jadval/taxallus bilan: `ism` yoki `f.ism`."""
+        nom = self._kutish(TokenTuri.IDENTIFIKATOR).qiymat
+        if self._qabul(TokenTuri.NUQTA):
+            nom += '.' + self._kutish(TokenTuri.IDENTIFIKATOR).qiymat
+        return nom
     
     def _ustunlar(self):
         ustunlar = [Ustun(self._kutish(TokenTuri.IDENTIFIKATOR).qiymat)]
@@ -322,13 +443,36 @@ class Parser:
             ustunlar.append(Ustun(self._kutish(TokenTuri.IDENTIFIKATOR).qiymat))
         return ustunlar
     
+    def _tanlash_ustunlari(self):
+        ustunlar = [self._tanlash_ustuni()]
+        while self._qabul(TokenTuri.VERGUL):
+            ustunlar.append(self._tanlash_ustuni())
+        return ustunlar
+    
+    def _tanlash_ustuni(self):
+        """Ustun yoki agregat: `SANASH(*)`, `YIGINDI(narx)` ... (funksiya nomlari band so'z emas)."""
+        nom = self._nom()
+        if nom.upper() not in AGREGATLAR or not self._qabul(TokenTuri.OCHIQ_QAVS):
+            return Ustun(nom)
+        funksiya = nom.upper()
+        if self._qabul(TokenTuri.YULDUZCHA):
+            if funksiya != 'SANASH':
+                raise SyntaxError(f"{funksiya}(*) mumkin emas, ustun kutiladi")
+            ustun = None
+        else:
+            ustun = self._nom()
+        self._kutish(TokenTuri.YOPIQ_QAVS)
+        return Agregat(funksiya, ustun)
+    
     def _tartib(self):
         tartib = []
-        ustun = self._kutish(TokenTuri.IDENTIFIKATOR).qiymat
-        yon = "KAMAYISH" if self._qabul(TokenTuri.KAMAYISH) else "OSHISH"
-        self._qabul(TokenTuri.OSHISH)
-        tartib.append((ustun, yon))
-        return tartib
+        while True:
+            ustun = self._tanlash_ustuni().nom  # agregat natijasi bo'yicha ham tartiblash mumkin
+            yon = "KAMAYISH" if self._qabul(TokenTuri.KAMAYISH) else "OSHISH"
+            self._qabul(TokenTuri.OSHISH)
+            tartib.append((ustun, yon))
+            if not self._qabul(TokenTuri.VERGUL):
+                return tartib
     
     def _ifoda(self): return self._yoki()
     
@@ -358,10 +502,18 @@ class Parser:
             return Literal(float(t.qiymat) if '.' in t.qiymat else int(t.qiymat))
         if t := self._qabul(TokenTuri.SATR):
             return Literal(t.qiymat)
-        if t := self._qabul(TokenTuri.IDENTIFIKATOR):
-            return Ustun(t.qiymat)
+        if self._tekshir(TokenTuri.IDENTIFIKATOR):
+            return Ustun(self._nom())
+        if t := self._qabul(TokenTuri.PARAMETR):
+            return Literal(self._parametr(t))
         raise SyntaxError(f"Kutilmagan: {self._joriy()}")
     
+    def _parametr(self, t: Token) -> Parametr:
+        if t.qiymat != '?':
+            return Parametr(t.qiymat)
+        self.parametr_soni += 1
+        return Parametr(self.parametr_soni - 1)
+    
     def _qosh(self):
         self._kutish(TokenTuri.QOSH)
         self._qabul(TokenTuri.ICHIGA)
@@ -371,32 +523,46 @@ class Parser:
         while self._qabul(TokenTuri.VERGUL):
             ustunlar.append(self._kutish(TokenTuri.IDENTIFIKATOR).qiymat)
         self._kutish(TokenTuri.YOPIQ_QAVS)
-        self._kutish(TokenTuri.QIYMATLAR)
+        # QIYMATLARsiz sarlavha Executor.bajar_kop uchun
+        qatorlar = []
+        if self._qabul(TokenTuri.QIYMATLAR):
+            qatorlar.append(self._qiymatlar_qatori())
+            while self._qabul(TokenTuri.VERGUL):
+                qatorlar.append(self._qiymatlar_qatori())
+        return QoshBuyruq(jadval, ustunlar, qatorlar)
+    
+    def _qiymatlar_qatori(self):
         self._kutish(TokenTuri.OCHIQ_QAVS)
         qiymatlar = [self._qiymat()]
         while self._qabul(TokenTuri.VERGUL):
             qiymatlar.append(self._qiymat())
         self._kutish(TokenTuri.YOPIQ_QAVS)
-        return QoshBuyruq(jadval, ustunlar, qiymatlar)
+        return qiymatlar
     
     def _qiymat(self):
         if t := self._qabul(TokenTuri.SON):
             return float(t.qiymat) if '.' in t.qiymat else int(t.qiymat)
         if t := self._qabul(TokenTuri.SATR):
             return t.qiymat
+        if t := self._qabul(TokenTuri.PARAMETR):
+            return self._parametr(t)
         raise SyntaxError("Qiymat kutiladi")
     
     def _yangilash(self):
         self._kutish(TokenTuri.YANGILASH)
         jadval = self._kutish(TokenTuri.IDENTIFIKATOR).qiymat
         self._kutish(TokenTuri.BELGILASH)
-        ozg = []
-        ustun = self._kutish(TokenTuri.IDENTIFIKATOR).qiymat
-        self._kutish(TokenTuri.TENG)
-        ozg.append((ustun, self._qiymat()))
+        ozg = [self._belgilash()]
+        while self._qabul(TokenTuri.VERGUL):
+            ozg.append(self._belgilash())
         shart = self._ifoda() if self._qabul(TokenTuri.QAYERDA) else None
         return YangilashBuyruq(jadval, ozg, shart)
     
+    def _belgilash(self):
+        ustun = self._kutish(TokenTuri.IDENTIFIKATOR).qiymat
+        self._kutish(TokenTuri.TENG)
+        return ustun, self._qiymat()
+    
     def _ochir(self):
         self._kutish(TokenTuri.OCHIR)
         self._qabul(TokenTuri.JADVALDAN)
@@ -414,6 +580,37 @@ class Parser:
         self._kutish(TokenTuri.YOPIQ_QAVS)
         return JadvalYaratBuyruq(nom, ustunlar)
     
+    def _indeks_yarat(self):
+        self._kutish(TokenTuri.INDEKS_YARAT)
+        nom = self._kutish(TokenTuri.IDENTIFIKATOR).qiymat
+        self._kutish(TokenTuri.JADVALDA)
+        jadval = self._kutish(TokenTuri.IDENTIFIKATOR).qiymat
+        self._kutish(TokenTuri.OCHIQ_QAVS)
+        ustun = self._kutish(TokenTuri.IDENTIFIKATOR).qiymat
+        self._kutish(TokenTuri.YOPIQ_QAVS)
+        return IndeksYaratBuyruq(nom, jadval, ustun)
+    
+    def _yuklash(self):
+        self._kutish(TokenTuri.YUKLASH)
+        jadval = self._kutish(TokenTuri.IDENTIFIKATOR).qiymat
+        self._kutish(TokenTuri.FAYLDAN)
+        return YuklashBuyruq(jadval, self._kutish(TokenTuri.SATR).qiymat)
+    
+    def _siqish(self):
+        self._kutish(TokenTuri.SIQISH)
+        return SiqishBuyruq(self._kutish(TokenTuri.IDENTIFIKATOR).qiymat)
+
+    def _tahlil_qil(self):
+        self._kutish(TokenTuri.TAHLIL_QIL)
+        return TahlilQilBuyruq(self._kutish(TokenTuri.IDENTIFIKATOR).qiymat)
+
+    def _tushuntir(self):
+        self._kutish(TokenTuri.TUSHUNTIR)
+        tahlil = self._qabul(TokenTuri.TAHLIL) is not None
+        if not self._tekshir(TokenTuri.TANLASH):
+            raise SyntaxError("TUSHUNTIR faqat TANLASH uchun")
+        return TushuntirBuyruq(self._tanlash(), tahlil)
+
     def _ustun_tavsifi(self):
         tavsif = {'nom': self._kutish(TokenTuri.IDENTIFIKATOR).qiymat, 'tur': 'MATN', 'cheklovlar': []}
         turlar = {TokenTuri.BUTUN_SON: 'BUTUN_SON', TokenTuri.MATN: 'MATN', TokenTuri.HAQIQIY: 'HAQIQIY'}
@@ -441,14 +638,48 @@ PAGE_SIZE = 4096
 HEADER_SIZE = 16
 SLOT_SIZE = 4
 
+# Slot bayroqlari - hajm maydonining yuqori bitlari (qator hajmi 4 KiB dan kichik)
+YONALTIRISH = 0x8000   # qator ko'chgan: slot ma'lumoti - yangi joy (RID); rid o'zgarmaydi
+KOCHIRILGAN = 0x4000   # ko'chirib kelingan qator: oldida uy rid (RID), skan uni o'tkazib yuboradi
+HAJM_NIQOBI = 0x3FFF
+RID = struct.Struct('<IH')
+
+# Sarlavha: page_id, num_rows, free_start, free_end, tirik qatorlar soni, bayroqlar
+SARLAVHA = struct.Struct('<IHHHHH')
+SAHIFA_V2 = 0x0001  # bayroq: tirik qatorlar soni maydoni yuritiladi (eski sahifalarda 0)
+
+FSM_QADAM = 16  # FSM bir bayti = 16 bayt bo'sh joy
+
+
+def _pread(fd: int, n: int, off: int) -> bytes:
+    if hasattr(os, 'pread'):
+        return os.pread(fd, n, off)
+    os.lseek(fd, off, os.SEEK_SET)
+    return os.read(fd, n)
+
+
+def _pwrite(fd: int, data, off: int):
+    if hasattr(os, 'pwrite'):
+        return os.pwrite(fd, data, off)
+    os.lseek(fd, off, os.SEEK_SET)
+    return os.write(fd, data)
+
+
 class Page:
     def __init__(self, page_id: int, data: bytearray = None):
         self.page_id = page_id
-        if data:
+        self.dirty = False
+        self.qadalgan = 0  # pin soni: >0 bo'lsa pool sahifani chiqarmaydi
+        # WAL uchun: oxirgi yozilgandan beri o'zgargan (offset, uzunlik) oraliqlari
+        self.ozgarishlar: List[Tuple[int, int]] = []
+        # True - sahifada o'chirilgan slot yo'qligi aniq (har qo'shishda slotlarni qidirmaslik uchun)
+        self._bosh_slot_yoq = data is None
+        self._bosh_joy: Optional[int] = None  # bosh_joy() keshi; slotlar o'zgarsa tashlanadi
+        self._tirik: Optional[int] = 0
+        # free_start == 0 bo'lsa sahifa hech qachon yozilmagan (fayldagi teshik)
+        if data is not None and struct.unpack_from('<H', data, 6)[0]:
             self.data = data
-            self.num_rows = struct.unpack_from('<H', data, 4)[0]
-            self.free_start = struct.unpack_from('<H', data, 6)[0]
-            self.free_end = struct.unpack_from('<H', data, 8)[0]
+            self._header_oqish()
         else:
             self.data = bytearray(PAGE_SIZE)
             self.num_rows = 0
@@ -456,244 +687,4006 @@ class Page:
             self.free_end = PAGE_SIZE
             self._write_header()
     
+    def _header_oqish(self):
+        _, self.num_rows, self.free_start, self.free_end, tirik, bayroq = SARLAVHA.unpack_from(self.data)
+        # eski formatdagi sahifa: soni kerak bo'lganda slotlardan hisoblanadi
+        self._tirik = tirik if bayroq & SAHIFA_V2 else None
+    
     def _write_header(self):
-        struct.pack_into('<I', self.data, 0, self.page_id)
-        struct.pack_into('<H', self.data, 4, self.num_rows)
-        struct.pack_into('<H', self.data, 6, self.free_start)
-        struct.pack_into('<H', self.data, 8, self.free_end)
+        SARLAVHA.pack_into(self.data, 0, self.page_id, self.num_rows, self.free_start, self.free_end,
+                           self.tirik_soni(), SAHIFA_V2)
+    
+    def tirik_soni(self) -> int:
+        """Uyi shu sahifada bo'lgan qatorlar soni (bo'sh va ko'chirib kelingan slotlarsiz)."""
+        if self._tirik is None:
+            self._tirik = sum(1 for h in self._slot_hajmlari() if h and not h & KOCHIRILGAN)
+        return self._tirik
+    
+    def _yoziladigan(self):
+        # mmap oynasi faqat o'qish uchun - birinchi yozuvda nusxa olinadi
+        if isinstance(self.data, memoryview):
+            self.data = bytearray(self.data)
+    
+    def _slot_hajmlari(self) -> Tuple[int, ...]:
+        return struct.unpack_from(f'<{2 * self.num_rows}H', self.data, HEADER_SIZE)[1::2]
+    
+    def _bosh_slot(self) -> Optional[int]:
+        """O'chirilgan (0, 0) slot raqami - yangi qator uchun qayta ishlatiladi."""
+        if self._bosh_slot_yoq:
+            return None
+        try:
+            return self._slot_hajmlari().index(0)
+        except ValueError:
+            self._bosh_slot_yoq = True
+            return None
+    
+    def bosh_joy(self) -> int:
+        """Siqishdan keyin bo'shaydigan jami bayt (o'chirilgan va eskirgan qatorlar joyi bilan)."""
+        if self._bosh_joy is None:
+            band = sum(max(h & HAJM_NIQOBI, RID.size) for h in self._slot_hajmlari() if h)
+            self._bosh_joy = PAGE_SIZE - HEADER_SIZE - self.num_rows * SLOT_SIZE - band
+        return self._bosh_joy
+    
+    def sigadimi(self, n: int) -> bool:
+        if self.free_end - self.free_start - SLOT_SIZE >= max(n, RID.size):
+            return True
+        slot_joy = 0 if self._bosh_slot() is not None else SLOT_SIZE
+        return self.bosh_joy() - slot_joy >= max(n, RID.size)
+    
+    def ixchamlash(self):
+        """Tirik qatorlarni sahifa oxiriga zich ko'chiradi; slot raqamlari (rid) o'zgarmaydi.
+
+        Oxiridagi bo'sh slotlar olib tashlanadi. WAL uchun butun sahifa o'zgargan hisoblanadi.
+        """
+        n = self.num_rows
+        slotlar = struct.unpack_from(f'<{2 * n}H', self.data, HEADER_SIZE)
+        hajmlar = slotlar[1::2]
+        while n and not hajmlar[n - 1]:
+            n -= 1
+        yangi = bytearray(PAGE_SIZE)
+        end = PAGE_SIZE
+        for i in range(n):
+            off, h = slotlar[2 * i], hajmlar[i]
+            if h:
+                hajm = h & HAJM_NIQOBI
+                end -= max(hajm, RID.size)
+                yangi[end:end + hajm] = self.data[off:off + hajm]
+                struct.pack_into('<HH', yangi, HEADER_SIZE + i * SLOT_SIZE, end, h)
+        self.data = yangi
+        self.num_rows, self.free_start, self.free_end = n, HEADER_SIZE + n * SLOT_SIZE, end
+        self._bosh_joy = None
+        self._write_header()
+        self.ozgarishlar.append((0, PAGE_SIZE))
+        self.dirty = True
+    
+    def _joy_ajratish(self, n: int) -> Optional[Tuple[int, int]]:
+        """n baytlik qator uchun joy va slot ajratadi; (offset, slot) qaytaradi.
+
+        Kamida RID.size bayt ajratiladi - keyin qator ko'chsa, o'rniga yo'naltirish sig'adi.
+        O'chirilgan slot bo'lsa qayta ishlatiladi; uzluksiz joy yetmasa sahifa ixchamlanadi.
+        """
+        kerak = max(n, RID.size)
+        slot = self._bosh_slot()
+        if self.free_end - self.free_start - (SLOT_SIZE if slot is None else 0) < kerak:
+            if not self.sigadimi(n):
+                return None
+            self.ixchamlash()
+            slot = self._bosh_slot()
+        self._yoziladigan()
+        self.free_end -= kerak
+        if self._bosh_joy is not None:
+            self._bosh_joy -= kerak
+        self._tirik = self.tirik_soni() + 1
+        if slot is None:
+            slot = self.num_rows
+            self.num_rows += 1
+            self.free_start += SLOT_SIZE
+            if self._bosh_joy is not None:
+                self._bosh_joy -= SLOT_SIZE
+        joy = HEADER_SIZE + slot * SLOT_SIZE
+        struct.pack_into('<HH', self.data, joy, self.free_end, n)
+        self.ozgarishlar += [(self.free_end, n), (joy, SLOT_SIZE), (0, HEADER_SIZE)]
+        self._write_header()
+        self.dirty = True
+        return self.free_end, slot
     
     def insert(self, row: bytes) -> Optional[int]:
-        if self.free_end - self.free_start - SLOT_SIZE < len(row):
+        joy = self._joy_ajratish(len(row))
+        if joy is None:
+            return None
+        off, slot = joy
+        self.data[off:off + len(row)] = row
+        return slot
+    
+    def insert_kodlangan(self, kodek: 'QatorKodek', q: list, hajm: int) -> Optional[int]:
+        """Normallashtirilgan qatorni oraliq bytes yaratmay to'g'ridan-to'g'ri sahifaga yozadi."""
+        joy = self._joy_ajratish(hajm)
+        if joy is None:
             return None
-        self.free_end -= len(row)
-        self.data[self.free_end:self.free_end + len(row)] = row
-        struct.pack_into('<H', self.data, self.free_start, self.free_end)
-        struct.pack_into('<H', self.data, self.free_start + 2, len(row))
-        self.free_start += SLOT_SIZE
-        self.num_rows += 1
+        off, slot = joy
+        kodek.yoz(self.data, off, q)
+        return slot
+    
+    def qayta_qollash(self, off: int, bayt: bytes):
+        """WAL redo yozuvini sahifaga qo'llaydi (idempotent)."""
+        self._yoziladigan()
+        self.data[off:off + len(bayt)] = bayt
+        self._header_oqish()
+        self._bosh_slot_yoq = False
+        self._bosh_joy = None
+        self.dirty = True
+    
+    def bayt_ajratish(self, n: int) -> Optional[int]:
+        """Yangi slotsiz n bayt joy (mavjud slot qatorini shu sahifada kattaroq joyga ko'chirish uchun).
+
+        Sahifa ixchamlanishi mumkin - oldin o'qilgan slot offsetlari eskiradi.
+        """
+        if self.free_end - self.free_start < max(n, RID.size):
+            if self.bosh_joy() < max(n, RID.size):
+                return None
+            self.ixchamlash()
+        self._yoziladigan()
+        self.free_end -= max(n, RID.size)
+        self._bosh_joy = None
+        self.ozgarishlar.append((0, HEADER_SIZE))
         self._write_header()
-        return self.num_rows - 1
+        self.dirty = True
+        return self.free_end
+    
+    def slot(self, slot: int) -> Tuple[int, int]:
+        """(offset, hajm) - hajm bayroqlari bilan."""
+        return struct.unpack_from('<HH', self.data, HEADER_SIZE + slot * SLOT_SIZE)
+    
+    def slot_yoz(self, slot: int, off: int, hajm: int):
+        self._yoziladigan()
+        joy = HEADER_SIZE + slot * SLOT_SIZE
+        tirik, eski = self.tirik_soni(), struct.unpack_from('<H', self.data, joy + 2)[0]
+        struct.pack_into('<HH', self.data, joy, off, hajm)
+        self.ozgarishlar.append((joy, SLOT_SIZE))
+        farq = bool(hajm and not hajm & KOCHIRILGAN) - bool(eski and not eski & KOCHIRILGAN)
+        if farq:
+            self._tirik = tirik + farq
+            self._write_header()
+            self.ozgarishlar.append((0, HEADER_SIZE))
+        self._bosh_joy = None
+        if not hajm:
+            self._bosh_slot_yoq = False
+        self.dirty = True
+    
+    def qator_yoz(self, off: int, kodek: 'QatorKodek', q: list, hajm: int):
+        self._yoziladigan()
+        kodek.yoz(self.data, off, q)
+        self.ozgarishlar.append((off, hajm))
+        self.dirty = True
+    
+    def bayt_yoz(self, off: int, bayt):
+        self._yoziladigan()
+        self.data[off:off + len(bayt)] = bayt
+        self.ozgarishlar.append((off, len(bayt)))
+        self.dirty = True
+    
+    def get(self, slot: int) -> Optional[memoryview]:
+        """Oddiy qator ma'lumoti; bo'sh, yo'naltirilgan va ko'chirib kelingan slotlar uchun None."""
+        if slot >= self.num_rows:
+            return None
+        row_off, row_sz = struct.unpack_from('<HH', self.data, HEADER_SIZE + slot * SLOT_SIZE)
+        if row_sz == 0 or row_sz & (YONALTIRISH | KOCHIRILGAN):
+            return None
+        return memoryview(self.data)[row_off:row_off + row_sz]
+    
+    def yonaltirish(self, slot: int) -> Optional[Tuple[int, int]]:
+        """Slot yo'naltirish bo'lsa - qatorning hozirgi joyi (page_id, slot)."""
+        if slot >= self.num_rows:
+            return None
+        row_off, row_sz = self.slot(slot)
+        return RID.unpack_from(self.data, row_off) if row_sz & YONALTIRISH else None
     
-    def get(self, slot: int) -> Optional[bytes]:
+    def kochirilgan(self, slot: int) -> Optional[memoryview]:
+        """Ko'chirib kelingan qator ma'lumoti (uy rid prefiksisiz)."""
         if slot >= self.num_rows:
             return None
-        off = HEADER_SIZE + slot * SLOT_SIZE
-        row_off = struct.unpack_from('<H', self.data, off)[0]
-        row_sz = struct.unpack_from('<H', self.data, off + 2)[0]
-        if row_off == 0 and row_sz == 0:
+        row_off, row_sz = self.slot(slot)
+        if not row_sz & KOCHIRILGAN:
             return None
-        return bytes(self.data[row_off:row_off + row_sz]) if row_sz > 0 else None
+        return memoryview(self.data)[row_off + RID.size:row_off + (row_sz & HAJM_NIQOBI)]
 
 
-class Storage:
-    def __init__(self, filename: str):
-        self.filename = filename
-        self.pages: List[Page] = []
-        if os.path.exists(filename):
-            with open(filename, 'rb') as f:
-                data = f.read()
-            for i in range(len(data) // PAGE_SIZE):
-                self.pages.append(Page(i, bytearray(data[i*PAGE_SIZE:(i+1)*PAGE_SIZE])))
-    
-    def allocate(self) -> Page:
-        page = Page(len(self.pages))
-        self.pages.append(page)
-        self.flush()
-        return page
-    
-    def flush(self):
-        with open(self.filename, 'wb') as f:
-            for p in self.pages:
-                f.write(p.data)
+class BufferPool:
+    """Cheklangan sonli Page ramkalari, LRU bo'yicha chiqarib yuboriladi.
 
+    Bir nechta Storage bitta pool'ni bo'lishishi mumkin; iflos sahifa
+    chiqarilganda o'z fayliga yozib qo'yiladi. Sahifani o'zgartiradigan kod uni
+    `qada=True` bilan oladi va ish tugagach `yech` qiladi - qadalgan ramka
+    chiqarilmaydi, aks holda o'zgarish pool'dan tashqaridagi nusxaga tushib yo'qolardi.
+    """
 
-# ============================================================
-# 4. EXECUTOR
-# ============================================================
+    def __init__(self, sigim: int = 1024):
+        self.sigim = max(1, sigim)
+        self.ramkalar: 'OrderedDict[Tuple[str, int], Tuple[Storage, Page]]' = OrderedDict()
+        # TUSHUNTIR TAHLIL uchun: jami murojaatlar va ulardan fayldan o'qilganlari
+        self.murojaatlar = 0
+        self.oqishlar = 0
+        # turli jadvallarni o'qiyotgan/yozayotgan oqimlar bitta pool'ni bo'lishadi
+        self._mutex = threading.RLock()
 
-@dataclass
-class UstunSchema:
-    nom: str
-    tur: str
-    asosiy_kalit: bool = False
-    bosh_emas: bool = False
+    def olish(self, storage: 'Storage', page_id: int, qada: bool = False) -> Page:
+        kalit = (storage.filename, page_id)
+        with self._mutex:
+            self.murojaatlar += 1
+            ramka = self.ramkalar.get(kalit)
+            if ramka is not None:
+                self.ramkalar.move_to_end(kalit)
+                page = ramka[1]
+            else:
+                self.oqishlar += 1
+                page = storage._oqish(page_id)
+                self._joylash(kalit, storage, page)
+            if qada:
+                page.qadalgan += 1
+            return page
 
-@dataclass
-class JadvalSchema:
-    nom: str
-    ustunlar: List[UstunSchema]
+    def qosh(self, storage: 'Storage', page: Page, qada: bool = False):
+        with self._mutex:
+            self._joylash((storage.filename, page.page_id), storage, page)
+            if qada:
+                page.qadalgan += 1
 
+    def yech(self, page: Page):
+        with self._mutex:
+            page.qadalgan -= 1
 
-class Executor:
-    def __init__(self, db_path: str = "uzdb_data"):
-        self.db_path = db_path
-        self.jadvallar: Dict[str, JadvalSchema] = {}
-        self.storage: Dict[str, Storage] = {}
-        os.makedirs(db_path, exist_ok=True)
-        self._metadata_yukla()
+    def _joylash(self, kalit, storage, page):
+        # Qadalgan sahifa chiqarilmaydi; chiqaradigan sahifa qolmasa pool sig'imdan vaqtincha oshadi.
+        while len(self.ramkalar) >= self.sigim:
+            for eski_kalit, (egasi, eski) in self.ramkalar.items():
+                if not eski.qadalgan:
+                    break
+            else:
+                break
+            del self.ramkalar[eski_kalit]
+            if eski.dirty:
+                egasi._yozish(eski)
+        self.ramkalar[kalit] = (storage, page)
+
+    def iflos(self, storage: 'Storage') -> List[Page]:
+        with self._mutex:
+            return sorted((p for s, p in self.ramkalar.values() if s is storage and p.dirty),
+                          key=lambda p: p.page_id)
+
+    def tashla(self, storage: 'Storage'):
+        with self._mutex:
+            for kalit in [k for k, (s, _) in self.ramkalar.items() if s is storage]:
+                del self.ramkalar[kalit]
+
+
+class _Sahifalar(Sequence):
+    """`storage.pages` - sahifalarni pool orqali talab bo'yicha o'qiydi."""
+
+    def __init__(self, storage: 'Storage'):
+        self.storage = storage
+
+    def __len__(self):
+        return self.storage.sahifalar_soni
+
+    def __getitem__(self, i):
+        n = self.storage.sahifalar_soni
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError(i)
+        return self.storage.page(i)
+
+
+class Storage:
+    def __init__(self, filename: str, pool: BufferPool = None, mmap_rejim: bool = False,
+                 faqat_oqish: bool = False):
+        self.filename = filename
+        self.pool = pool if pool is not None else BufferPool()
+        rejim = os.O_RDONLY if faqat_oqish else os.O_RDWR | os.O_CREAT
+        self.fd = os.open(filename, rejim | getattr(os, 'O_BINARY', 0), 0o644)
+        self.sahifalar_soni = os.fstat(self.fd).st_size // PAGE_SIZE
+        self.mmap_rejim = mmap_rejim
+        self.wal: Optional['WAL'] = None
+        self._mm: Optional[mmap.mmap] = None
+        self._mm_sahifalar = 0
+        self.fsm_fayl = os.path.splitext(filename)[0] + '.fsm'
+        self._fsm: Optional[bytearray] = None
+        self._fsm_ozgardi = False
+        self._fsm_kursor = 0
+        if mmap_rejim:
+            self._xarita()
     
-    def _metadata_yukla(self):
-        meta = os.path.join(self.db_path, "metadata.txt")
-        if os.path.exists(meta):
-            with open(meta) as f:
-                for line in f:
-                    parts = line.strip().split('|')
-                    if len(parts) >= 2:
-                        nom = parts[0]
-                        ustunlar = []
-                        for u in parts[1:]:
-                            up = u.split(':')
-                            ustunlar.append(UstunSchema(up[0], up[1] if len(up) > 1 else 'MATN',
-                                                        'PK' in up, 'NN' in up))
-                        self.jadvallar[nom] = JadvalSchema(nom, ustunlar)
-                        self.storage[nom] = Storage(os.path.join(self.db_path, f"{nom}.uzdb"))
+    def _xarita(self):
+        # Eski xarita ochiq memoryview'lar bo'lsa ham tirik qoladi, GC yopadi
+        if self.sahifalar_soni:
+            self._mm = mmap.mmap(self.fd, self.sahifalar_soni * PAGE_SIZE, access=mmap.ACCESS_READ)
+            self._mm_sahifalar = self.sahifalar_soni
     
-    def _metadata_saqlash(self):
-        with open(os.path.join(self.db_path, "metadata.txt"), 'w') as f:
-            for nom, s in self.jadvallar.items():
-                us = '|'.join(f"{u.nom}:{u.tur}" + (":PK" if u.asosiy_kalit else "") for u in s.ustunlar)
-                f.write(f"{nom}|{us}\n")
+    @property
+    def pages(self) -> _Sahifalar:
+        return _Sahifalar(self)
     
-    def bajar(self, sql: str):
-        ast = Parser.parse(sql)
-        if isinstance(ast, JadvalYaratBuyruq): return self._jadval_yarat(ast)
-        if isinstance(ast, QoshBuyruq): return self._qosh(ast)
-        if isinstance(ast, TanlashBuyruq): return self._tanlash(ast)
-        if isinstance(ast, YangilashBuyruq): return self._yangilash(ast)
-        if isinstance(ast, OchirBuyruq): return self._ochir(ast)
-        raise ValueError(f"Noma'lum: {type(ast)}")
+    def page(self, page_id: int, qada: bool = False) -> Page:
+        return self.pool.olish(self, page_id, qada)
+
+    def yech(self, page: Page):
+        self.pool.yech(page)
     
-    def _jadval_yarat(self, ast):
-        if ast.nom in self.jadvallar:
-            raise ValueError(f"Jadval mavjud: {ast.nom}")
-        ustunlar = [UstunSchema(u['nom'], u.get('tur', 'MATN'), 'ASOSIY_KALIT' in u.get('cheklovlar', []),
-                                'BOSH_EMAS' in u.get('cheklovlar', [])) for u in ast.ustunlar]
-        self.jadvallar[ast.nom] = JadvalSchema(ast.nom, ustunlar)
-        self.storage[ast.nom] = Storage(os.path.join(self.db_path, f"{ast.nom}.uzdb"))
-        self.storage[ast.nom].allocate()
-        self._metadata_saqlash()
-        return f"✅ Jadval yaratildi: {ast.nom}"
+    def _oqish(self, page_id: int) -> Page:
+        if page_id < self._mm_sahifalar:
+            off = page_id * PAGE_SIZE
+            return Page(page_id, memoryview(self._mm)[off:off + PAGE_SIZE])
+        data = bytearray(_pread(self.fd, PAGE_SIZE, page_id * PAGE_SIZE))
+        if len(data) < PAGE_SIZE:
+            data.extend(bytes(PAGE_SIZE - len(data)))
+        return Page(page_id, data)
     
-    def _qosh(self, ast):
-        if ast.jadval not in self.jadvallar:
-            raise ValueError(f"Jadval topilmadi: {ast.jadval}")
-        schema = self.jadvallar[ast.jadval]
-        row = {u: q for u, q in zip(ast.ustunlar, ast.qiymatlar)}
-        data = self._serialize(schema, row)
-        storage = self.storage[ast.jadval]
-        page = storage.pages[-1] if storage.pages else storage.allocate()
-        if page.insert(data) is None:
-            page = storage.allocate()
-            page.insert(data)
-        storage.flush()
-        return "✅ 1 ta qator qo'shildi"
+    def _yozish(self, page: Page):
+        if self.wal is not None:
+            self.wal.sinxron()  # WAL qoidasi: log sahifadan oldin diskka tushadi
+        _pwrite(self.fd, page.data, page.page_id * PAGE_SIZE)
+        page.dirty = False
+        page.ozgarishlar.clear()
     
-    def _tanlash(self, ast):
-        if ast.jadval not in self.jadvallar:
-            raise ValueError(f"Jadval topilmadi: {ast.jadval}")
-        schema = self.jadvallar[ast.jadval]
-        rows = []
-        for page in self.storage[ast.jadval].pages:
-            for i in range(page.num_rows):
-                data = page.get(i)
-                if data:
-                    row = self._deserialize(schema, data)
-                    if row:
-                        rows.append(row)
-        if ast.shart:
-            rows = [r for r in rows if self._shart(ast.shart, r)]
-        if ast.tartib:
-            for u, y in reversed(ast.tartib):
-                rows.sort(key=lambda r: r.get(u, 0), reverse=(y == "KAMAYISH"))
-        if ast.chegara:
-            rows = rows[:ast.chegara]
-        if not any(isinstance(u, Yulduzcha) for u in ast.ustunlar):
-            cols = [u.nom for u in ast.ustunlar]
-            rows = [{k: v for k, v in r.items() if k in cols} for r in rows]
-        return rows
+    def qator(self, rid: Tuple[int, int]) -> Optional[memoryview]:
+        page_id, slot = rid
+        if page_id >= self.sahifalar_soni:
+            return None
+        page = self.page(page_id)
+        data = page.get(slot)
+        if data is None and (yangi := page.yonaltirish(slot)) is not None:
+            data = self.page(yangi[0]).kochirilgan(yangi[1])
+        return data
     
-    def _yangilash(self, ast):
-        if ast.jadval not in self.jadvallar:
-            raise ValueError(f"Jadval topilmadi: {ast.jadval}")
-        return "✅ Yangilash (demo)"
+    def qator_yangilash(self, rid: Tuple[int, int], kodek: 'QatorKodek', q: list, hajm: int) -> List[Page]:
+        """Qatorni yangi qiymat bilan qayta yozadi, rid o'zgarmaydi; tegilgan sahifalarni qaytaradi.
+
+        Sig'sa - joyida; bo'lmasa uy sahifasining bo'sh joyiga; u ham bo'lmasa boshqa
+        sahifaga ko'chiriladi va uy slotiga yo'naltirish yoziladi (zanjir bir bo'g'indan oshmaydi).
+        Qaytarilgan sahifalar qadalgan - chaqiruvchi ularni WAL'ga yozib, har birini `yech` qiladi.
+        Eski ko'chirilgan nusxa yangi joy tayyor bo'lgandan keyingina bo'shatiladi.
+        """
+        uy = self.page(rid[0], qada=True)
+        tegilgan = [uy]
+        try:
+            off, h = uy.slot(rid[1])
+            joy = joy_rid = None
+            if h & YONALTIRISH:
+                joy_rid = RID.unpack_from(uy.data, off)
+                joy = self.page(joy_rid[0], qada=True)
+                tegilgan.append(joy)
+                joff, jh = joy.slot(joy_rid[1])
+                if RID.size + hajm <= jh & HAJM_NIQOBI:
+                    joy.qator_yoz(joff + RID.size, kodek, q, hajm)
+                    joy.slot_yoz(joy_rid[1], joff, (RID.size + hajm) | KOCHIRILGAN)
+                    return tegilgan
+            elif hajm <= h:
+                uy.qator_yoz(off, kodek, q, hajm)
+                uy.slot_yoz(rid[1], off, hajm)
+                return tegilgan
+            yangi_off = uy.bayt_ajratish(hajm)
+            if yangi_off is not None:
+                uy.qator_yoz(yangi_off, kodek, q, hajm)
+                uy.slot_yoz(rid[1], yangi_off, hajm)
+            else:
+                off = uy.slot(rid[1])[0]  # bayt_ajratish sahifani ixchamlagan bo'lishi mumkin
+                if not h & YONALTIRISH and h < RID.size:
+                    # eski formatdagi juda kichik qator: yo'naltirish uchun joy kerak
+                    off = uy.bayt_ajratish(RID.size)
+                    if off is None:
+                        raise ValueError(f"Qatorni ko'chirib bo'lmadi: {rid[0]}-sahifada joy yo'q")
+                maqsad = self.joy_top(RID.size + hajm, qada=True)
+                tegilgan.append(maqsad)
+                q_off, slot = maqsad._joy_ajratish(RID.size + hajm)
+                try:
+                    maqsad.bayt_yoz(q_off, RID.pack(*rid))
+                    maqsad.qator_yoz(q_off + RID.size, kodek, q, hajm)
+                    maqsad.slot_yoz(slot, q_off, (RID.size + hajm) | KOCHIRILGAN)
+                except BaseException:
+                    maqsad.slot_yoz(slot, 0, 0)  # yarim yozilgan nusxa skanga chiqmaydi
+                    raise
+                uy.bayt_yoz(off, RID.pack(maqsad.page_id, slot))
+                uy.slot_yoz(rid[1], off, RID.size | YONALTIRISH)
+            if joy is not None:
+                joy.slot_yoz(joy_rid[1], 0, 0)  # eski nusxa endi bo'shaydi
+            return tegilgan
+        except BaseException:
+            for page in tegilgan:
+                self.yech(page)
+            raise
     
-    def _ochir(self, ast):
-        if ast.jadval not in self.jadvallar:
-            raise ValueError(f"Jadval topilmadi: {ast.jadval}")
-        return "✅ O'chirish (demo)"
+    def sahifa_qatorlari(self, page: Page):
+        """Uyi shu sahifada bo'lgan qatorlar: (slot, ma'lumot); yo'naltirishlar ochiladi."""
+        for i in range(page.num_rows):
+            data = page.get(i)
+            if data is None:
+                yangi = page.yonaltirish(i)
+                if yangi is None:
+                    continue
+                data = self.page(yangi[0]).kochirilgan(yangi[1])
+            yield i, data
     
-    def _shart(self, s, row):
-        if isinstance(s, Taqqoslash):
-            c = row.get(s.chap.nom) if isinstance(s.chap, Ustun) else s.chap.qiymat
-            o = row.get(s.ong.nom) if isinstance(s.ong, Ustun) else s.ong.qiymat
-            if s.operator == '=': return c == o
-            if s.operator == '!=': return c != o
-            if s.operator == '>': return c > o
-            if s.operator == '<': return c < o
-            if s.operator == '>=': return c >= o
-            if s.operator == '<=': return c <= o
-        if isinstance(s, MantiqiyIfoda):
-            c, o = self._shart(s.chap, row), self._shart(s.ong, row)
-            return (c and o) if s.operator == 'VA' else (c or o)
-        return True
+    def allocate(self, qada: bool = False) -> Page:
+        page = Page(self.sahifalar_soni)
+        page.dirty = True
+        self.sahifalar_soni += 1
+        self.pool.qosh(self, page, qada)
+        if self._fsm is not None and len(self._fsm) == page.page_id:
+            self._fsm.append(page.bosh_joy() // FSM_QADAM)
+            self._fsm_ozgardi = True
+        return page
     
-    def _serialize(self, schema, row):
-        result = b''
-        for u in schema.ustunlar:
-            v = row.get(u.nom)
-            if u.tur == 'BUTUN_SON':
-                result += struct.pack('<i', v if v else 0)
-            elif u.tur == 'HAQIQIY':
-                result += struct.pack('<d', v if v else 0.0)
-            else:
-                enc = (str(v) if v else '').encode('utf-8')
-                result += struct.pack('<H', len(enc)) + enc
-        return result
+    # --- Bo'sh joy xaritasi (FSM) ---
+    # Har sahifaga bitta bayt: bosh_joy() // FSM_QADAM. Faqat maslahat - joy_top sahifaning
+    # o'zida tekshiradi, shuning uchun crash'dan keyin eskirgan xarita xavfsiz.
     
-    def _deserialize(self, schema, data):
-        if not data or len(data) < 4:
-            return None
-        off, row = 0, {}
-        try:
-            for u in schema.ustunlar:
-                if u.tur == 'BUTUN_SON':
-                    row[u.nom] = struct.unpack_from('<i', data, off)[0]
-                    off += 4
-                elif u.tur == 'HAQIQIY':
-                    row[u.nom] = struct.unpack_from('<d', data, off)[0]
-                    off += 8
-                else:
-                    ln = struct.unpack_from('<H', data, off)[0]
-                    off += 2
-                    row[u.nom] = data[off:off+ln].decode('utf-8')
-                    off += ln
-            return row
-        except:
-            return None
+    def _fsm_ol(self) -> bytearray:
+        if self._fsm is None:
+            self._fsm = bytearray()
+            if os.path.exists(self.fsm_fayl):
+                with open(self.fsm_fayl, 'rb') as f:
+                    self._fsm = bytearray(f.read()[:self.sahifalar_soni])
+        if len(self._fsm) != self.sahifalar_soni:
+            # YUKLASH yoki recovery'dan keyin yetishmagan sahifalar hisoblanadi
+            del self._fsm[self.sahifalar_soni:]
+            self._fsm.extend(min(self.page(i).bosh_joy() // FSM_QADAM, 255)
+                             for i in range(len(self._fsm), self.sahifalar_soni))
+            self._fsm_ozgardi = True
+        return self._fsm
     
-    def jadvallar_royxati(self):
-        return list(self.jadvallar.keys())
+    def fsm_yangila(self, page: Page):
+        fsm = self._fsm_ol()
+        fsm[page.page_id] = min(page.bosh_joy() // FSM_QADAM, 255)
+        self._fsm_ozgardi = True
+    
+    def fsm_tashla(self):
+        """Xarita sahifalardan qayta hisoblanadi (recovery'dan keyin)."""
+        self._fsm = bytearray()
+        self._fsm_ozgardi = True
+    
+    def joy_top(self, n: int, qada: bool = False) -> Page:
+        """n baytlik yangi qator sig'adigan sahifa: avval bo'shagan joylar, keyin yangi sahifa."""
+        fsm = self._fsm_ol()
+        daraja = min(-(-(max(n, RID.size) + SLOT_SIZE) // FSM_QADAM), 255)
+        naqsh = re.compile(b'[\\x%02x-\\xff]' % daraja)  # re keshidan olinadi
+        bosh = self._fsm_kursor if self._fsm_kursor < len(fsm) else 0
+        for start, stop in ((bosh, len(fsm)), (0, bosh)):
+            while (m := naqsh.search(fsm, start, stop)) is not None:
+                page = self.page(m.start(), qada)
+                if page.sigadimi(n):
+                    self._fsm_kursor = page.page_id
+                    return page
+                if qada:
+                    self.yech(page)
+                self.fsm_yangila(page)
+                start = m.start() + 1
+        return self.allocate(qada)
+    
+    def _fsm_saqlash(self):
+        if self._fsm_ozgardi and self._fsm is not None:
+            with open(self.fsm_fayl, 'wb') as f:
+                f.write(self._fsm_ol())
+            self._fsm_ozgardi = False
+    
+    def flush(self):
+        with self.pool._mutex:
+            for page in self.pool.iflos(self):
+                self._yozish(page)
+            self._fsm_saqlash()
+            if self.mmap_rejim and self._mm_sahifalar < self.sahifalar_soni:
+                self._xarita()
+    
+    def close(self):
+        if self.fd is None:
+            return
+        self.flush()
+        self.pool.tashla(self)
+        if self._mm is not None:
+            try:
+                self._mm.close()
+            except BufferError:
+                pass
+            self._mm = None
+            self._mm_sahifalar = 0
+        os.close(self.fd)
+        self.fd = None
 
 
-# ============================================================
-# 5. CLI
-# ============================================================
+class WAL:
+    """Ma'lumotlar bazasi katalogidagi append-only redo log.
 
-class CLI:
-    def __init__(self, db_path="uzdb_data"):
-        self.executor = Executor(db_path)
-        self.running = True
-    
-    def boshlash(self):
-        print("""
-╔═══════════════════════════════════════════════════════════╗
-║      🗄️  UZDB - O'ZBEKCHA DATABASE ENGINE                 ║
-║      .yordam - yo'riqnoma  |  .chiqish - chiqish          ║
-╚═══════════════════════════════════════════════════════════╝
-        """)
-        while self.running:
-            try:
-                sql = input("\033[32muzdb\033[0m> ").strip()
+    Har bir yozuv - bitta sahifaning o'zgargan bayt oraliqlari. `yoz` yozuvni darhol
+    OS'ga yozib, uning LSN'ini (tartib raqamini) qaytaradi; buyruq tugaganda
+    `tasdiqla(lsn)` shu yozuv fsync qilinguncha kutadi (group commit): bir vaqtda
+    tasdiqlayotgan oqimlardan biri yetakchi bo'lib bitta fsync bilan hammaning
+    yozuvlarini diskka tushiradi, qolganlari uni kutadi.
+    """
+
+    SARLAVHA = struct.Struct('<II')  # payload uzunligi, crc32
+
+    def __init__(self, filename: str, guruh_hajmi: int = 64, guruh_vaqti: float = 0.01):
+        self.filename = filename
+        self.guruh_hajmi = max(1, guruh_hajmi)
+        self.guruh_vaqti = guruh_vaqti
+        self.fd = os.open(filename, os.O_RDWR | os.O_CREAT | os.O_APPEND | getattr(os, 'O_BINARY', 0), 0o644)
+        self.yozuvlar_soni = 0
+        self._lsn = 0     # oxirgi yozilgan yozuv
+        self._diskda = 0  # shu LSN'gacha fsync qilingan
+        self._yetakchi = False
+        self._kutayotganlar = 0
+        self._guruh: Dict[int, int] = {}  # oxirgi fsync'dan beri yozgan oqim -> uning oxirgi LSN'i
+        self._shart = threading.Condition(threading.Lock())  # turli jadvallar yozuvchilari bitta logga yozadi
+
+    def yoz(self, jadval: str, page: Page) -> int:
+        """Sahifa o'zgarishlarini logga qo'shadi (fsync'siz); tasdiqlash uchun LSN qaytaradi."""
+        with self._shart:
+            if page.ozgarishlar:
+                self._yoz(jadval, page)
+                self._lsn += 1
+                self._guruh[threading.get_ident()] = self._lsn
+            return self._lsn
+
+    def _yoz(self, jadval: str, page: Page):
+        oraliqlar = []
+        for off, ln in sorted(page.ozgarishlar):
+            if oraliqlar and off <= oraliqlar[-1][1]:
+                oraliqlar[-1][1] = max(oraliqlar[-1][1], off + ln)
+            else:
+                oraliqlar.append([off, off + ln])
+        page.ozgarishlar.clear()
+        nom = jadval.encode('utf-8')
+        qismlar = [struct.pack('<H', len(nom)), nom, struct.pack('<IH', page.page_id, len(oraliqlar))]
+        for bosh, oxir in oraliqlar:
+            qismlar.append(struct.pack('<HH', bosh, oxir - bosh))
+            qismlar.append(bytes(page.data[bosh:oxir]))
+        payload = b''.join(qismlar)
+        os.write(self.fd, self.SARLAVHA.pack(len(payload), zlib.crc32(payload)) + payload)
+        self.yozuvlar_soni += 1
+
+    def tasdiqla(self, lsn: Optional[int] = None):
+        """`lsn` gacha (standart - hozirgacha yozilgan hamma) yozuvlar diskka tushguncha kutadi.
+
+        Yetakchi boshqa oqimlar ham yozib, hali tasdiqlamagan bo'lsa, ularni guruh_vaqti
+        soniya yoki guruh_hajmi tasdiqlovchi yig'ilguncha kutadi. fsync qulfdan tashqarida -
+        u davom etayotganda keyingi guruh yozuvlarini yozib, navbatga turadi.
+        """
+        with self._shart:
+            if lsn is None:
+                lsn = self._lsn
+            self._kutayotganlar += 1
+            try:
+                while self._diskda < lsn:
+                    if self._yetakchi:
+                        self._shart.wait()
+                        continue
+                    self._yetakchi = True
+                    try:
+                        muddat = time.monotonic() + self.guruh_vaqti
+                        while (len(self._guruh) > self._kutayotganlar and self._kutayotganlar < self.guruh_hajmi
+                               and (qoldi := muddat - time.monotonic()) > 0):
+                            self._shart.wait(qoldi)
+                        gacha = self._lsn
+                        self._shart.release()
+                        try:
+                            os.fsync(self.fd)
+                        finally:
+                            self._shart.acquire()
+                        self._diskda = max(self._diskda, gacha)
+                        self._guruh = {o: n for o, n in self._guruh.items() if n > gacha}
+                    finally:
+                        self._yetakchi = False
+                        self._shart.notify_all()
+            finally:
+                self._kutayotganlar -= 1
+
+    def sinxron(self):
+        """Hozirgacha yozilgan hamma yozuvlarni diskka tushiradi (sahifa yozishdan oldin, checkpoint)."""
+        self.tasdiqla()
+
+    def oqish(self):
+        """(jadval, page_id, [(offset, bayt), ...]) yozuvlari; uzilgan dum tashlanadi."""
+        hajm = os.fstat(self.fd).st_size
+        data = _pread(self.fd, hajm, 0) if hajm else b''
+        pos = 0
+        while pos + self.SARLAVHA.size <= len(data):
+            ln, crc = self.SARLAVHA.unpack_from(data, pos)
+            payload = data[pos + self.SARLAVHA.size:pos + self.SARLAVHA.size + ln]
+            if len(payload) < ln or zlib.crc32(payload) != crc:
+                break
+            pos += self.SARLAVHA.size + ln
+            nl = struct.unpack_from('<H', payload, 0)[0]
+            jadval = payload[2:2 + nl].decode('utf-8')
+            page_id, n = struct.unpack_from('<IH', payload, 2 + nl)
+            off = 2 + nl + 6
+            oraliqlar = []
+            for _ in range(n):
+                bosh, uz = struct.unpack_from('<HH', payload, off)
+                off += 4
+                oraliqlar.append((bosh, payload[off:off + uz]))
+                off += uz
+            yield jadval, page_id, oraliqlar
+
+    def tozalash(self):
+        with self._shart:
+            os.ftruncate(self.fd, 0)
+            os.fsync(self.fd)
+            self._diskda = self._lsn
+            self._guruh.clear()
+            self.yozuvlar_soni = 0
+
+    def close(self):
+        if self.fd is not None:
+            self.sinxron()
+            os.close(self.fd)
+            self.fd = None
+
+
+# ============================================================
+# 4. INDEKS (B+TREE)
+# ============================================================
+
+class _Tugun:
+    __slots__ = ('page_id', 'barg', 'kalitlar', 'qiymatlar', 'keyingi', 'bayt', 'iflos')
+
+    def __init__(self, page_id: int, barg: bool):
+        self.page_id = page_id
+        self.barg = barg
+        self.kalitlar: List[Any] = []
+        # barg: (page_id, slot) qator manzillari, ichki tugun: bola sahifalar
+        self.qiymatlar: List[Any] = []
+        self.keyingi = 0
+        self.bayt = 0
+        self.iflos = True
+
+
+class BPlusDaraxt:
+    """Alohida sahifa faylida saqlanadigan B+Tree: kalit -> (page_id, slot).
+
+    0-sahifa - meta, qolganlari 4 KiB'lik tugunlar. Barglar `keyingi`
+    ko'rsatkichi bilan bog'langan, shuning uchun oraliq qidiruvi barglar
+    bo'ylab ketma-ket o'qiydi. Takroriy kalitlar ruxsat etiladi; yagonalik
+    `yagona=True` bo'lsa `qosh` da tekshiriladi.
+    """
+
+    META = struct.Struct('<4sBBIIQ')
+    TUGUN = struct.Struct('<BHI')
+    MAX_KALIT = 1024
+
+    def __init__(self, filename: str, tur: str = 'BUTUN_SON', yagona: bool = False, kesh: int = 256):
+        self.filename = filename
+        self.kesh_hajmi = max(32, kesh)
+        self.kesh: 'OrderedDict[int, _Tugun]' = OrderedDict()
+        self._mutex = threading.RLock()  # bir jadvalni o'qiyotgan oqimlar ham LRU keshni o'zgartiradi
+        self.fd = os.open(filename, os.O_RDWR | os.O_CREAT | getattr(os, 'O_BINARY', 0), 0o644)
+        meta = _pread(self.fd, self.META.size, 0)
+        if len(meta) == self.META.size and meta[:4] == b'UZBT':
+            _, kod, yagona_b, self.ildiz, self.sahifalar_soni, self.soni = self.META.unpack(meta)
+            self.kod = chr(kod)
+            self.yagona = bool(yagona_b)
+        else:
+            self.kod = {'BUTUN_SON': 'q', 'HAQIQIY': 'd'}.get(tur, 's')
+            self.yagona = yagona
+            self._boshlash()
+
+    def _boshlash(self):
+        self.kesh.clear()
+        os.ftruncate(self.fd, 0)
+        self.sahifalar_soni = 1
+        self.soni = 0
+        self.ildiz = self._yangi_tugun(True).page_id
+        self._meta_yoz()
+
+    def _meta_yoz(self):
+        _pwrite(self.fd, self.META.pack(b'UZBT', ord(self.kod), self.yagona, self.ildiz,
+                                        self.sahifalar_soni, self.soni), 0)
+
+    # --- tugunlarni o'qish/yozish ---
+
+    def _kalit_hajmi(self, k) -> int:
+        return 8 if self.kod != 's' else 2 + len(k.encode('utf-8'))
+
+    def _hisobla(self, t: _Tugun):
+        kalitlar = 8 * len(t.kalitlar) if self.kod != 's' else sum(self._kalit_hajmi(k) for k in t.kalitlar)
+        t.bayt = self.TUGUN.size + kalitlar + (6 * len(t.qiymatlar) if t.barg else 4 * len(t.qiymatlar))
+
+    def _yangi_tugun(self, barg: bool) -> _Tugun:
+        t = _Tugun(self.sahifalar_soni, barg)
+        self.sahifalar_soni += 1
+        self._hisobla(t)
+        self._keshga(t)
+        return t
+
+    def _keshga(self, t: _Tugun):
+        self.kesh[t.page_id] = t
+        while len(self.kesh) > self.kesh_hajmi:
+            _, eski = self.kesh.popitem(last=False)
+            if eski.iflos:
+                self._tugun_yoz(eski)
+
+    def _tugun(self, page_id: int) -> _Tugun:
+        with self._mutex:
+            return self._tugun_ol(page_id)
+
+    def _tugun_ol(self, page_id: int) -> _Tugun:
+        t = self.kesh.get(page_id)
+        if t is not None:
+            self.kesh.move_to_end(page_id)
+            return t
+        data = _pread(self.fd, PAGE_SIZE, page_id * PAGE_SIZE)
+        barg, n, keyingi = self.TUGUN.unpack_from(data, 0)
+        t = _Tugun(page_id, bool(barg))
+        t.keyingi = keyingi
+        t.iflos = False
+        off = self.TUGUN.size
+        if self.kod == 's':
+            for _ in range(n):
+                ln = struct.unpack_from('<H', data, off)[0]
+                t.kalitlar.append(data[off + 2:off + 2 + ln].decode('utf-8'))
+                off += 2 + ln
+        else:
+            t.kalitlar = list(struct.unpack_from(f'<{n}{self.kod}', data, off))
+            off += 8 * n
+        if t.barg:
+            q = struct.unpack_from(f'<{3 * n}H', data, off)
+            t.qiymatlar = [(q[i] | q[i + 1] << 16, q[i + 2]) for i in range(0, 3 * n, 3)]
+        else:
+            t.qiymatlar = list(struct.unpack_from(f'<{n + 1}I', data, off))
+        self._hisobla(t)
+        self._keshga(t)
+        return t
+
+    def _tugun_yoz(self, t: _Tugun):
+        n = len(t.kalitlar)
+        qismlar = [self.TUGUN.pack(t.barg, n, t.keyingi)]
+        if self.kod == 's':
+            for k in t.kalitlar:
+                b = k.encode('utf-8')
+                qismlar.append(struct.pack('<H', len(b)) + b)
+        else:
+            qismlar.append(struct.pack(f'<{n}{self.kod}', *t.kalitlar))
+        if t.barg:
+            qismlar.append(b''.join(struct.pack('<IH', p, s) for p, s in t.qiymatlar))
+        else:
+            qismlar.append(struct.pack(f'<{len(t.qiymatlar)}I', *t.qiymatlar))
+        data = b''.join(qismlar)
+        _pwrite(self.fd, data + bytes(PAGE_SIZE - len(data)), t.page_id * PAGE_SIZE)
+        t.iflos = False
+
+    def flush(self):
+        for t in self.kesh.values():
+            if t.iflos:
+                self._tugun_yoz(t)
+        self._meta_yoz()
+
+    def close(self):
+        if self.fd is not None:
+            self.flush()
+            os.close(self.fd)
+            self.fd = None
+
+    # --- qidiruv ---
+
+    def _chap_barg(self, kalit) -> _Tugun:
+        t = self._tugun(self.ildiz)
+        while not t.barg:
+            t = self._tugun(t.qiymatlar[bisect.bisect_left(t.kalitlar, kalit)])
+        return t
+
+    def _birinchi_barg(self) -> _Tugun:
+        t = self._tugun(self.ildiz)
+        while not t.barg:
+            t = self._tugun(t.qiymatlar[0])
+        return t
+
+    def oraliq(self, past=None, past_teng: bool = True, yuqori=None, yuqori_teng: bool = True):
+        """[past, yuqori] oralig'idagi (kalit, (page_id, slot)) juftlari, kalit tartibida."""
+        if past is None:
+            t, i = self._birinchi_barg(), 0
+        else:
+            t = self._chap_barg(past)
+            i = (bisect.bisect_left if past_teng else bisect.bisect_right)(t.kalitlar, past)
+        while True:
+            kalitlar, qiymatlar = t.kalitlar, t.qiymatlar
+            while i < len(kalitlar):
+                k = kalitlar[i]
+                if yuqori is not None and (k > yuqori or (k == yuqori and not yuqori_teng)):
+                    return
+                if past is None or k > past or (past_teng and k == past):
+                    yield k, qiymatlar[i]
+                i += 1
+            if not t.keyingi:
+                return
+            t, i = self._tugun(t.keyingi), 0
+
+    def qidir(self, kalit) -> List[Tuple[int, int]]:
+        return [rid for _, rid in self.oraliq(kalit, True, kalit, True)]
+
+    def bormi(self, kalit) -> bool:
+        return next(self.oraliq(kalit, True, kalit, True), None) is not None
+
+    # --- o'zgartirish ---
+
+    def qosh(self, kalit, rid: Tuple[int, int], tekshir: bool = True):
+        if self.kod == 's' and self._kalit_hajmi(kalit) > self.MAX_KALIT:
+            raise ValueError("Indeks kaliti juda uzun")
+        if tekshir and self.yagona and self.bormi(kalit):
+            raise ValueError(f"Takroriy kalit: {kalit}")
+        yol = []
+        t = self._tugun(self.ildiz)
+        while not t.barg:
+            i = bisect.bisect_right(t.kalitlar, kalit)
+            yol.append((t, i))
+            t = self._tugun(t.qiymatlar[i])
+        i = bisect.bisect_right(t.kalitlar, kalit)
+        t.kalitlar.insert(i, kalit)
+        t.qiymatlar.insert(i, rid)
+        t.bayt += self._kalit_hajmi(kalit) + 6
+        t.iflos = True
+        self.soni += 1
+        while t.bayt > PAGE_SIZE:
+            ajratuvchi, ong = self._bolish(t)
+            if not yol:
+                ildiz = self._yangi_tugun(False)
+                ildiz.kalitlar = [ajratuvchi]
+                ildiz.qiymatlar = [t.page_id, ong.page_id]
+                self._hisobla(ildiz)
+                self.ildiz = ildiz.page_id
+                break
+            ota, i = yol.pop()
+            ota.kalitlar.insert(i, ajratuvchi)
+            ota.qiymatlar.insert(i + 1, ong.page_id)
+            ota.bayt += self._kalit_hajmi(ajratuvchi) + 4
+            ota.iflos = True
+            t = ota
+
+    def ochir(self, kalit, rid: Tuple[int, int]) -> bool:
+        """(kalit, rid) juftini o'chiradi. Tugunlar birlashtirilmaydi - bo'sh qolgan
+        barg oraliq qidiruvida shunchaki o'tkazib yuboriladi."""
+        rid = tuple(rid)
+        t = self._chap_barg(kalit)
+        while True:
+            i = bisect.bisect_left(t.kalitlar, kalit)
+            while i < len(t.kalitlar) and t.kalitlar[i] == kalit:
+                if tuple(t.qiymatlar[i]) == rid:
+                    del t.kalitlar[i]
+                    del t.qiymatlar[i]
+                    t.bayt -= self._kalit_hajmi(kalit) + 6
+                    t.iflos = True
+                    self.soni -= 1
+                    return True
+                i += 1
+            if i < len(t.kalitlar) or not t.keyingi:
+                return False
+            t = self._tugun(t.keyingi)
+
+    def _bolish(self, t: _Tugun):
+        ong = self._yangi_tugun(t.barg)
+        orta = len(t.kalitlar) // 2
+        if t.barg:
+            ong.kalitlar, t.kalitlar = t.kalitlar[orta:], t.kalitlar[:orta]
+            ong.qiymatlar, t.qiymatlar = t.qiymatlar[orta:], t.qiymatlar[:orta]
+            ong.keyingi, t.keyingi = t.keyingi, ong.page_id
+            ajratuvchi = ong.kalitlar[0]
+        else:
+            ajratuvchi = t.kalitlar[orta]
+            ong.kalitlar, t.kalitlar = t.kalitlar[orta + 1:], t.kalitlar[:orta]
+            ong.qiymatlar, t.qiymatlar = t.qiymatlar[orta + 1:], t.qiymatlar[:orta + 1]
+        self._hisobla(t)
+        self._hisobla(ong)
+        t.iflos = True
+        return ajratuvchi, ong
+
+    def ommaviy_qurish(self, juftlar):
+        """Daraxtni tartiblangan (kalit, rid) oqimidan pastdan yuqoriga qayta quradi."""
+        self._boshlash()
+        chegara = PAGE_SIZE * 9 // 10
+        barg = self._tugun(self.ildiz)
+        daraja = [(None, barg.page_id)]
+        oldingi = None
+        for kalit, rid in juftlar:
+            if self.yagona and oldingi is not None and kalit == oldingi:
+                raise ValueError(f"Takroriy kalit: {kalit}")
+            oldingi = kalit
+            hajm = self._kalit_hajmi(kalit) + 6
+            if barg.kalitlar and barg.bayt + hajm > chegara:
+                yangi = self._yangi_tugun(True)
+                barg.keyingi = yangi.page_id
+                barg.iflos = True
+                barg = yangi
+                daraja.append((kalit, barg.page_id))
+            barg.kalitlar.append(kalit)
+            barg.qiymatlar.append(rid)
+            barg.bayt += hajm
+            barg.iflos = True
+            self.soni += 1
+        while len(daraja) > 1:
+            yuqori = []
+            t = None
+            for kalit, page_id in daraja:
+                if t is None or t.bayt + self._kalit_hajmi(kalit) + 4 > chegara:
+                    t = self._yangi_tugun(False)
+                    t.qiymatlar.append(page_id)
+                    t.bayt += 4
+                    yuqori.append((kalit, t.page_id))
+                else:
+                    t.kalitlar.append(kalit)
+                    t.qiymatlar.append(page_id)
+                    t.bayt += self._kalit_hajmi(kalit) + 4
+            daraja = yuqori
+        self.ildiz = daraja[0][1]
+        self.flush()
+
+
+# ============================================================
+# 5. IJRO OPERATORLARI (VOLCANO)
+# ============================================================
+
+# Rejalovchi narx modeli - nisbiy birliklar, 1.0 = bitta sahifani ketma-ket o'qish.
+# Python'da qatorni dekodlash sahifa o'qishdan qimmat; koeffitsientlar shu dvigatelda o'lchangan.
+NARX_SAHIFA = 1.0          # ketma-ket o'qilgan sahifa
+NARX_TASODIFIY = 2.0       # indeks orqali tasodifiy sahifa
+NARX_QATOR = 0.2           # qatorni dekodlash va shartni tekshirish
+NARX_INDEKS_QATOR = 0.1    # B+Tree bargidagi bitta yozuv
+NARX_INDEKS_QIDIRUV = 3.5  # B+Tree ildizidan bargigacha tushish
+NARX_XESH = 0.1            # xesh-jadvalga qo'yish yoki undan qidirish
+NARX_TAQQOSLASH = 0.02     # saralashdagi bitta taqqoslash
+NARX_PARALLEL_BOSHLASH = 1000.0  # bo'laklarni ishchi jarayonlarga tarqatish va kutish
+NARX_PARALLEL_QATOR = 0.2  # ishchidan qaytgan qatorni pickle/unpickle qilish
+PARALLEL_BOLAK_MIN = 64    # parallel skan bo'lagidagi eng kam sahifalar
+FARQLI_STANDART = 200      # statistika bo'lmasa ustundagi farqli qiymatlar taxmini
+ORALIQ_STANDART = 1 / 3    # statistika bo'lmasa `<`, `>` tanlanuvchanligi
+
+
+class Operator:
+    """Oqimli ijro operatori: `iter(op)` qatorlarni bittalab, dangasa qaytaradi."""
+
+    nom = 'Operator'
+    # rejalovchi taxmini (TUSHUNTIR): chiqadigan qatorlar va bola operatorlar bilan jami narx
+    qatorlar_taxmini: Optional[float] = None
+    narx: Optional[float] = None
+
+    def __init__(self, *bolalar: 'Operator'):
+        self.bolalar = list(bolalar)
+
+    def __iter__(self):
+        raise NotImplementedError
+
+    def tavsif(self) -> str:
+        return self.nom
+
+    def baholash(self, qatorlar: float, narx: float) -> 'Operator':
+        self.qatorlar_taxmini, self.narx = qatorlar, narx
+        return self
+
+    def baho(self) -> Tuple[float, float]:
+        """(qatorlar, narx); taxmin berilmagan bo'lsa birinchi bolaniki (Proyeksiya, Taxallus)."""
+        if self.narx is None:
+            return self.bolalar[0].baho() if self.bolalar else (0.0, 0.0)
+        return self.qatorlar_taxmini, self.narx
+
+
+def _sahifalar_taxmini(sahifalar: int, qatorlar: float) -> float:
+    """`qatorlar` ta tasodifiy qator nechta turli sahifaga tushadi (Cardenas formulasi)."""
+    if sahifalar <= 0 or qatorlar <= 0:
+        return 0.0
+    return sahifalar * (1 - (1 - 1 / sahifalar) ** qatorlar)
+
+
+class _Olchov:
+    """TUSHUNTIR TAHLIL: operator oqimini o'rab, qatorlar, vaqt va sahifa murojaatlarini yig'adi.
+
+    Qiymatlar bola operatorlar bilan birga (inklyuziv) hisoblanadi.
+    """
+
+    def __init__(self, op: Operator, pool: 'BufferPool'):
+        self.op, self.pool = op, pool
+        self.qatorlar = 0
+        self.vaqt = 0.0
+        self.murojaatlar = self.oqishlar = 0
+
+    def __iter__(self):
+        it, pool, soat = iter(self.op), self.pool, time.perf_counter
+        while True:
+            t, m, o = soat(), pool.murojaatlar, pool.oqishlar
+            try:
+                row = next(it)
+            except StopIteration:
+                return
+            finally:
+                self.vaqt += soat() - t
+                self.murojaatlar += pool.murojaatlar - m
+                self.oqishlar += pool.oqishlar - o
+            self.qatorlar += 1
+            yield row
+
+    def baho(self) -> Tuple[float, float]:
+        return self.op.baho()
+
+
+def olchovlarni_ulash(op: Operator, pool: 'BufferPool') -> Dict[int, _Olchov]:
+    """Reja daraxtining har bir operatorini _Olchov bilan o'raydi: {id(op): olchov}. Ildiz ham."""
+    olchovlar = {}
+
+    def ula(o: Operator) -> _Olchov:
+        o.bolalar = [ula(b) for b in o.bolalar]
+        olchovlar[id(o)] = _Olchov(o, pool)
+        return olchovlar[id(o)]
+
+    ula(op)
+    return olchovlar
+
+
+def reja_satrlari(op: Operator, olchovlar: Optional[Dict[int, _Olchov]] = None) -> List[str]:
+    """TUSHUNTIR chiqishi: har bir operator bitta satr, bolalar ikki probel ichkarida."""
+    satrlar = []
+
+    def yoz(o, chuqurlik: int):
+        if isinstance(o, _Olchov):
+            o = o.op
+        qatorlar, narx = o.baho()
+        satr = f"{'  ' * chuqurlik}{'-> ' if chuqurlik else ''}{o.tavsif()}  (narx={narx:.1f} qatorlar={qatorlar:.0f})"
+        m = olchovlar.get(id(o)) if olchovlar else None
+        if m is not None:
+            satr += (f" (haqiqiy: qatorlar={m.qatorlar} vaqt={m.vaqt * 1000:.3f}ms"
+                     f" sahifalar={m.murojaatlar} diskdan={m.oqishlar})")
+        satrlar.append(satr)
+        for b in o.bolalar:
+            yoz(b, chuqurlik + 1)
+
+    yoz(op, 0)
+    return satrlar
+
+
+class SeqScan(Operator):
+    """Ketma-ket skan. Shart bo'lsa avval faqat shart ustunlari dekodlanadi,
+    qolgan `ustunlar` esa faqat shartdan o'tgan qatorlar uchun o'qiladi."""
+
+    nom = 'SeqScan'
+
+    def __init__(self, jadval: str, storage: Storage, schema: 'JadvalSchema', ustunlar: Optional[List[str]] = None,
+                 shart=None, rid_bilan: bool = False, xom: bool = False, sahifalar: Optional[range] = None):
+        super().__init__()
+        self.jadval, self.storage, self.schema = jadval, storage, schema
+        self.ustunlar = ustunlar
+        self.shart = shart
+        self.rid_bilan = rid_bilan
+        # xom=True: qatorlar dekodlanmaydi, kodlangan memoryview qaytariladi
+        self.xom = xom
+        # faqat shu sahifalar (parallel skan bo'lagi); None - butun jadval
+        self.sahifalar = sahifalar
+
+    def _xom_qatorlar(self):
+        storage = self.storage
+        pages = storage.pages if self.sahifalar is None else map(storage.page, self.sahifalar)
+        for page in pages:
+            for i, data in storage.sahifa_qatorlari(page):
+                yield (page.page_id, i), data
+
+    def __iter__(self):
+        if self.xom:
+            for _, data in self._xom_qatorlar():
+                yield data
+            return
+        kodek, rid_bilan = self.schema.kodek, self.rid_bilan
+        if self.shart is None:
+            oqi = kodek.oquvchi(self.ustunlar)
+            for rid, data in self._xom_qatorlar():
+                yield (rid, oqi(data)) if rid_bilan else oqi(data)
+            return
+        predikat = predikat_yarat(self.shart)
+        shart_ustunlari_ = list(dict.fromkeys(shart_ustunlari(self.shart)))
+        shart_oqi = kodek.oquvchi(shart_ustunlari_)
+        if self.ustunlar is None:
+            qolgan_oqi, toliq = kodek.oquvchi(None), True
+        else:
+            qolgan = [u for u in self.ustunlar if u not in shart_ustunlari_]
+            qolgan_oqi, toliq = (kodek.oquvchi(qolgan) if qolgan else None), False
+        for rid, data in self._xom_qatorlar():
+            row = shart_oqi(data)
+            if not predikat(row):
+                continue
+            if toliq:
+                row = qolgan_oqi(data)
+            elif qolgan_oqi is not None:
+                row.update(qolgan_oqi(data))
+            yield (rid, row) if rid_bilan else row
+
+    def tavsif(self) -> str:
+        return f"{self.nom} {self.jadval}" + (" (filtr)" if self.shart is not None else "")
+
+
+class IndeksScan(Operator):
+    nom = 'IndeksScan'
+
+    def __init__(self, jadval: str, storage: Storage, schema: 'JadvalSchema', indeks: 'IndeksSchema',
+                 daraxt: BPlusDaraxt, oraliq: tuple, ustunlar: Optional[List[str]] = None, rid_bilan: bool = False):
+        super().__init__()
+        self.jadval, self.storage, self.schema = jadval, storage, schema
+        self.indeks, self.daraxt, self.oraliq = indeks, daraxt, oraliq
+        self.ustunlar = ustunlar
+        self.rid_bilan = rid_bilan
+
+    def __iter__(self):
+        oqi, storage = self.schema.kodek.oquvchi(self.ustunlar), self.storage
+        for _, rid in self.daraxt.oraliq(*self.oraliq):
+            data = storage.qator(rid)
+            if data:
+                yield (rid, oqi(data)) if self.rid_bilan else oqi(data)
+
+    def tavsif(self) -> str:
+        past, past_teng, yuqori, yuqori_teng = self.oraliq
+        u = self.indeks.ustun
+        if past is not None and past == yuqori and past_teng and yuqori_teng:
+            shart = f"{u} = {past!r}"
+        else:
+            qismlar = []
+            if past is not None:
+                qismlar.append(f"{u} {'>=' if past_teng else '>'} {past!r}")
+            if yuqori is not None:
+                qismlar.append(f"{u} {'<=' if yuqori_teng else '<'} {yuqori!r}")
+            shart = ' VA '.join(qismlar) or f"{u} tartibida"
+        return f"{self.nom} {self.jadval} ({self.indeks.nom}: {shart})"
+
+
+_PY_OPERATORLAR = {'=': '==', '!=': '!=', '>': '>', '<': '<', '>=': '>=', '<=': '<='}
+_OP_FUNKSIYALAR = {'=': operator.eq, '!=': operator.ne, '>': operator.gt, '<': operator.lt,
+                   '>=': operator.ge, '<=': operator.le}
+
+
+def predikat_yarat(shart, null_bilan: bool = False):
+    """QAYERDA daraxtini bir marta Python funksiyasiga kompilyatsiya qiladi.
+
+    Har bir qator uchun daraxt aylanib chiqilmaydi: `yosh > 25 VA ism = 'Ali'`
+    `lambda r: (r['yosh'] > _k0) and (r['ism'] == _k1)` ga aylanadi - literallar
+    nomlar fazosiga chiqariladi, VA/YOKI esa Python'ning qisqa tutashuvidan foydalanadi.
+    `null_bilan=True` (CHAP QO'SHILISH natijasi): NULL ustunli taqqoslash yolg'on.
+    """
+    konstantalar: Dict[str, Any] = {}
+
+    def ifoda(s) -> str:
+        if isinstance(s, Ustun):
+            return f"r[{s.nom!r}]"
+        if isinstance(s, Literal):
+            nom = f"_k{len(konstantalar)}"
+            konstantalar[nom] = s.qiymat
+            return nom
+        raise ValueError(f"Noma'lum ifoda: {s}")
+
+    def mantiq(s) -> str:
+        if isinstance(s, Taqqoslash):
+            chap, ong = ifoda(s.chap), ifoda(s.ong)
+            tekshir = "".join(f"{x} is not None and " for x, t in ((chap, s.chap), (ong, s.ong))
+                              if null_bilan and isinstance(t, Ustun))
+            return f"({tekshir}{chap} {_PY_OPERATORLAR[s.operator]} {ong})"
+        if isinstance(s, MantiqiyIfoda):
+            return f"({mantiq(s.chap)} {'and' if s.operator == 'VA' else 'or'} {mantiq(s.ong)})"
+        return "True"
+
+    manba = f"lambda r: {mantiq(shart)}"
+    return eval(compile(manba, '<uzdb-shart>', 'eval'), {'__builtins__': {}, **konstantalar})
+
+
+def shart_ustunlari(shart) -> List[str]:
+    if isinstance(shart, Ustun):
+        return [shart.nom]
+    if isinstance(shart, (Taqqoslash, MantiqiyIfoda)):
+        return shart_ustunlari(shart.chap) + shart_ustunlari(shart.ong)
+    return []
+
+
+def nomlarni_almashtir(shart, f):
+    """Shart nusxasi: har bir ustun nomi `f(nom)` bilan almashtiriladi."""
+    if isinstance(shart, Ustun):
+        return Ustun(f(shart.nom))
+    if isinstance(shart, (Taqqoslash, MantiqiyIfoda)):
+        return type(shart)(nomlarni_almashtir(shart.chap, f), shart.operator, nomlarni_almashtir(shart.ong, f))
+    return shart
+
+
+def va_birlashtir(qismlar: list):
+    shart = None
+    for q in qismlar:
+        shart = q if shart is None else MantiqiyIfoda(shart, "VA", q)
+    return shart
+
+
+class Filtr(Operator):
+    nom = 'Filtr'
+
+    def __init__(self, bola: Operator, predikat):
+        super().__init__(bola)
+        self.predikat = predikat
+
+    def __iter__(self):
+        predikat = self.predikat
+        for row in self.bolalar[0]:
+            if predikat(row):
+                yield row
+
+
+class Proyeksiya(Operator):
+    nom = 'Proyeksiya'
+
+    def __init__(self, bola: Operator, ustunlar: List[str], nomlar: Optional[List[str]] = None):
+        super().__init__(bola)
+        self.ustunlar = ustunlar
+        # nomlar: natijadagi kalitlar (qo'shilishda `f.ism` -> so'rovda yozilgan `ism`)
+        self.nomlar = nomlar
+
+    def __iter__(self):
+        ustunlar = self.ustunlar
+        if self.nomlar is not None and self.nomlar != ustunlar:
+            juftlar = list(zip(self.nomlar, ustunlar))
+            for row in self.bolalar[0]:
+                yield {n: row[u] for n, u in juftlar}
+            return
+        for row in self.bolalar[0]:
+            yield {u: row[u] for u in ustunlar}
+
+    def tavsif(self) -> str:
+        return f"{self.nom} ({', '.join(self.ustunlar)})"
+
+
+class Chegara(Operator):
+    nom = 'Chegara'
+
+    def __init__(self, bola: Operator, n: int):
+        super().__init__(bola)
+        self.n = n
+
+    def __iter__(self):
+        if self.n <= 0:
+            return
+        for i, row in enumerate(self.bolalar[0], 1):
+            yield row
+            if i >= self.n:
+                return
+
+    def tavsif(self) -> str:
+        return f"{self.nom} {self.n}"
+
+
+class _Teskari:
+    """Kamayish tartibidagi matn qiymati: taqqoslash teskari."""
+
+    __slots__ = ('v',)
+
+    def __init__(self, v):
+        self.v = v
+
+    def __lt__(self, boshqa):
+        return boshqa.v < self.v
+
+    def __eq__(self, boshqa):
+        return self.v == boshqa.v
+
+
+def tartib_kaliti(tartib: List[Tuple[str, str]], teskari: bool = False):
+    """TARTIBLA ro'yxatidan bitta kompozit kalit: har ustun uchun (bayroq, qiymat) juftligi.
+
+    Kalit o'sish bo'yicha solishtiriladi - KAMAYISH sonlar uchun inkor, matnlar uchun
+    `_Teskari` bilan beriladi. NULL OSHISH da oxirida, KAMAYISH da boshida.
+    `teskari=True` - barcha yo'nalishlar almashtiriladi (saralash reverse=True bilan
+    qilinadi; birinchi ustun KAMAYISH bo'lsa `_Teskari` o'ramlari kamayadi).
+    """
+    ustunlar = [(u, (y == "KAMAYISH") != teskari) for u, y in tartib]
+
+    def kalit(r):
+        k = []
+        for u, kamayish in ustunlar:
+            v = r.get(u)
+            if v is None:
+                k += (not kamayish, 0)
+            elif kamayish:
+                k += (True, _Teskari(v) if isinstance(v, str) else -v)
+            else:
+                k += (False, v)
+        return tuple(k)
+    return kalit
+
+
+class Saralash(Operator):
+    """Bloklovchi operator: bolaning barcha qatorlarini o'qib, so'ng saralab beradi.
+
+    `katalog` berilsa qatorlar TashqiSaralash orqali o'tadi: `xotira` (bayt)
+    chegarasidan oshsa saralangan bo'laklar diskka yoziladi va birlashtirib oqiziladi.
+    """
+
+    nom = 'Saralash'
+
+    def __init__(self, bola: Operator, tartib: List[Tuple[str, str]], katalog: Optional[str] = None,
+                 xotira: Optional[int] = None):
+        super().__init__(bola)
+        self.tartib = tartib
+        self.katalog, self.xotira = katalog, xotira
+
+    def __iter__(self):
+        teskari = self.tartib[0][1] == "KAMAYISH"
+        kalit = tartib_kaliti(self.tartib, teskari)
+        if self.katalog is None:
+            yield from sorted(self.bolalar[0], key=kalit, reverse=teskari)
+            return
+        saralash = TashqiSaralash(self.katalog, kalit, xotira=self.xotira, teskari=teskari)
+        try:
+            for row in self.bolalar[0]:
+                saralash.qosh(row)
+        except BaseException:
+            saralash.tozalash()
+            raise
+        yield from saralash
+
+    def tavsif(self) -> str:
+        return f"{self.nom} ({', '.join(f'{u} {y}' for u, y in self.tartib)})"
+
+
+class TopK(Operator):
+    """TARTIBLA ... CHEGARA n: n o'lchamli uyum, O(N log n) vaqt va O(n) xotira.
+
+    `oqi` elementdan saralash ustunlari lug'atini oladi, `yakun` esa faqat g'oliblarni
+    qatorga aylantiradi - shuning uchun bola kodlangan qatorlar berishi mumkin.
+    """
+
+    nom = 'TopK'
+
+    def __init__(self, bola: Operator, tartib: List[Tuple[str, str]], n: int, oqi=None, yakun=None):
+        super().__init__(bola)
+        self.tartib, self.n = tartib, n
+        self.oqi = oqi
+        self.yakun = yakun
+
+    def __iter__(self):
+        teskari = self.tartib[0][1] == "KAMAYISH"
+        kalit = tartib_kaliti(self.tartib, teskari)
+        if self.oqi is not None:
+            oqi, kalit_ = self.oqi, kalit
+            kalit = lambda e: kalit_(oqi(e))
+        tanla = heapq.nlargest if teskari else heapq.nsmallest
+        goliblar = tanla(max(self.n, 0), self.bolalar[0], key=kalit)
+        if self.yakun is None:
+            yield from goliblar
+        else:
+            for g in goliblar:
+                yield self.yakun(g)
+
+    def tavsif(self) -> str:
+        return f"{self.nom} {self.n} ({', '.join(f'{u} {y}' for u, y in self.tartib)})"
+
+
+class HashAgregat(Operator):
+    """GURUHLA va agregatlar: bola bir marta oqim bilan o'qiladi, xotira O(guruhlar soni).
+
+    Har bir guruh uchun holat ro'yxati yuritiladi; yangilash tsikli so'rovga qarab
+    bir marta yasaladi (QatorKodek oquvchilari kabi).
+    """
+
+    nom = 'HashAgregat'
+
+    def __init__(self, bola: Operator, guruh: List[str], agregatlar: List[Agregat]):
+        super().__init__(bola)
+        self.guruh, self.agregatlar = guruh, agregatlar
+
+    def _yangilovchi(self):
+        boshlangich, amallar = [], []
+        for a in self.agregatlar:
+            i = len(boshlangich)
+            if a.ustun is None:
+                boshlangich.append(0)
+                amallar.append(f"h[{i}] += 1")
+                continue
+            amallar.append(f"v = r[{a.ustun!r}]")
+            if a.funksiya == 'SANASH':
+                boshlangich.append(0)
+                amallar.append(f"if v is not None: h[{i}] += 1")
+            elif a.funksiya == 'YIGINDI':
+                boshlangich.append(None)
+                amallar.append(f"if v is not None: h[{i}] = v if h[{i}] is None else h[{i}] + v")
+            elif a.funksiya == 'ORTACHA':
+                boshlangich += [0, 0]
+                amallar.append(f"if v is not None: h[{i}] += v; h[{i + 1}] += 1")
+            else:
+                op = '<' if a.funksiya == 'ENG_KICHIK' else '>'
+                boshlangich.append(None)
+                amallar.append(f"if v is not None and (h[{i}] is None or v {op} h[{i}]): h[{i}] = v")
+        kalit = "".join(f"r[{g!r}], " for g in self.guruh)
+        satrlar = ["def yangila(qatorlar, guruhlar):",
+                   "    get = guruhlar.get",
+                   "    for r in qatorlar:",
+                   f"        k = ({kalit})",
+                   "        h = get(k)",
+                   "        if h is None:",
+                   f"            h = guruhlar[k] = {boshlangich!r}"]
+        satrlar += ["        " + a for a in amallar]
+        ns = {}
+        exec("\n".join(satrlar), ns)
+        return ns['yangila'], boshlangich
+
+    def __iter__(self):
+        yangila, boshlangich = self._yangilovchi()
+        guruhlar: Dict[tuple, list] = {}
+        yangila(self.bolalar[0], guruhlar)
+        yield from self._natijalar(guruhlar, boshlangich)
+
+    def _natijalar(self, guruhlar: Dict[tuple, list], boshlangich: list):
+        if not guruhlar and not self.guruh:
+            guruhlar[()] = boshlangich  # GURUHLA siz bo'sh jadval ham bitta qator beradi
+        for k, h in guruhlar.items():
+            row = dict(zip(self.guruh, k))
+            i = 0
+            for a in self.agregatlar:
+                if a.funksiya == 'ORTACHA' and a.ustun is not None:
+                    row[a.nom] = h[i] / h[i + 1] if h[i + 1] else None
+                    i += 2
+                else:
+                    row[a.nom] = h[i]
+                    i += 1
+            yield row
+
+    def _birlashtir(self, guruhlar: Dict[tuple, list], qism: Dict[tuple, list]):
+        """Boshqa qatorlar qismi bo'yicha yig'ilgan holatlarni `guruhlar` ga qo'shadi."""
+        turlar = []
+        for a in self.agregatlar:
+            if a.funksiya in ('ENG_KICHIK', 'ENG_KATTA') and a.ustun is not None:
+                turlar.append(operator.lt if a.funksiya == 'ENG_KICHIK' else operator.gt)
+            else:
+                turlar += [None] * (2 if a.funksiya == 'ORTACHA' and a.ustun is not None else 1)
+        for k, h in qism.items():
+            eski = guruhlar.get(k)
+            if eski is None:
+                guruhlar[k] = h
+                continue
+            for i, tur in enumerate(turlar):
+                a, b = eski[i], h[i]
+                if b is None:
+                    continue
+                if a is None:
+                    eski[i] = b
+                elif tur is None:
+                    eski[i] = a + b
+                elif tur(b, a):
+                    eski[i] = b
+
+    def tavsif(self) -> str:
+        qismlar = [a.nom for a in self.agregatlar]
+        if self.guruh:
+            qismlar.append(f"GURUHLA {', '.join(self.guruh)}")
+        return f"{self.nom} ({', '.join(qismlar)})"
+
+
+def _parallel_bolak(fayl: str, jadval: str, ustunlar_sxemasi: List['UstunSchema'], shart,
+                    ustunlar: Optional[List[str]], boshi: int, oxiri: int,
+                    guruh: Optional[List[str]] = None, agregatlar: Optional[List[Agregat]] = None):
+    """Ishchi jarayonda: jadval faylining [boshi, oxiri) sahifalarini faqat o'qish uchun mmap qilib
+    skanlaydi. Mos qatorlar yoki (agregatlar berilsa) shu bo'lak bo'yicha guruh holatlari qaytadi."""
+    storage = Storage(fayl, BufferPool(64), mmap_rejim=True, faqat_oqish=True)
+    try:
+        skan = SeqScan(jadval, storage, JadvalSchema(jadval, ustunlar_sxemasi), ustunlar, shart,
+                       sahifalar=range(boshi, oxiri))
+        if agregatlar is None:
+            return list(skan)
+        yangila, _ = HashAgregat(skan, guruh, agregatlar)._yangilovchi()
+        guruhlar: Dict[tuple, list] = {}
+        yangila(skan, guruhlar)
+        return guruhlar
+    finally:
+        storage.close()
+
+
+class ParallelSeqScan(Operator):
+    """SeqScan ning sahifalar oralig'i bo'laklarga bo'linib, ishchi jarayonlarda bajariladigan turi.
+
+    Ishchilar faylni o'zlari ochadi, shuning uchun avval iflos sahifalar faylga yoziladi
+    (WAL oldin). Natijalar bo'laklar tartibida - ketma-ket skan bilan bir xil - qaytadi.
+    """
+
+    nom = 'ParallelSeqScan'
+
+    def __init__(self, jadval: str, storage: Storage, schema: 'JadvalSchema', ustunlar: Optional[List[str]],
+                 shart, havza, ishchilar: int):
+        super().__init__()
+        self.jadval, self.storage, self.schema = jadval, storage, schema
+        self.ustunlar, self.shart = ustunlar, shart
+        self.havza, self.ishchilar = havza, ishchilar
+
+    def bolaklar(self, guruh: Optional[List[str]] = None, agregatlar: Optional[List[Agregat]] = None):
+        """Har bir bo'lak natijasi, sahifalar tartibida. Bir vaqtda ko'pi bilan 2 * ishchilar bo'lak
+        navbatda turadi - xotira chegaralangan, iste'molchi to'xtasa qolganlari bekor qilinadi."""
+        self.storage.flush()
+        n = self.storage.sahifalar_soni
+        qadam = max(PARALLEL_BOLAK_MIN, -(-n // (self.ishchilar * 4)))
+        havza = self.havza()
+        boshlar = iter(range(0, n, qadam))
+
+        def yubor(boshi):
+            return havza.submit(_parallel_bolak, self.storage.filename, self.jadval, self.schema.ustunlar,
+                                self.shart, self.ustunlar, boshi, min(boshi + qadam, n), guruh, agregatlar)
+
+        navbat = deque(map(yubor, itertools.islice(boshlar, 2 * self.ishchilar)))
+        try:
+            while navbat:
+                natija = navbat.popleft().result()
+                navbat.extend(map(yubor, itertools.islice(boshlar, 1)))
+                yield natija
+        finally:
+            for v in navbat:
+                v.cancel()
+
+    def __iter__(self):
+        for qatorlar in self.bolaklar():
+            yield from qatorlar
+
+    def tavsif(self) -> str:
+        return f"{self.nom} {self.jadval}" + (" (filtr)" if self.shart is not None else "") + \
+            f" [{self.ishchilar} ishchi]"
+
+
+class ParallelAgregat(HashAgregat):
+    """HashAgregat + ParallelSeqScan: har bir ishchi o'z bo'lagini agregatlaydi, asosiy jarayon
+    faqat guruh holatlarini birlashtiradi - qatorlar jarayonlar orasida uzatilmaydi."""
+
+    nom = 'ParallelAgregat'
+
+    def __init__(self, skan: ParallelSeqScan, guruh: List[str], agregatlar: List[Agregat]):
+        super().__init__(skan, guruh, agregatlar)
+        self.skan, self.bolalar = skan, []
+
+    def __iter__(self):
+        _, boshlangich = self._yangilovchi()
+        guruhlar: Dict[tuple, list] = {}
+        for qism in self.skan.bolaklar(self.guruh, self.agregatlar):
+            self._birlashtir(guruhlar, qism)
+        yield from self._natijalar(guruhlar, boshlangich)
+
+    def tavsif(self) -> str:
+        return f"{super().tavsif()} <- {self.skan.tavsif()}"
+
+
+class SahifaSanash(Operator):
+    """Shartsiz SANASH(*): qatorlar o'qilmaydi, sahifa sarlavhalaridagi tirik qatorlar soni qo'shiladi."""
+
+    nom = 'SahifaSanash'
+
+    def __init__(self, jadval: str, storage: Storage, nomlar: List[str]):
+        super().__init__()
+        self.jadval, self.storage, self.nomlar = jadval, storage, nomlar
+
+    def __iter__(self):
+        soni = sum(page.tirik_soni() for page in self.storage.pages)
+        yield dict.fromkeys(self.nomlar, soni)
+
+    def tavsif(self) -> str:
+        return f"{self.nom} {self.jadval}"
+
+
+class Taxallus(Operator):
+    """Qator kalitlariga `taxallus.` prefiksi qo'shadi - qo'shilishda ustunlar to'qnashmasin."""
+
+    nom = 'Taxallus'
+
+    def __init__(self, bola: Operator, taxallus: str):
+        super().__init__(bola)
+        self.taxallus = taxallus
+
+    def __iter__(self):
+        p = self.taxallus + '.'
+        for row in self.bolalar[0]:
+            yield {p + k: v for k, v in row.items()}
+
+    def tavsif(self) -> str:
+        return f"{self.nom} {self.taxallus}"
+
+
+def _kalit_oluvchi(nomlar: List[str]):
+    """Qatordan qo'shilish kaliti; NULL qatnashsa None (hech narsaga teng emas)."""
+    if len(nomlar) == 1:
+        nom = nomlar[0]
+        return lambda r: r[nom]
+    return lambda r: None if any(r[n] is None for n in nomlar) else tuple(r[n] for n in nomlar)
+
+
+class HashQoshilish(Operator):
+    """Teng shartli qo'shilish: qurish tomoni xesh-jadvalga yig'iladi, sinov tomoni oqim bilan o'tadi.
+
+    Qurish tomoni `xotira` (bayt) dan oshsa Grace usuli: ikkala tomon kalit xeshi bo'yicha
+    BOLAKLAR ta vaqtinchalik faylga bo'linadi va har bir juftlik alohida qo'shiladi.
+    CHAP qo'shilishda qurish tomoni doim o'ng; mos topilmagan chap qatorlar NULL bilan keladi.
+    """
+
+    nom = 'HashQoshilish'
+    BOLAKLAR = 16
+    CHUQURLIK = 2  # qayta bo'lish chegarasi (bitta kalit juda ko'p bo'lsa ham tugashi uchun)
+
+    def __init__(self, chap: Operator, ong: Operator, chap_kalitlar: List[str], ong_kalitlar: List[str],
+                 ong_ustunlar: List[str], chap_qoshilish: bool = False, qurish_chap: bool = False,
+                 qoshimcha=None, katalog: Optional[str] = None, xotira: Optional[int] = None):
+        super().__init__(chap, ong)
+        self.chap_kalitlar, self.ong_kalitlar = chap_kalitlar, ong_kalitlar
+        self.bosh_ong = dict.fromkeys(ong_ustunlar)
+        self.chap_qoshilish = chap_qoshilish
+        self.qurish_chap = qurish_chap and not chap_qoshilish
+        self.qoshimcha = qoshimcha
+        self.katalog, self.xotira = katalog, xotira
+
+    def __iter__(self):
+        chap, ong = self.bolalar
+        if self.qurish_chap:
+            qurish, sinov = chap, ong
+            self._q_kalit, self._s_kalit = _kalit_oluvchi(self.chap_kalitlar), _kalit_oluvchi(self.ong_kalitlar)
+        else:
+            qurish, sinov = ong, chap
+            self._q_kalit, self._s_kalit = _kalit_oluvchi(self.ong_kalitlar), _kalit_oluvchi(self.chap_kalitlar)
+        yield from self._qoshish(iter(qurish), iter(sinov), 0)
+
+    def _qoshish(self, qurish, sinov, daraja: int):
+        q_kalit, jadval = self._q_kalit, {}
+        chegara = None
+        for row in qurish:
+            k = q_kalit(row)
+            if k is None:
+                continue
+            if chegara is None:
+                chegara = (max(1, self.xotira // (_taxminiy_hajm(row) + 64))
+                           if self.xotira is not None and self.katalog and daraja < self.CHUQURLIK else -1)
+            guruh = jadval.get(k)
+            if guruh is None:
+                jadval[k] = [row]
+            else:
+                guruh.append(row)
+            chegara -= 1
+            if chegara == 0:
+                yield from self._grace(jadval, qurish, sinov, daraja)
+                return
+        yield from self._sinash(jadval, sinov)
+
+    def _sinash(self, jadval: dict, sinov):
+        s_kalit, qoshimcha, chap_q = self._s_kalit, self.qoshimcha, self.chap_qoshilish
+        bosh_ong, qurish_chap = self.bosh_ong, self.qurish_chap
+        get = jadval.get
+        for row in sinov:
+            k = s_kalit(row)
+            mos = get(k) if k is not None else None
+            topildi = False
+            if mos is not None:
+                for m in mos:
+                    yangi = {**m, **row} if qurish_chap else {**row, **m}
+                    if qoshimcha is None or qoshimcha(yangi):
+                        topildi = True
+                        yield yangi
+            if chap_q and not topildi:
+                yield {**row, **bosh_ong}
+
+    def _grace(self, jadval: dict, qurish, sinov, daraja: int):
+        n = self.BOLAKLAR
+        q_bolaklar = [_Bolak(self.katalog) for _ in range(n)]
+        s_bolaklar = [_Bolak(self.katalog) for _ in range(n)]
+        try:
+            for k, rows in jadval.items():
+                b = q_bolaklar[hash((k, daraja)) % n]
+                for row in rows:
+                    b.yoz(row)
+            jadval.clear()
+            q_kalit, s_kalit = self._q_kalit, self._s_kalit
+            for row in qurish:
+                k = q_kalit(row)
+                if k is not None:
+                    q_bolaklar[hash((k, daraja)) % n].yoz(row)
+            for row in sinov:
+                s_bolaklar[hash((s_kalit(row), daraja)) % n].yoz(row)
+            for qb, sb in zip(q_bolaklar, s_bolaklar):
+                yield from self._qoshish(qb.oqish(), sb.oqish(), daraja + 1)
+        finally:
+            for b in q_bolaklar + s_bolaklar:
+                b.tozalash()
+
+    def tavsif(self) -> str:
+        tur = "CHAP " if self.chap_qoshilish else ""
+        juftlar = ", ".join(f"{c} = {o}" for c, o in zip(self.chap_kalitlar, self.ong_kalitlar))
+        return f"{tur}{self.nom} ({juftlar}; qurish: {'chap' if self.qurish_chap else 'ong'})"
+
+
+class _Bolak:
+    """Grace bo'lagi: qatorlar pickle bloklari bilan vaqtinchalik faylga yoziladi."""
+
+    BLOK = 1024
+
+    def __init__(self, katalog: str):
+        self.katalog = katalog
+        self.bufer: List[Any] = []
+        self.yol: Optional[str] = None
+        self.f = None
+
+    def yoz(self, row):
+        self.bufer.append(row)
+        if len(self.bufer) >= self.BLOK:
+            self._tokish()
+
+    def _tokish(self):
+        if self.f is None:
+            fd, self.yol = tempfile.mkstemp(prefix='uzdb_join_', suffix='.tmp', dir=self.katalog)
+            self.f = os.fdopen(fd, 'wb')
+        pickle.dump(self.bufer, self.f, pickle.HIGHEST_PROTOCOL)
+        self.bufer = []
+
+    def oqish(self):
+        if self.f is not None:
+            self.f.close()
+            self.f = None
+            yield from TashqiSaralash._oqish(self.yol)
+        yield from self.bufer
+
+    def tozalash(self):
+        if self.f is not None:
+            self.f.close()
+            self.f = None
+        if self.yol is not None:
+            try:
+                os.remove(self.yol)
+            except OSError:
+                pass
+            self.yol = None
+        self.bufer = []
+
+
+class IndeksliQoshilish(Operator):
+    """Ichki jadvalning qo'shilish ustunida B+Tree bo'lsa: har bir tashqi qator uchun indeksdan qidiriladi.
+
+    `shart` - faqat ichki jadvalga tegishli (taxalluslarsiz) shart, `qoshimcha` - birlashgan qatorga.
+    """
+
+    nom = 'IndeksliQoshilish'
+
+    def __init__(self, chap: Operator, jadval: str, taxallus: str, storage: Storage, schema: 'JadvalSchema',
+                 indeks: 'IndeksSchema', daraxt: 'BPlusDaraxt', chap_kalit: str, ustunlar: List[str],
+                 shart=None, qoshimcha=None, chap_qoshilish: bool = False):
+        super().__init__(chap)
+        self.jadval, self.taxallus, self.storage, self.schema = jadval, taxallus, storage, schema
+        self.indeks, self.daraxt, self.chap_kalit = indeks, daraxt, chap_kalit
+        self.ustunlar, self.shart, self.qoshimcha = ustunlar, shart, qoshimcha
+        self.chap_qoshilish = chap_qoshilish
+
+    def __iter__(self):
+        storage, daraxt, chap_kalit = self.storage, self.daraxt, self.chap_kalit
+        tur = self.schema.ustun(self.indeks.ustun).tur
+        oqi = self.schema.kodek.oquvchi(list(dict.fromkeys(self.ustunlar + shart_ustunlari(self.shart))))
+        predikat = predikat_yarat(self.shart) if self.shart is not None else None
+        qoshimcha = self.qoshimcha
+        juftlar = [(self.taxallus + '.' + u, u) for u in self.ustunlar]
+        bosh = {q: None for q, _ in juftlar}
+        for row in self.bolalar[0]:
+            v = row[chap_kalit]
+            topildi = False
+            if v is not None:
+                for rid in daraxt.qidir(_indeks_kaliti(tur, v)):
+                    data = storage.qator(rid)
+                    if data is None:
+                        continue
+                    ich = oqi(data)
+                    if predikat is not None and not predikat(ich):
+                        continue
+                    yangi = {**row, **{q: ich[u] for q, u in juftlar}}
+                    if qoshimcha is None or qoshimcha(yangi):
+                        topildi = True
+                        yield yangi
+            if self.chap_qoshilish and not topildi:
+                yield {**row, **bosh}
+
+    def tavsif(self) -> str:
+        tur = "CHAP " if self.chap_qoshilish else ""
+        return f"{tur}{self.nom} {self.jadval} {self.taxallus} ({self.indeks.nom}: {self.chap_kalit})"
+
+
+class UstunliSkan(Operator):
+    """Vektorlashgan skan: qatorlar o'rniga ustun to'plamlari ({ustun: massiv}) beradi.
+
+    Sahifaning slot jadvalidan jonli qator offsetlari olinadi. Birinchi MATN'gacha
+    turgan sonli ustunlar NumPy bo'lsa bitta indekslash amali bilan, bo'lmasa
+    `Struct.unpack_from` orqali yig'iladi; qolganlari kodek bilan dekodlanadi.
+    QAYERDA butun to'plam ustida niqob (mask) sifatida hisoblanadi.
+    """
+
+    nom = 'UstunliSkan'
+    TURLAR = {'BUTUN_SON': 'q', 'HAQIQIY': 'd'}
+
+    def __init__(self, jadval: str, storage: Storage, schema: 'JadvalSchema', ustunlar: List[str],
+                 shart=None, numpy_bilan: Optional[bool] = None, toplam: int = 8192):
+        super().__init__()
+        if numpy_bilan and np is None:
+            raise ValueError("NumPy o'rnatilmagan")
+        self.jadval, self.storage, self.schema = jadval, storage, schema
+        self.ustunlar, self.shart, self.toplam = ustunlar, shart, toplam
+        self.np = np if numpy_bilan is not False else None
+        kodek = schema.kodek
+        self.turlar = dict(kodek.ustunlar)
+        self.nomlar = list(dict.fromkeys(ustunlar + shart_ustunlari(shart)))
+        self.prefiks = [n for n in self.nomlar if n in kodek.offsetlar]
+        qolgan = [n for n in self.nomlar if n not in kodek.offsetlar]
+        self.qolgan_oqi = kodek.oquvchi(qolgan) if qolgan else None
+        self.qolgan = qolgan
+        if self.prefiks:
+            # prefiks ustunlarini bir chaqiriqda o'qiydigan Struct (kerakli oxirgi ustungacha)
+            tartib = [n for n, _ in kodek.ustunlar]
+            oxirgi = max(tartib.index(n) for n in self.prefiks)
+            self.prefiks_struct = struct.Struct(
+                '<' + ''.join(kodek.BELGI[t] for _, t in kodek.ustunlar[:oxirgi + 1]))
+            self.prefiks_joy = [tartib.index(n) for n in self.prefiks]
+
+    # --- massiv yordamchilari (NumPy yoki array.array/list) ---
+
+    def bosh(self, nom: str):
+        tc = self.TURLAR.get(self.turlar[nom])
+        if self.np is not None:
+            return self.np.empty(0, dtype=self._dtype(nom))
+        return array(tc) if tc else []
+
+    def _dtype(self, nom: str):
+        return {'q': self.np.int64, 'd': self.np.float64}.get(self.TURLAR.get(self.turlar[nom]), object)
+
+    def birlashtir(self, nom: str, qismlar: list):
+        if self.np is not None:
+            return self.np.concatenate(qismlar) if qismlar else self.bosh(nom)
+        natija = self.bosh(nom)
+        for q in qismlar:
+            natija.extend(q)
+        return natija
+
+    def ol(self, nom: str, qiymatlar, indekslar):
+        """Massivdan berilgan indeksdagi (yoki niqobdagi) elementlarni oladi."""
+        if self.np is not None:
+            return qiymatlar[indekslar]
+        tc = self.TURLAR.get(self.turlar[nom])
+        tanlangan = map(qiymatlar.__getitem__, indekslar)
+        return array(tc, tanlangan) if tc else list(tanlangan)
+
+    # --- dekodlash ---
+
+    def _sahifa(self, page) -> Optional[Dict[str, Any]]:
+        n = page.num_rows
+        if n == 0:
+            return None
+        data = page.data
+        slotlar = struct.unpack_from(f'<{2 * n}H', data, HEADER_SIZE)
+        if max(slotlar[1::2]) >= KOCHIRILGAN:
+            # yo'naltirilgan qatorlar bor - ularning ma'lumoti boshqa sahifada
+            qatorlar = [d for _, d in self.storage.sahifa_qatorlari(page)]
+            if not qatorlar:
+                return None
+            b = self._lugatlardan(self.nomlar, list(map(self.schema.kodek.oquvchi(self.nomlar), qatorlar)))
+            b['#'] = len(qatorlar)
+            return b
+        offsetlar = list(compress(slotlar[0::2], slotlar[1::2]))
+        if not offsetlar:
+            return None
+        b: Dict[str, Any] = {}
+        if self.prefiks:
+            if self.np is not None:
+                bufer = self.np.frombuffer(data, dtype=self.np.uint8)
+                offs = self.np.array(offsetlar, dtype=self.np.intp)
+                kodek = self.schema.kodek
+                for nom in self.prefiks:
+                    tur = self.turlar[nom]
+                    olcham = kodek.OLCHAM[tur]
+                    baytlar = bufer[(offs + kodek.offsetlar[nom])[:, None] + self.np.arange(olcham)]
+                    b[nom] = baytlar.view('<i4' if tur == 'BUTUN_SON' else '<f8').ravel().astype(self._dtype(nom))
+            else:
+                qatorlar = list(map(self.prefiks_struct.unpack_from, repeat(data), offsetlar))
+                ustunlar = list(zip(*qatorlar))
+                for nom, j in zip(self.prefiks, self.prefiks_joy):
+                    b[nom] = array(self.TURLAR[self.turlar[nom]], ustunlar[j])
+        if self.qolgan_oqi is not None:
+            mv = memoryview(data)
+            hajmlar = [h for h in slotlar[1::2] if h]
+            qatorlar = [self.qolgan_oqi(mv[o:o + h]) for o, h in zip(offsetlar, hajmlar)]
+            b.update(self._lugatlardan(self.qolgan, qatorlar))
+        b['#'] = len(offsetlar)
+        return b
+
+    def _lugatlardan(self, nomlar: List[str], qatorlar: List[dict]) -> Dict[str, Any]:
+        b = {}
+        for nom in nomlar:
+            qiymatlar = [q[nom] for q in qatorlar]
+            if self.np is not None:
+                b[nom] = self.np.array(qiymatlar, dtype=self._dtype(nom))
+            else:
+                tc = self.TURLAR.get(self.turlar[nom])
+                b[nom] = array(tc, qiymatlar) if tc else qiymatlar
+        return b
+
+    # --- niqob ---
+
+    def _qiymat(self, s, b):
+        if isinstance(s, Ustun):
+            return b[s.nom], True
+        if isinstance(s, Literal):
+            return s.qiymat, False
+        raise ValueError(f"Noma'lum ifoda: {s}")
+
+    def _niqob(self, s, b: Dict[str, Any], n: int):
+        if isinstance(s, Taqqoslash):
+            f = _OP_FUNKSIYALAR[s.operator]
+            (chap, chap_ustun), (ong, ong_ustun) = self._qiymat(s.chap, b), self._qiymat(s.ong, b)
+            if self.np is not None:
+                m = f(chap, ong)
+                return m if isinstance(m, self.np.ndarray) else self.np.full(n, bool(m))
+            if not chap_ustun and not ong_ustun:
+                return [f(chap, ong)] * n
+            return list(map(f, chap if chap_ustun else repeat(chap), ong if ong_ustun else repeat(ong)))
+        if isinstance(s, MantiqiyIfoda):
+            a, c = self._niqob(s.chap, b, n), self._niqob(s.ong, b, n)
+            if self.np is not None:
+                return a & c if s.operator == 'VA' else a | c
+            return list(map(operator.and_ if s.operator == 'VA' else operator.or_, a, c))
+        return self.np.ones(n, dtype=bool) if self.np is not None else [True] * n
+
+    def _toplamlar(self):
+        qismlar: Dict[str, list] = {n: [] for n in self.nomlar}
+        soni = 0
+        for page in self.storage.pages:
+            b = self._sahifa(page)
+            if b is None:
+                continue
+            soni += b.pop('#')
+            for nom, q in b.items():
+                qismlar[nom].append(q)
+            if soni >= self.toplam:
+                yield {n: self.birlashtir(n, q) for n, q in qismlar.items()}, soni
+                qismlar, soni = {n: [] for n in self.nomlar}, 0
+        if soni:
+            yield {n: self.birlashtir(n, q) for n, q in qismlar.items()}, soni
+
+    def __iter__(self):
+        for b, n in self._toplamlar():
+            if self.shart is None:
+                yield {u: b[u] for u in self.ustunlar}
+                continue
+            niqob = self._niqob(self.shart, b, n)
+            if self.np is not None:
+                yield {u: b[u][niqob] for u in self.ustunlar}
+            else:
+                tc = {u: self.TURLAR.get(self.turlar[u]) for u in self.ustunlar}
+                yield {u: array(tc[u], compress(b[u], niqob)) if tc[u] else list(compress(b[u], niqob))
+                       for u in self.ustunlar}
+
+    def tavsif(self) -> str:
+        rejim = 'NumPy' if self.np is not None else 'array'
+        return f"{self.nom} {self.jadval} [{rejim}]" + (" (filtr)" if self.shart is not None else "")
+
+
+# ============================================================
+# 6. EXECUTOR
+# ============================================================
+
+class QatorKodek:
+    """Jadval sxemasi uchun bir marta yasaladigan qator kodeki.
+
+    Qator ketma-ket segmentlarga bo'linadi: bir nechta BUTUN_SON/HAQIQIY ustun
+    va ulardan keyingi MATN ustunining uzunlik prefiksi. Har bir segment bitta
+    oldindan kompilyatsiya qilingan `struct.Struct` bilan o'qiladi/yoziladi.
+
+    - `oquvchi(nomlar)` faqat so'ralgan ustunlarni o'qiydigan funksiya yasaydi
+      (keshlanadi): kerakmas MATN'lar dekodlanmaydi, uzunligi bo'yicha o'tiladi.
+    - `normallash(row)` qiymatlarni sxema tartibidagi ro'yxatga keltiradi,
+      `hajm(q)` kodlangan uzunlikni beradi, `yoz(buf, off, q)` esa `pack_into`
+      bilan to'g'ridan-to'g'ri berilgan buferga (masalan sahifaga) yozadi.
+    """
+
+    OLCHAM = {'BUTUN_SON': 4, 'HAQIQIY': 8}
+    BELGI = {'BUTUN_SON': 'i', 'HAQIQIY': 'd'}
+
+    def __init__(self, schema: 'JadvalSchema'):
+        self.ustunlar = [(u.nom, u.tur) for u in schema.ustunlar]
+        # segmentlar: ([(indeks, nom)] sobit ustunlar, (indeks, nom) yoki None - MATN, Struct)
+        self.segmentlar = []
+        sobit = []
+        for i, (nom, tur) in enumerate(self.ustunlar):
+            if tur in self.OLCHAM:
+                sobit.append((i, nom))
+                continue
+            self._segment(sobit, (i, nom))
+            sobit = []
+        if sobit:
+            self._segment(sobit, None)
+        # birinchi MATN'gacha bo'lgan ustunlarning doimiy offsetlari
+        self.offsetlar: Dict[str, int] = {}
+        off = 0
+        for nom, tur in self.ustunlar:
+            if tur not in self.OLCHAM:
+                break
+            self.offsetlar[nom] = off
+            off += self.OLCHAM[tur]
+        self.sobit_hajm = sum(seg[2].size for seg in self.segmentlar)
+        self._matn_indekslari = [seg[1][0] for seg in self.segmentlar if seg[1] is not None]
+        self._oquvchilar: Dict[Optional[tuple], Any] = {}
+        self.normallash, self.yoz = self._kodlovchi()
+
+    def _segment(self, sobit, matn):
+        fmt = '<' + ''.join(self.BELGI[self.ustunlar[i][1]] for i, _ in sobit) + ('H' if matn else '')
+        self.segmentlar.append((sobit, matn, struct.Struct(fmt)))
+
+    def hajm(self, q: list) -> int:
+        n = self.sobit_hajm
+        for i in self._matn_indekslari:
+            n += len(q[i])
+        return n
+
+    def kodla(self, row: dict) -> bytearray:
+        q = self.normallash(row)
+        buf = bytearray(self.hajm(q))
+        self.yoz(buf, 0, q)
+        return buf
+
+    def _kodlovchi(self):
+        ns = {'str': str}
+        norm = []
+        for nom, tur in self.ustunlar:
+            g = f"row.get({nom!r})"
+            if tur == 'BUTUN_SON':
+                norm.append(f"({g} or 0)")
+            elif tur == 'HAQIQIY':
+                norm.append(f"({g} or 0.0)")
+            else:
+                norm.append(f"(str({g}) if {g} else '').encode('utf-8')")
+        satrlar = ["def yoz(buf, off, q):", "    o = off"]
+        for k, (sobit, matn, st) in enumerate(self.segmentlar):
+            ns[f"_p{k}"] = st.pack_into
+            args = [f"q[{i}]" for i, _ in sobit] + ([f"len(q[{matn[0]}])"] if matn else [])
+            satrlar.append(f"    _p{k}(buf, o, {', '.join(args)})")
+            satrlar.append(f"    o += {st.size}")
+            if matn:
+                satrlar.append(f"    m = q[{matn[0]}]")
+                satrlar.append("    buf[o:o + len(m)] = m")
+                satrlar.append("    o += len(m)")
+        manba = f"def normallash(row):\n    return [{', '.join(norm)}]\n" + "\n".join(satrlar)
+        exec(manba, ns)
+        return ns['normallash'], ns['yoz']
+
+    def oquvchi(self, nomlar=None):
+        kalit = tuple(nomlar) if nomlar is not None else None
+        f = self._oquvchilar.get(kalit)
+        if f is None:
+            f = self._oquvchilar[kalit] = self._yasash(kalit)
+        return f
+
+    def _yasash(self, nomlar: Optional[tuple]):
+        kerak = set(nomlar) if nomlar is not None else {n for n, _ in self.ustunlar}
+        ns = {'str': str}
+        satrlar = ["def oqi(d):", "    r = {}"]
+        oxirgi = max((k for k, (sobit, matn, _) in enumerate(self.segmentlar)
+                      if any(n in kerak for _, n in sobit) or (matn and matn[1] in kerak)), default=-1)
+        off, dinamik = 0, False  # dinamik: offset endi `o` o'zgaruvchisida
+        for k, (sobit, matn, st) in enumerate(self.segmentlar[:oxirgi + 1]):
+            joy = "o" if dinamik else str(off)
+            ns[f"_u{k}"] = st.unpack_from
+            nomlar_k = [f"_v{i}" for i, _ in sobit] + (["n"] if matn else [])
+            satrlar.append(f"    {', '.join(nomlar_k)}{',' if len(nomlar_k) == 1 else ''} = _u{k}(d, {joy})")
+            for i, nom in sobit:
+                if nom in kerak:
+                    satrlar.append(f"    r[{nom!r}] = _v{i}")
+            bosh = f"{joy} + {st.size}" if dinamik else str(off + st.size)
+            if matn:
+                if matn[1] in kerak:
+                    satrlar.append(f"    r[{matn[1]!r}] = str(d[{bosh}:{bosh} + n], 'utf-8')")
+                if k < oxirgi:
+                    satrlar.append(f"    o = {bosh} + n")
+                dinamik = True
+            else:
+                off += st.size
+        satrlar.append("    return r")
+        exec("\n".join(satrlar), ns)
+        oqi = ns['oqi']
+        if nomlar is None or list(nomlar) == [n for n, _ in self.ustunlar if n in kerak]:
+            return oqi
+        # so'ralgan tartibni saqlash
+        return lambda d: {n: v for n, v in zip(nomlar, map(oqi(d).__getitem__, nomlar))}
+
+
+@dataclass
+class UstunSchema:
+    nom: str
+    tur: str
+    asosiy_kalit: bool = False
+    bosh_emas: bool = False
+
+@dataclass
+class JadvalSchema:
+    nom: str
+    ustunlar: List[UstunSchema]
+    
+    def ustun(self, nom: str) -> Optional[UstunSchema]:
+        return next((u for u in self.ustunlar if u.nom == nom), None)
+    
+    @cached_property
+    def kodek(self) -> QatorKodek:
+        return QatorKodek(self)
+
+@dataclass
+class IndeksSchema:
+    nom: str
+    jadval: str
+    ustun: str
+    yagona: bool = False
+
+
+# --- statistika katalogi (TAHLIL_QIL) ---
+
+STAT_SAHIFALAR = 300    # namunaga olinadigan sahifalar
+STAT_QATORLAR = 30000   # gistogramma uchun qatorlar rezervuari
+STAT_BOLAKLAR = 100     # teng chuqurlikdagi gistogramma bo'laklari
+STAT_AVTO_CHEGARA = 50  # avtomatik yangilash: 50 + ulush * qatorlar o'zgarishdan keyin
+
+
+class HyperLogLog:
+    """Farqli qiymatlar sonini 2^p bayt xotira bilan baholaydi (nisbiy xato ~1.04/sqrt(2^p))."""
+
+    def __init__(self, p: int = 12):
+        self.p, self.m = p, 1 << p
+        self.registrlar = bytearray(self.m)
+
+    def qosh(self, qiymat):
+        h = int.from_bytes(hashlib.blake2b(repr(qiymat).encode(), digest_size=8).digest(), 'little')
+        j, w = h & (self.m - 1), h >> self.p
+        r = 64 - self.p - w.bit_length() + 1
+        if r > self.registrlar[j]:
+            self.registrlar[j] = r
+
+    def baho(self) -> float:
+        m = self.m
+        e = 0.7213 / (1 + 1.079 / m) * m * m / sum(2.0 ** -r for r in self.registrlar)
+        nollar = self.registrlar.count(0)
+        if e <= 2.5 * m and nollar:
+            e = m * math.log(m / nollar)  # kichik oraliq: chiziqli sanash
+        return e
+
+
+def _rezervuar(oqim, k: int, tasodif: random.Random) -> list:
+    """Oqimdan bir tekis tasodifiy k ta element (Algorithm R), oqim bir marta o'tiladi."""
+    namuna = []
+    for i, x in enumerate(oqim):
+        if i < k:
+            namuna.append(x)
+        else:
+            j = tasodif.randrange(i + 1)
+            if j < k:
+                namuna[j] = x
+    return namuna
+
+
+@dataclass
+class UstunStatistikasi:
+    null_ulush: float
+    farqli: float
+    eng_kichik: Any = None
+    eng_katta: Any = None
+    chegaralar: List[Any] = None  # teng chuqurlikdagi gistogramma: bo'laklar + 1 ta chegara
+
+    def kichik_ulushi(self, v) -> float:
+        """NULL bo'lmagan qiymatlarning `v` dan kichik qismi; bo'lak ichida chiziqli interpolyatsiya."""
+        c = self.chegaralar
+        if not c:
+            return ORALIQ_STANDART
+        i = bisect.bisect_left(c, v)
+        if i == 0:
+            return 0.0
+        if i >= len(c):
+            return 1.0
+        past, yuqori = c[i - 1], c[i]
+        ichida = (v - past) / (yuqori - past) if not isinstance(v, str) and yuqori > past else 0.5
+        return (i - 1 + ichida) / (len(c) - 1)
+
+    def teng_ulushi(self, v, farqli: float) -> float:
+        """NULL bo'lmagan qiymatlarning `v` ga teng qismi. Gistogrammada bir necha chegara bo'lib
+        kelgan (tez-tez uchraydigan) qiymat egallagan bo'laklari bilan baholanadi, qolganlari esa
+        qolgan ulushni teng bo'lishadi - namunada ko'rinmagan qiymat ham shu guruhda."""
+        c = self.chegaralar
+        if not c or len(c) < 2:
+            return 1 / farqli
+        b = len(c) - 1
+        takror = bisect.bisect_right(c, v) - bisect.bisect_left(c, v)
+        if takror >= 2:
+            return (takror - 1) / b
+        tez = [len(list(g)) - 1 for _, g in itertools.groupby(c)]
+        tez = [k for k in tez if k]
+        if farqli - len(tez) < 1:
+            return 0.0  # barcha qiymatlar gistogrammada ko'rindi
+        return min(max(0.0, 1 - sum(tez) / b) / (farqli - len(tez)), 1 / b)
+
+
+@dataclass
+class JadvalStatistikasi:
+    qatorlar: float
+    sahifalar: int
+    ustunlar: Dict[str, UstunStatistikasi]
+
+
+_STAT_SARLAVHA = struct.Struct('<4sBI')
+_STAT_JADVAL = struct.Struct('<dIqH')
+_STAT_USTUN = struct.Struct('<ddH')
+
+
+def _stat_qiymat_yoz(f: bytearray, v):
+    if v is None:
+        f.append(0)
+    elif isinstance(v, int):
+        f.append(1)
+        f += struct.pack('<q', v)
+    elif isinstance(v, float):
+        f.append(2)
+        f += struct.pack('<d', v)
+    else:
+        b = str(v).encode('utf-8')
+        f.append(3)
+        f += struct.pack('<I', len(b)) + b
+
+
+def _stat_qiymat_oqi(data, off: int):
+    tur = data[off]
+    off += 1
+    if tur == 0:
+        return None, off
+    if tur in (1, 2):
+        return struct.unpack_from('<q' if tur == 1 else '<d', data, off)[0], off + 8
+    n = struct.unpack_from('<I', data, off)[0]
+    return bytes(data[off + 4:off + 4 + n]).decode('utf-8'), off + 4 + n
+
+
+def statistika_kodla(statistikalar: Dict[str, JadvalStatistikasi], ozgarishlar: Dict[str, int]) -> bytes:
+    """Ikkilik katalog: sarlavha, har jadval (qatorlar, sahifalar, o'zgarishlar, ustunlar), oxirida CRC32."""
+    nomlar = sorted(set(statistikalar) | set(ozgarishlar))
+    f = bytearray(_STAT_SARLAVHA.pack(b'UZST', 1, len(nomlar)))
+    for nom in nomlar:
+        st = statistikalar.get(nom)
+        _stat_qiymat_yoz(f, nom)
+        ustunlar = st.ustunlar if st else {}
+        f += _STAT_JADVAL.pack(st.qatorlar if st else -1.0, st.sahifalar if st else 0,
+                               ozgarishlar.get(nom, 0), len(ustunlar))
+        for unom, us in ustunlar.items():
+            _stat_qiymat_yoz(f, unom)
+            chegaralar = us.chegaralar or []
+            f += _STAT_USTUN.pack(us.null_ulush, us.farqli, len(chegaralar))
+            for v in (us.eng_kichik, us.eng_katta, *chegaralar):
+                _stat_qiymat_yoz(f, v)
+    f += struct.pack('<I', zlib.crc32(f))
+    return bytes(f)
+
+
+def statistika_dekodla(data: bytes) -> Tuple[Dict[str, JadvalStatistikasi], Dict[str, int]]:
+    if len(data) < _STAT_SARLAVHA.size + 4 or struct.unpack_from('<I', data, len(data) - 4)[0] != zlib.crc32(data[:-4]):
+        raise ValueError("Statistika katalogi buzilgan")
+    belgi, versiya, soni = _STAT_SARLAVHA.unpack_from(data, 0)
+    if belgi != b'UZST' or versiya != 1:
+        raise ValueError("Statistika katalogi formati noma'lum")
+    statistikalar, ozgarishlar, off = {}, {}, _STAT_SARLAVHA.size
+    for _ in range(soni):
+        nom, off = _stat_qiymat_oqi(data, off)
+        qatorlar, sahifalar, ozgarish, ustunlar_soni = _STAT_JADVAL.unpack_from(data, off)
+        off += _STAT_JADVAL.size
+        ustunlar = {}
+        for _ in range(ustunlar_soni):
+            unom, off = _stat_qiymat_oqi(data, off)
+            null_ulush, farqli, n = _STAT_USTUN.unpack_from(data, off)
+            off += _STAT_USTUN.size
+            qiymatlar = []
+            for _ in range(n + 2):
+                v, off = _stat_qiymat_oqi(data, off)
+                qiymatlar.append(v)
+            ustunlar[unom] = UstunStatistikasi(null_ulush, farqli, qiymatlar[0], qiymatlar[1], qiymatlar[2:])
+        if qatorlar >= 0:
+            statistikalar[nom] = JadvalStatistikasi(qatorlar, sahifalar, ustunlar)
+        if ozgarish:
+            ozgarishlar[nom] = ozgarish
+    return statistikalar, ozgarishlar
+
+
+def _va_qismlari(shart):
+    if isinstance(shart, MantiqiyIfoda) and shart.operator == 'VA':
+        yield from _va_qismlari(shart.chap)
+        yield from _va_qismlari(shart.ong)
+    elif shart is not None:
+        yield shart
+
+
+def _chegara_qosh(o: list, op: str, v):
+    """[past, past_teng, yuqori, yuqori_teng] oralig'ini `op v` sharti bilan toraytiradi."""
+    if op in ('=', '>', '>=') and (o[0] is None or v > o[0] or (v == o[0] and op == '>')):
+        o[0], o[1] = v, op != '>'
+    if op in ('=', '<', '<=') and (o[2] is None or v < o[2] or (v == o[2] and op == '<')):
+        o[2], o[3] = v, op != '<'
+
+
+_TESKARI_OP = {'=': '=', '!=': '!=', '<': '>', '>': '<', '<=': '>=', '>=': '<='}
+
+def _ustun_literal(s):
+    """`ustun op literal` (yoki teskarisi) ko'rinishidagi taqqoslashni (ustun, op, qiymat) ga keltiradi."""
+    if not isinstance(s, Taqqoslash):
+        return None
+    if isinstance(s.chap, Ustun) and isinstance(s.ong, Literal):
+        return s.chap.nom, s.operator, s.ong.qiymat
+    if isinstance(s.chap, Literal) and isinstance(s.ong, Ustun):
+        return s.ong.nom, _TESKARI_OP[s.operator], s.chap.qiymat
+    return None
+
+
+def _indeks_kaliti(tur: str, v):
+    if tur == 'BUTUN_SON':
+        return int(v) if v else 0
+    if tur == 'HAQIQIY':
+        return float(v) if v else 0.0
+    return str(v) if v else ''
+
+
+def _nuqtali(ast: TanlashBuyruq) -> bool:
+    """So'rovda `jadval.ustun` ko'rinishidagi nom bormi."""
+    nomlar = [u.nom if isinstance(u, Ustun) else u.ustun or '' for u in ast.ustunlar if not isinstance(u, Yulduzcha)]
+    nomlar += shart_ustunlari(ast.shart) + (ast.guruh or []) + [u for u, _ in ast.tartib or []]
+    return any('.' in n and not n.endswith(')') for n in nomlar)
+
+
+def _taxminiy_hajm(x) -> int:
+    """Qator/kalitning xotiradagi taxminiy hajmi: konteyner, qiymatlar va ro'yxatdagi ko'rsatkich."""
+    qiymatlar = x.values() if isinstance(x, dict) else x if isinstance(x, (tuple, list)) else ()
+    return 8 + sys.getsizeof(x) + sum(map(sys.getsizeof, qiymatlar))
+
+
+class TashqiSaralash:
+    """Xotira chegarasidan oshsa saralangan bo'laklarni (run) vaqtinchalik
+    fayllarga yozadigan va k-yo'lli birlashtirib qaytaradigan saralash."""
+
+    BLOK = 1024
+
+    def __init__(self, katalog: str, kalit=None, chegara: int = 100_000, xotira: Optional[int] = None,
+                 teskari: bool = False):
+        self.katalog = katalog
+        self.kalit = kalit
+        self.teskari = teskari
+        self.chegara = max(1, chegara)
+        # xotira (bayt) berilsa chegara birinchi element (va uning kaliti) hajmidan hisoblanadi
+        self.xotira = xotira
+        self.bufer: List[Any] = []
+        self.fayllar: List[str] = []
+
+    def qosh(self, element):
+        if self.xotira is not None and not self.bufer and not self.fayllar:
+            hajm = _taxminiy_hajm(element) + (_taxminiy_hajm(self.kalit(element)) if self.kalit else 0)
+            self.chegara = max(1, self.xotira // hajm)
+        self.bufer.append(element)
+        if len(self.bufer) >= self.chegara:
+            self._tokish()
+
+    def _tokish(self):
+        self.bufer.sort(key=self.kalit, reverse=self.teskari)
+        fd, yol = tempfile.mkstemp(prefix='uzdb_sort_', suffix='.tmp', dir=self.katalog)
+        with os.fdopen(fd, 'wb') as f:
+            for i in range(0, len(self.bufer), self.BLOK):
+                pickle.dump(self.bufer[i:i + self.BLOK], f, pickle.HIGHEST_PROTOCOL)
+        self.fayllar.append(yol)
+        self.bufer = []
+
+    @staticmethod
+    def _oqish(yol: str):
+        with open(yol, 'rb') as f:
+            while True:
+                try:
+                    blok = pickle.load(f)
+                except EOFError:
+                    return
+                yield from blok
+
+    def __iter__(self):
+        try:
+            if not self.fayllar:
+                self.bufer.sort(key=self.kalit, reverse=self.teskari)
+                yield from self.bufer
+                return
+            if self.bufer:
+                self._tokish()
+            yield from heapq.merge(*(self._oqish(y) for y in self.fayllar), key=self.kalit,
+                                  reverse=self.teskari)
+        finally:
+            self.tozalash()
+
+    def tozalash(self):
+        self.bufer = []
+        for yol in self.fayllar:
+            try:
+                os.remove(yol)
+            except OSError:
+                pass
+        self.fayllar = []
+
+
+BUTUN_SON_MIN, BUTUN_SON_MAX = -2 ** 31, 2 ** 31 - 1  # kodekda '<i' (int32)
+
+
+def _qiymat_moslash(ustun: UstunSchema, v):
+    """Qiymatni ustun turiga keltiradi; kodekka sig'maydigan qiymat ValueError beradi."""
+    if v is None or v == '':
+        return None
+    try:
+        if ustun.tur == 'BUTUN_SON':
+            n = int(v)
+            if n != v and not isinstance(v, str):  # 1.5 kabi kasr qiymatlar kesilmaydi
+                raise ValueError
+        elif ustun.tur == 'HAQIQIY':
+            return float(v)
+        else:
+            return str(v)
+    except (TypeError, ValueError, OverflowError):
+        raise ValueError(f"{ustun.nom}: {ustun.tur} kutilgan, topilgan: {v!r}") from None
+    if not BUTUN_SON_MIN <= n <= BUTUN_SON_MAX:
+        raise ValueError(f"{ustun.nom}: BUTUN_SON chegarasidan tashqarida: {n}")
+    return n
+
+
+_TUGADI = object()
+
+
+class OqishYozishQulfi:
+    """Ko'p o'quvchi yoki bitta yozuvchi.
+
+    Qayta kiriladi: yozuvchi yana yozish ham, o'qish ham oladi; o'quvchi yana o'qish oladi,
+    lekin o'qishni yozishga ko'tarib bo'lmaydi. Yozuvchi kutayotganda yangi o'quvchilar
+    to'xtaydi - yozuvchi och qolmaydi.
+    """
+
+    def __init__(self):
+        self._shart = threading.Condition(threading.Lock())
+        self._oquvchilar: Dict[int, int] = {}  # oqim -> ichma-ich o'qishlar soni
+        self._yozuvchi: Optional[int] = None
+        self._yozish_soni = 0
+        self._kutayotganlar = 0
+
+    def oqish_ol(self):
+        men = threading.get_ident()
+        with self._shart:
+            if self._yozuvchi != men and men not in self._oquvchilar:
+                while self._yozuvchi is not None or self._kutayotganlar:
+                    self._shart.wait()
+            self._oquvchilar[men] = self._oquvchilar.get(men, 0) + 1
+
+    def oqish_qoy(self):
+        men = threading.get_ident()
+        with self._shart:
+            self._oquvchilar[men] -= 1
+            if not self._oquvchilar[men]:
+                del self._oquvchilar[men]
+                self._shart.notify_all()
+
+    def yozish_ol(self):
+        men = threading.get_ident()
+        with self._shart:
+            if self._yozuvchi == men:
+                self._yozish_soni += 1
+                return
+            if men in self._oquvchilar:
+                raise RuntimeError("O'qish qulfini yozish qulfiga ko'tarib bo'lmaydi")
+            self._kutayotganlar += 1
+            try:
+                while self._yozuvchi is not None or self._oquvchilar:
+                    self._shart.wait()
+            finally:
+                self._kutayotganlar -= 1
+            self._yozuvchi, self._yozish_soni = men, 1
+
+    def yozish_qoy(self):
+        with self._shart:
+            self._yozish_soni -= 1
+            if not self._yozish_soni:
+                self._yozuvchi = None
+                self._shart.notify_all()
+
+    @contextlib.contextmanager
+    def oqish(self):
+        self.oqish_ol()
+        try:
+            yield
+        finally:
+            self.oqish_qoy()
+
+    @contextlib.contextmanager
+    def yozish(self):
+        self.yozish_ol()
+        try:
+            yield
+        finally:
+            self.yozish_qoy()
+
+
+CHECKPOINT_KUTISH_MAX = 60.0  # xatodan keyin fon checkpoint qayta urinishlari orasidagi eng ko'p kutish (s)
+
+
+def _baza_qulfi(db_path: str) -> int:
+    """Katalogni shu jarayonga band qiladi: ikkinchi jarayon (yoki Executor) har birining o'z
+    buffer pool'i va keshlari bilan bitta bazani buzmasin. Fayl qulfi jarayon tugasa OS tomonidan bo'shatiladi."""
+    fd = os.open(os.path.join(db_path, "uzdb.lock"), os.O_RDWR | os.O_CREAT | getattr(os, 'O_BINARY', 0), 0o644)
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+    except OSError:
+        os.close(fd)
+        raise ValueError(f"Baza boshqa Executor yoki jarayonda ochiq: {db_path}") from None
+    return fd
+
+
+def _natija_kaliti(sql_kaliti: str, parametrlar):
+    if not parametrlar:
+        return sql_kaliti, ()
+    if isinstance(parametrlar, dict):
+        return sql_kaliti, tuple(sorted(parametrlar.items(), key=lambda kv: str(kv[0])))
+    return sql_kaliti, tuple(parametrlar)
+
+
+def _natija_hajmi(natija) -> int:
+    """Natija qatorlari egallagan xotira (taxminan, bayt)."""
+    if not isinstance(natija, list):
+        return sys.getsizeof(natija)
+    return sys.getsizeof(natija) + sum(
+        sys.getsizeof(row) + sum(map(sys.getsizeof, row.values())) for row in natija)
+
+
+class TayyorSorov:
+    """`Executor.tayyorla` natijasi: bir marta parse qilingan, qayta ishlatiladigan so'rov.
+
+    `bajar(*qiymatlar, **nomlilar)` - `?` lar tartib bo'yicha, `:nom` lar nomi bo'yicha bog'lanadi.
+    """
+
+    def __init__(self, executor: 'Executor', sql: str, ast, parametrlar: List[Union[int, str]]):
+        self.executor, self.sql, self.ast, self.parametrlar = executor, sql, ast, parametrlar
+        self.kalit = _sql_kaliti(sql)
+
+    def bajar(self, *qiymatlar, **nomlilar):
+        qiymat = {**dict(enumerate(qiymatlar)), **nomlilar}
+        ex = self.executor
+
+        def bogla():
+            return parametrlarni_bogla(self.ast, qiymat) if self.parametrlar else self.ast
+
+        if ex.natija_kesh_hajmi:
+            return ex._keshli_bajar(_natija_kaliti(self.kalit, qiymat), bogla)
+        return ex._bajar_qulfli(bogla())
+
+    def __repr__(self):
+        return f"TayyorSorov({self.sql!r})"
+
+
+class Executor:
+    def __init__(self, db_path: str = "uzdb_data", bufer_hajmi: int = 1024, mmap_rejim: bool = False,
+                 wal_guruh: int = 64, wal_kutish: float = 0.01, checkpoint_oraligi: Optional[float] = 1.0,
+                 sorov_kesh_hajmi: int = 256, saralash_xotirasi: int = 64 * 1024 * 1024,
+                 qoshilish_xotirasi: int = 64 * 1024 * 1024, statistika_ulushi: Optional[float] = 0.1,
+                 natija_kesh_hajmi: int = 0, natija_kesh_xotirasi: int = 16 * 1024 * 1024,
+                 parallel_ishchilar: int = 0, parallel_chegara: int = 1024,
+                 yuklash_papkasi: Optional[str] = '.'):
+        self.db_path = db_path
+        self.mmap_rejim = mmap_rejim
+        self.jadvallar: Dict[str, JadvalSchema] = {}
+        self.storage: Dict[str, Storage] = {}
+        self.indekslar: Dict[str, IndeksSchema] = {}
+        self.daraxtlar: Dict[str, BPlusDaraxt] = {}
+        self.pool = BufferPool(bufer_hajmi)
+        # Qulflar: _qulf - butun baza (JADVAL_YARAT, INDEKS_YARAT, SIQISH, checkpoint - eksklyuziv,
+        # qolgan buyruqlar - umumiy), undan keyin jadval qulflari nom tartibida (TANLASH - o'qish,
+        # QO'SH/YANGILASH/O'CHIR/YUKLASH - yozish). _ichki_qulf - keshlar va hisoblagichlar uchun
+        # qisqa qulf, _stat_qulf - statistika katalogini o'zgartirish uchun (tahlil va o'qish uning tashqarisida).
+        self._qulf = OqishYozishQulfi()
+        self._jadval_qulflari: Dict[str, OqishYozishQulfi] = {}
+        self._ichki_qulf = threading.RLock()
+        self._stat_qulf = threading.RLock()
+        # normallashgan SQL -> (ast, parametrlar); LRU
+        self._sorov_kesh: OrderedDict = OrderedDict()
+        self.sorov_kesh_hajmi = sorov_kesh_hajmi
+        # TARTIBLA uchun xotira chegarasi (bayt); oshsa saralash diskdagi bo'laklar bilan davom etadi
+        self.saralash_xotirasi = saralash_xotirasi
+        # HashQoshilish qurish tomoni uchun chegara (bayt); oshsa Grace bo'laklari diskka yoziladi
+        self.qoshilish_xotirasi = qoshilish_xotirasi
+        # TAHLIL_QIL natijalari; jadvalda 50 + ulush * qatorlar o'zgarish bo'lsa fon checkpointer
+        # mavjud statistikani qayta yig'adi (None - faqat qo'lda). So'rov rejasi buni kutmaydi.
+        self.statistika_ulushi = statistika_ulushi
+        self.statistikalar: Dict[str, JadvalStatistikasi] = {}
+        self._ozgarishlar: Dict[str, int] = {}
+        # TANLASH natijalari keshi: (normallashgan SQL, parametrlar) -> (qatorlar, jadval versiyalari,
+        # bayt); LRU, yozuvlar soni va bayt bo'yicha cheklangan (0 - o'chirilgan). Jadvalga yozish
+        # uning versiyasini oshiradi va shu jadvalni o'qigan yozuvlar eskiradi.
+        self.natija_kesh_hajmi = natija_kesh_hajmi
+        self.natija_kesh_xotirasi = natija_kesh_xotirasi
+        self._natija_kesh: OrderedDict = OrderedDict()
+        self._natija_kesh_bayt = 0
+        self._versiyalar: Dict[str, int] = {}
+        self.kesh_topildi = 0
+        self.kesh_topilmadi = 0
+        # parallel_chegara sahifadan katta jadval skanlari shuncha ishchi jarayonga bo'linishi
+        # mumkin (narx taxmini bo'yicha); 0 yoki 1 - doim ketma-ket. Havza birinchi kerak bo'lganda ochiladi.
+        self.parallel_ishchilar = parallel_ishchilar
+        self.parallel_chegara = parallel_chegara
+        self._havza: Optional[concurrent.futures.ProcessPoolExecutor] = None
+        # YUKLASH faqat shu papka ichidagi fayllarni o'qiydi; nisbiy yo'l baza papkasiga nisbatan
+        # (standart '.' - baza papkasining o'zi), None - YUKLASH o'chirilgan
+        self.yuklash_papkasi = (os.path.realpath(os.path.join(db_path, yuklash_papkasi))
+                                if yuklash_papkasi is not None else None)
+        os.makedirs(db_path, exist_ok=True)
+        # Qulf yopish() da yoki Executor yopilmay tashlab yuborilsa - GC da bo'shaydi
+        self._qulf_boshatish = weakref.finalize(self, os.close, _baza_qulfi(db_path))
+        for fayl in os.listdir(db_path):
+            if fayl.startswith(('uzdb_sort_', 'uzdb_join_')) and fayl.endswith('.tmp'):
+                os.remove(os.path.join(db_path, fayl))  # crash'dan qolgan saralash/qo'shilish bo'laklari
+        self.wal = WAL(os.path.join(db_path, "wal.log"), wal_guruh, wal_kutish)
+        self._metadata_yukla()
+        self._statistika_yukla()
+        tegilgan = self._tiklash()
+        for ind in list(self.indekslar.values()):
+            self._indeks_ochish(ind, qayta_qurish=ind.jadval in tegilgan)
+        self._toxta = threading.Event()
+        self._checkpointer = None
+        self.checkpoint_xatosi: Optional[BaseException] = None
+        if checkpoint_oraligi:
+            # oqim Executor'ni faqat weakref orqali ushlaydi - yopilmagan obyekt ham GC bo'la oladi
+            self._checkpointer = threading.Thread(target=_checkpoint_oqimi,
+                                                  args=(weakref.ref(self), self._toxta, checkpoint_oraligi),
+                                                  name="uzdb-checkpointer", daemon=True)
+            self._checkpointer.start()
+        atexit.register(_executor_yopish, weakref.ref(self))
+    
+    def _storage_ochish(self, nom: str) -> Storage:
+        storage = Storage(os.path.join(self.db_path, f"{nom}.uzdb"), self.pool, self.mmap_rejim)
+        storage.wal = self.wal
+        self.storage[nom] = storage
+        return storage
+    
+    def _tiklash(self) -> set:
+        """Crash'dan keyin WAL'dagi redo yozuvlarini jadval sahifalariga qo'llaydi."""
+        tegilgan = set()
+        for jadval, page_id, oraliqlar in self.wal.oqish():
+            storage = self.storage.get(jadval)
+            if storage is None:
+                continue
+            while storage.sahifalar_soni <= page_id:
+                storage.allocate()
+            page = storage.page(page_id)
+            for off, bayt in oraliqlar:
+                page.qayta_qollash(off, bayt)
+            page.ozgarishlar.clear()
+            tegilgan.add(jadval)
+        for jadval in tegilgan:
+            self.storage[jadval].fsm_tashla()
+        if tegilgan or os.fstat(self.wal.fd).st_size:
+            self.checkpoint()
+        return tegilgan
+    
+    def _indeks_ochish(self, ind: IndeksSchema, qayta_qurish: bool = False):
+        # Indeks sahifalari WAL'ga yozilmaydi: recovery'dan keyin heap'dan qayta quriladi
+        fayl = os.path.join(self.db_path, f"{ind.nom}.idx")
+        yangi = not os.path.exists(fayl)
+        ustun = self.jadvallar[ind.jadval].ustun(ind.ustun)
+        self.indekslar[ind.nom] = ind
+        self.daraxtlar[ind.nom] = BPlusDaraxt(fayl, ustun.tur, ind.yagona)
+        if yangi or qayta_qurish:
+            self._indeks_qurish(ind.nom)
+    
+    def _indeks_qurish(self, nom: str):
+        ind = self.indekslar[nom]
+        schema = self.jadvallar[ind.jadval]
+        tur = schema.ustun(ind.ustun).tur
+        juftlar = [(_indeks_kaliti(tur, row[ind.ustun]), rid) for rid, row in self._skan(ind.jadval, [ind.ustun])]
+        juftlar.sort(key=lambda j: j[0])
+        self.daraxtlar[nom].ommaviy_qurish(juftlar)
+    
+    def _jadval_indekslari(self, jadval: str) -> List[IndeksSchema]:
+        return [ind for ind in self.indekslar.values() if ind.jadval == jadval]
+    
+    def checkpoint(self):
+        """Iflos sahifalarni .uzdb fayllariga yozadi, fsync qiladi va WAL'ni tozalaydi.
+
+        Xato `checkpoint_xatosi` da saqlanadi va keyingi muvaffaqiyatli checkpoint'gacha
+        yozuvchi buyruqlar uni qaytaradi (WAL cheksiz o'smasin).
+        """
+        with self._qulf.yozish():
+            if self.wal.fd is None:
+                return
+            try:
+                self.wal.sinxron()
+                for storage in self.storage.values():
+                    storage.flush()
+                    os.fsync(storage.fd)
+                for daraxt in self.daraxtlar.values():
+                    daraxt.flush()
+                    os.fsync(daraxt.fd)
+                self.wal.tozalash()
+            except Exception as e:
+                self.checkpoint_xatosi = e
+                raise
+            self.checkpoint_xatosi = None
+    
+    def _checkpoint_qadami(self, oraliq: float, kutish: float) -> float:
+        """Fon oqimining bitta qadami; keyingi kutish vaqtini qaytaradi."""
+        if self.wal.yozuvlar_soni:
+            try:
+                self.checkpoint()
+            except Exception:
+                # Oqim to'xtamaydi: oraliq CHECKPOINT_KUTISH_MAX gacha ikkilanib qayta uriniladi
+                logging.getLogger(__name__).exception("Fon checkpoint bajarilmadi: %s", self.db_path)
+                return min(kutish * 2, max(oraliq, CHECKPOINT_KUTISH_MAX))
+        try:
+            self._statistika_yangilash()
+        except Exception:
+            logging.getLogger(__name__).exception("Statistika yangilanmadi: %s", self.db_path)
+        return oraliq
+    
+    def _metadata_yukla(self):
+        meta = os.path.join(self.db_path, "metadata.txt")
+        if os.path.exists(meta):
+            with open(meta) as f:
+                for line in f:
+                    parts = line.strip().split('|')
+                    if parts[0] == '@indeks' and len(parts) == 4 and parts[2] in self.jadvallar:
+                        self.indekslar[parts[1]] = IndeksSchema(parts[1], parts[2], parts[3])
+                    elif len(parts) >= 2:
+                        nom = parts[0]
+                        ustunlar = []
+                        for u in parts[1:]:
+                            up = u.split(':')
+                            ustunlar.append(UstunSchema(up[0], up[1] if len(up) > 1 else 'MATN',
+                                                        'PK' in up, 'NN' in up))
+                        self.jadvallar[nom] = JadvalSchema(nom, ustunlar)
+                        self._storage_ochish(nom)
+                        for u in ustunlar:
+                            if u.asosiy_kalit:
+                                self.indekslar[f"{nom}_pkey"] = IndeksSchema(f"{nom}_pkey", nom, u.nom, True)
+    
+    def _metadata_saqlash(self):
+        with open(os.path.join(self.db_path, "metadata.txt"), 'w') as f:
+            for nom, s in self.jadvallar.items():
+                us = '|'.join(f"{u.nom}:{u.tur}" + (":PK" if u.asosiy_kalit else "") for u in s.ustunlar)
+                f.write(f"{nom}|{us}\n")
+            for ind in self.indekslar.values():
+                if not ind.yagona:
+                    f.write(f"@indeks|{ind.nom}|{ind.jadval}|{ind.ustun}\n")
+    
+    def _statistika_yukla(self):
+        fayl = os.path.join(self.db_path, "statistika.bin")
+        if not os.path.exists(fayl):
+            return
+        with open(fayl, 'rb') as f:
+            data = f.read()
+        try:
+            statistikalar, ozgarishlar = statistika_dekodla(data)
+        except (ValueError, struct.error, UnicodeDecodeError):
+            return  # statistika faqat maslahat - buzilgan bo'lsa taxminlar standart qiymatlarga qaytadi
+        self.statistikalar = {j: s for j, s in statistikalar.items() if j in self.jadvallar}
+        self._ozgarishlar = {j: n for j, n in ozgarishlar.items() if j in self.jadvallar}
+
+    def _statistika_saqlash(self):
+        fayl = os.path.join(self.db_path, "statistika.bin")
+        with self._stat_qulf:
+            with open(fayl + '.yangi', 'wb') as f:
+                f.write(statistika_kodla(self.statistikalar, self._ozgarishlar))
+            os.replace(fayl + '.yangi', fayl)
+
+    def _tahlil(self, sql: str):
+        """(ast, parametrlar) - normallashgan SQL bo'yicha LRU keshdan yoki parse qilib."""
+        kalit = _sql_kaliti(sql)
+        with self._ichki_qulf:
+            topilgan = self._sorov_kesh.get(kalit)
+            if topilgan is not None:
+                self._sorov_kesh.move_to_end(kalit)
+                return topilgan
+        ast = Parser.parse(sql)
+        topilgan = (ast, parametrlar_royxati(ast))
+        with self._ichki_qulf:
+            self._sorov_kesh[kalit] = topilgan
+            if len(self._sorov_kesh) > self.sorov_kesh_hajmi:
+                self._sorov_kesh.popitem(last=False)
+        return topilgan
+
+    def _boglangan(self, sql: str, parametrlar=None):
+        ast, nomlar = self._tahlil(sql)
+        if not nomlar:
+            return ast
+        if parametrlar is None:
+            raise ValueError(f"So'rovda {len(nomlar)} ta parametr bor, qiymatlari berilmagan")
+        return parametrlarni_bogla(ast, parametrlar)
+
+    def bajar(self, sql: str, parametrlar=None):
+        """`parametrlar` - `?` lar uchun ketma-ketlik yoki `:nom` lar uchun lug'at."""
+        if not self.natija_kesh_hajmi:
+            return self._bajar_qulfli(self._boglangan(sql, parametrlar))
+        return self._keshli_bajar(_natija_kaliti(_sql_kaliti(sql), parametrlar),
+                                  lambda: self._boglangan(sql, parametrlar))
+
+    def _jadval_qulfi(self, jadval: str) -> OqishYozishQulfi:
+        with self._ichki_qulf:
+            qulf = self._jadval_qulflari.get(jadval)
+            if qulf is None:
+                qulf = self._jadval_qulflari[jadval] = OqishYozishQulfi()
+            return qulf
+
+    @contextlib.contextmanager
+    def _qulflangan(self, ast):
+        """Buyruq uchun kerakli qulflar ostida. Jadval qulflari nom tartibida olinadi - ikki so'rov
+        bir-birini kutib qolmaydi."""
+        if isinstance(ast, TushuntirBuyruq):
+            ast = ast.buyruq
+        if isinstance(ast, (JadvalYaratBuyruq, IndeksYaratBuyruq, SiqishBuyruq)):
+            with self._qulf.yozish():
+                yield
+            return
+        if isinstance(ast, TanlashBuyruq):
+            yozish = dict.fromkeys([ast.jadval] + [q.jadval for q in ast.qoshilishlar or []], False)
+        else:
+            yozish = {ast.jadval: not isinstance(ast, TahlilQilBuyruq)}
+        with self._qulf.oqish(), contextlib.ExitStack() as stek:
+            for jadval in sorted(yozish):
+                qulf = self._jadval_qulfi(jadval)
+                stek.enter_context(qulf.yozish() if yozish[jadval] else qulf.oqish())
+            xato = self.checkpoint_xatosi
+            if xato is not None and any(yozish.values()):
+                raise ValueError(f"Checkpoint bajarilmadi, yozish to'xtatilgan: {xato} "
+                                 "(db.checkpoint() bilan qayta urining)") from xato
+            yield
+
+    def _bajar_qulfli(self, ast):
+        with self._qulflangan(ast):
+            return self._bajar_ast(ast)
+
+    def _keshli_bajar(self, kalit, bogla):
+        """TANLASH natijasini keshdan beradi yoki `bogla()` AST ini bajarib keshga yozadi.
+
+        Yozuv o'qilgan jadvallarning versiyalari bilan saqlanadi; birortasi o'zgargan bo'lsa
+        yozuv eskirgan hisoblanadi. Versiyalar jadval qulflari ostida, so'rovdan oldin olinadi.
+        Chaqiruvchi qatorlarning nusxasini oladi.
+        """
+        with self._ichki_qulf:
+            yozuv = self._natija_kesh.get(kalit)
+            if yozuv is not None:
+                if all(self._versiyalar.get(j, 0) == v for j, v in yozuv[1]):
+                    self._natija_kesh.move_to_end(kalit)
+                    self.kesh_topildi += 1
+                    return [dict(row) for row in yozuv[0]]
+                self._natija_kesh_bayt -= self._natija_kesh.pop(kalit)[2]
+        ast = bogla()
+        if not isinstance(ast, TanlashBuyruq):
+            return self._bajar_qulfli(ast)
+        jadvallar = [ast.jadval] + [q.jadval for q in ast.qoshilishlar or []]
+        with self._qulflangan(ast):
+            with self._ichki_qulf:
+                self.kesh_topilmadi += 1
+                versiyalar = tuple((j, self._versiyalar.get(j, 0)) for j in jadvallar)
+            natija = self._bajar_ast(ast)
+        bayt = _natija_hajmi(natija)
+        if bayt <= self.natija_kesh_xotirasi:
+            with self._ichki_qulf:
+                eski = self._natija_kesh.pop(kalit, None)
+                if eski is not None:
+                    self._natija_kesh_bayt -= eski[2]
+                self._natija_kesh[kalit] = (natija, versiyalar, bayt)
+                self._natija_kesh_bayt += bayt
+                while (len(self._natija_kesh) > self.natija_kesh_hajmi
+                       or self._natija_kesh_bayt > self.natija_kesh_xotirasi):
+                    self._natija_kesh_bayt -= self._natija_kesh.popitem(last=False)[1][2]
+        return [dict(row) for row in natija]
+
+    def _versiya_oshir(self, jadval: str):
+        """Jadvalga yozishdan oldin: uni o'qigan natija keshi yozuvlari eskiradi."""
+        with self._ichki_qulf:
+            self._versiyalar[jadval] = self._versiyalar.get(jadval, 0) + 1
+
+    def kesh_holati(self) -> Dict[str, int]:
+        """Natija keshi hisoblagichlari."""
+        with self._ichki_qulf:
+            return {'topildi': self.kesh_topildi, 'topilmadi': self.kesh_topilmadi,
+                    'yozuvlar': len(self._natija_kesh), 'bayt': self._natija_kesh_bayt}
+
+    def tayyorla(self, sql: str) -> 'TayyorSorov':
+        """So'rovni bir marta parse qilib, qayta ishlatiladigan tayyor so'rov qaytaradi."""
+        ast, nomlar = self._tahlil(sql)
+        return TayyorSorov(self, sql, ast, nomlar)
+    
+    def _bajar_ast(self, ast):
+        if isinstance(ast, JadvalYaratBuyruq): return self._jadval_yarat(ast)
+        if isinstance(ast, IndeksYaratBuyruq): return self._indeks_yarat(ast)
+        if isinstance(ast, YuklashBuyruq): return self._yuklash(ast)
+        if isinstance(ast, QoshBuyruq): return self._qosh(ast)
+        if isinstance(ast, TanlashBuyruq): return self._tanlash(ast)
+        if isinstance(ast, YangilashBuyruq): return self._yangilash(ast)
+        if isinstance(ast, OchirBuyruq): return self._ochir(ast)
+        if isinstance(ast, SiqishBuyruq): return self._siqish(ast)
+        if isinstance(ast, TushuntirBuyruq): return self._tushuntir(ast)
+        if isinstance(ast, TahlilQilBuyruq): return self._tahlil_qil(ast)
+        raise ValueError(f"Noma'lum: {type(ast)}")
+    
+    def _jadval_yarat(self, ast):
+        if ast.nom in self.jadvallar:
+            raise ValueError(f"Jadval mavjud: {ast.nom}")
+        ustunlar = [UstunSchema(u['nom'], u.get('tur', 'MATN'), 'ASOSIY_KALIT' in u.get('cheklovlar', []),
+                                'BOSH_EMAS' in u.get('cheklovlar', [])) for u in ast.ustunlar]
+        self.jadvallar[ast.nom] = JadvalSchema(ast.nom, ustunlar)
+        storage = self._storage_ochish(ast.nom)
+        storage.allocate()
+        storage.flush()
+        os.fsync(storage.fd)
+        for u in ustunlar:
+            if u.asosiy_kalit:
+                self._indeks_ochish(IndeksSchema(f"{ast.nom}_pkey", ast.nom, u.nom, True), qayta_qurish=True)
+        self._metadata_saqlash()
+        return f"✅ Jadval yaratildi: {ast.nom}"
+    
+    def _indeks_yarat(self, ast):
+        if ast.jadval not in self.jadvallar:
+            raise ValueError(f"Jadval topilmadi: {ast.jadval}")
+        if self.jadvallar[ast.jadval].ustun(ast.ustun) is None:
+            raise ValueError(f"Ustun topilmadi: {ast.ustun}")
+        if ast.nom in self.indekslar:
+            raise ValueError(f"Indeks mavjud: {ast.nom}")
+        self._indeks_ochish(IndeksSchema(ast.nom, ast.jadval, ast.ustun), qayta_qurish=True)
+        self._metadata_saqlash()
+        return f"✅ Indeks yaratildi: {ast.nom}"
+    
+    def bajar_kop(self, sql: str, qatorlar):
+        """Bir marta parse qilingan QO'SH bilan ko'p qator qo'shish.
+
+        `sql` - `QO'SH ICHIGA jadval (ustunlar)` sarlavhasi yoki bitta parametrli qatorli
+        shablon (`... QIYMATLAR (?, ?, 'doimiy')`); har bir qator shablonga bog'lanadi.
+        """
+        ast, nomlar = self._tahlil(sql)
+        if not isinstance(ast, QoshBuyruq):
+            raise ValueError("bajar_kop faqat QO'SH buyrug'i uchun")
+        if not ast.qiymatlar:
+            qiymatlar = [list(q) for q in qatorlar]
+        elif len(ast.qiymatlar) == 1 and nomlar:
+            shablon = ast.qiymatlar[0]
+            qiymatlar = [parametrlarni_bogla(shablon, q) for q in qatorlar]
+        else:
+            raise ValueError("bajar_kop: QIYMATLAR faqat bitta parametrli qator bo'lishi mumkin")
+        return self._bajar_qulfli(QoshBuyruq(ast.jadval, ast.ustunlar, qiymatlar))
+    
+    def _yuklash(self, ast):
+        """CSV/JSONL faylni oqim bilan o'qib, to'la sahifalarni to'g'ridan-to'g'ri fayl oxiriga yozadi.
+
+        Tokenizer/parser va WAL chetlab o'tiladi; oxirida fayl fsync qilinadi va
+        indekslar saralangan kalitlardan bir marta qayta quriladi. Xato bo'lsa
+        fayl avvalgi hajmiga qaytariladi.
+        """
+        if ast.jadval not in self.jadvallar:
+            raise ValueError(f"Jadval topilmadi: {ast.jadval}")
+        fayl = self._yuklash_fayli(ast.fayl)
+        self._versiya_oshir(ast.jadval)
+        schema = self.jadvallar[ast.jadval]
+        storage = self.storage[ast.jadval]
+        indekslar = [(ind, schema.ustun(ind.ustun).tur, TashqiSaralash(self.db_path))
+                     for ind in self._jadval_indekslari(ast.jadval)]
+        storage.flush()
+        boshlangich = storage.sahifalar_soni
+        sahifalar: List[Page] = []
+        yangi_fayllar: List[Tuple[IndeksSchema, str]] = []
+        page, soni = Page(storage.sahifalar_soni), 0
+
+        def yozish():
+            if sahifalar:
+                _pwrite(storage.fd, b''.join(p.data for p in sahifalar), sahifalar[0].page_id * PAGE_SIZE)
+                sahifalar.clear()
+
+        try:
+            kodek = schema.kodek
+            for qator_no, row in enumerate(self._fayl_qatorlari(fayl, schema), 1):
+                q = kodek.normallash(row)
+                hajm = kodek.hajm(q)
+                slot = page.insert_kodlangan(kodek, q, hajm)
+                if slot is None:
+                    if page.num_rows == 0:
+                        raise ValueError(f"{qator_no}-qator sahifaga sig'maydi")
+                    sahifalar.append(page)
+                    if len(sahifalar) >= 64:
+                        yozish()
+                    page = Page(page.page_id + 1)
+                    slot = page.insert_kodlangan(kodek, q, hajm)
+                for ind, tur, saralash in indekslar:
+                    saralash.qosh((_indeks_kaliti(tur, row.get(ind.ustun)), (page.page_id, slot)))
+                soni += 1
+            if page.num_rows:
+                sahifalar.append(page)
+            yozish()
+            storage.sahifalar_soni = page.page_id + (1 if page.num_rows else 0)
+            for ind, _, saralash in indekslar:
+                yangi_fayllar.append((ind, self._indeks_birlashtirish(ind, saralash)))
+        except BaseException:
+            for _, _, saralash in indekslar:
+                saralash.tozalash()
+            for _, vaqtincha in yangi_fayllar:
+                os.remove(vaqtincha)
+            os.ftruncate(storage.fd, boshlangich * PAGE_SIZE)
+            storage.sahifalar_soni = boshlangich
+            raise
+        os.fsync(storage.fd)
+        storage.flush()
+        for ind, vaqtincha in yangi_fayllar:
+            eski = self.daraxtlar[ind.nom]
+            eski.close()
+            os.replace(vaqtincha, eski.filename)
+            self.daraxtlar[ind.nom] = BPlusDaraxt(eski.filename)
+        self._ozgardi(ast.jadval, soni)
+        return f"✅ {soni} ta qator yuklandi"
+    
+    def _yuklash_fayli(self, fayl: str) -> str:
+        """Yo'lni (symlink'lar bilan) ochib, import papkasidan tashqariga chiqmasligini tekshiradi.
+
+        Nisbiy yo'l jarayonning joriy papkasiga emas, import papkasiga nisbatan olinadi.
+        """
+        if self.yuklash_papkasi is None:
+            raise ValueError("YUKLASH bu bazada o'chirilgan")
+        yol = os.path.realpath(os.path.join(self.yuklash_papkasi, fayl))
+        try:
+            ichida = os.path.commonpath([yol, self.yuklash_papkasi]) == self.yuklash_papkasi
+        except ValueError:
+            ichida = False
+        if not ichida:
+            raise ValueError(f"YUKLASH faqat import papkasidagi fayllarni o'qiydi: {fayl}")
+        if not os.path.isfile(yol):
+            raise ValueError(f"Fayl topilmadi: {fayl}")
+        return yol
+
+    def _fayl_qatorlari(self, fayl: str, schema: JadvalSchema):
+        # Xabarlarda fayl mazmuni ko'rsatilmaydi - faqat yozuv va maydon raqami
+        with open(fayl, newline='', encoding='utf-8') as f:
+            if fayl.lower().endswith(('.jsonl', '.ndjson')):
+                manba = (json.loads(satr) for satr in f if satr.strip())
+            else:
+                manba = csv.DictReader(f)
+            for qator_no, yozuv in enumerate(manba, 1):
+                if not isinstance(yozuv, dict):
+                    raise ValueError(f"{qator_no}-yozuv obyekt emas")
+                row = {}
+                for i, (k, v) in enumerate(yozuv.items(), 1):
+                    ustun = schema.ustun(k) if isinstance(k, str) else None
+                    if ustun is None:
+                        raise ValueError(f"{qator_no}-yozuvning {i}-maydoni jadval ustuni emas")
+                    try:
+                        row[k] = _qiymat_moslash(ustun, v)
+                    except ValueError:
+                        raise ValueError(f"{qator_no}-yozuv, {ustun.nom}: {ustun.tur} kutilgan") from None
+                yield row
+    
+    def _indeks_birlashtirish(self, ind: IndeksSchema, yangilar: TashqiSaralash) -> str:
+        """Mavjud indeks yozuvlari va yangi saralangan kalitlardan vaqtinchalik faylda yangi daraxt quradi."""
+        eski = self.daraxtlar[ind.nom]
+        vaqtincha = eski.filename + '.yangi'
+        if os.path.exists(vaqtincha):
+            os.remove(vaqtincha)
+        daraxt = BPlusDaraxt(vaqtincha, self.jadvallar[ind.jadval].ustun(ind.ustun).tur, ind.yagona)
+        try:
+            daraxt.ommaviy_qurish(heapq.merge(eski.oraliq(), yangilar))
+        except BaseException:
+            daraxt.close()
+            os.remove(vaqtincha)
+            raise
+        daraxt.close()
+        return vaqtincha
+    
+    def _qosh(self, ast):
+        if ast.jadval not in self.jadvallar:
+            raise ValueError(f"Jadval topilmadi: {ast.jadval}")
+        self._versiya_oshir(ast.jadval)
+        if not ast.qiymatlar:
+            raise ValueError("QIYMATLAR kutiladi")
+        schema = self.jadvallar[ast.jadval]
+        ustunlar = []
+        for u in ast.ustunlar:
+            ustun = schema.ustun(u)
+            if ustun is None:
+                raise ValueError(f"Ustun topilmadi: {u}")
+            ustunlar.append(ustun)
+        indekslar = [(ind, schema.ustun(ind.ustun).tur, self.daraxtlar[ind.nom])
+                     for ind in self._jadval_indekslari(ast.jadval)]
+        # Avval har bir qiymat tur va chegaralarga moslanadi, hajm va cheklovlar tekshiriladi -
+        # shundan keyin kodek.yoz xato bermaydi va heap'ga yarim qator yozilmaydi
+        kodek = schema.kodek
+        kodlangan, kalitlar = [], []
+        korilgan = [set() for _ in indekslar]
+        for qiymatlar in ast.qiymatlar:
+            if len(qiymatlar) != len(ast.ustunlar):
+                raise ValueError(f"Ustunlar soni ({len(ast.ustunlar)}) va qiymatlar soni ({len(qiymatlar)}) mos emas")
+            row = {u.nom: _qiymat_moslash(u, v) for u, v in zip(ustunlar, qiymatlar)}
+            q = kodek.normallash(row)
+            hajm = kodek.hajm(q)
+            if hajm > PAGE_SIZE - HEADER_SIZE - SLOT_SIZE:
+                raise ValueError("Qator sahifaga sig'maydi")
+            kodlangan.append((q, hajm))
+            qator_kalitlari = []
+            for (ind, tur, daraxt), kor in zip(indekslar, korilgan):
+                kalit = _indeks_kaliti(tur, row.get(ind.ustun))
+                if ind.yagona:
+                    if kalit in kor or daraxt.bormi(kalit):
+                        raise ValueError(f"Takroriy kalit: {ind.ustun} = {kalit}")
+                    kor.add(kalit)
+                qator_kalitlari.append(kalit)
+            kalitlar.append(qator_kalitlari)
+        storage = self.storage[ast.jadval]
+        page, ridlar = None, []
+        try:  # joriy sahifa WAL'ga yozilguncha qadalgan
+            for q, hajm in kodlangan:
+                slot = None if page is None else page.insert_kodlangan(kodek, q, hajm)
+                if slot is None:
+                    if page is not None:
+                        storage.fsm_yangila(page)
+                        self.wal.yoz(ast.jadval, page)
+                        storage.yech(page)
+                        page = None
+                    page = storage.joy_top(hajm, qada=True)
+                    slot = page.insert_kodlangan(kodek, q, hajm)
+                ridlar.append((page.page_id, slot))
+            storage.fsm_yangila(page)
+            lsn = self.wal.yoz(ast.jadval, page)
+        finally:
+            if page is not None:
+                storage.yech(page)
+        for rid, qator_kalitlari in zip(ridlar, kalitlar):
+            for (_, _, daraxt), kalit in zip(indekslar, qator_kalitlari):
+                daraxt.qosh(kalit, rid, tekshir=False)
+        self.wal.tasdiqla(lsn)
+        self._ozgardi(ast.jadval, len(kodlangan))
+        return f"✅ {len(kodlangan)} ta qator qo'shildi"
+    
+    def bajar_kursor(self, sql: str, parametrlar=None):
+        """TANLASH natijasini ro'yxatga yig'may, qatorlarni birma-bir qaytaradi.
+
+        Qulflar faqat har bir qatorni olish vaqtida ushlanadi - qatorlar orasida boshqa oqimlar
+        yozishi mumkin. Jadval oraliqda SIQISH bilan qayta yozilsa kursor xato beradi.
+        """
+        ast = self._boglangan(sql, parametrlar)
+        if not isinstance(ast, TanlashBuyruq):
+            raise ValueError("bajar_kursor faqat TANLASH uchun")
+        jadvallar = [ast.jadval] + [q.jadval for q in ast.qoshilishlar or []]
+        with self._qulflangan(ast):
+            oqim = iter(self._reja(ast))
+            fayllar = [self.storage.get(j) for j in jadvallar]
+        while True:
+            with self._qulflangan(ast):
+                if any(self.storage.get(j) is not f for j, f in zip(jadvallar, fayllar)):
+                    raise ValueError("Kursor eskirdi: jadval SIQISH bilan qayta yozildi")
+                row = next(oqim, _TUGADI)
+            if row is _TUGADI:
+                return
+            yield row
+    
+    def _tanlash(self, ast):
+        return list(self._reja(ast))
+
+    def _tushuntir(self, ast):
+        """Reja daraxti, har satrda operator va narx/qatorlar taxmini. TAHLIL bilan so'rov bajariladi
+        va har bir operatorning haqiqiy qatorlari, vaqti va sahifa murojaatlari ham chiqadi."""
+        op = self._reja(ast.buyruq)
+        if not ast.tahlil:
+            return [{'reja': s} for s in reja_satrlari(op)]
+        olchovlar = olchovlarni_ulash(op, self.pool)
+        boshlash = time.perf_counter()
+        for _ in olchovlar[id(op)]:
+            pass
+        vaqt = time.perf_counter() - boshlash
+        satrlar = reja_satrlari(op, olchovlar) + [f"Bajarilish vaqti: {vaqt * 1000:.3f}ms"]
+        return [{'reja': s} for s in satrlar]
+    
+    def _tanlash_ustunlari(self, ast) -> Optional[List[str]]:
+        """TANLASH dagi jadval va ustunlarni tekshiradi; `*` uchun None."""
+        if ast.jadval not in self.jadvallar:
+            raise ValueError(f"Jadval topilmadi: {ast.jadval}")
+        schema = self.jadvallar[ast.jadval]
+        ustunlar = None
+        if not any(isinstance(u, Yulduzcha) for u in ast.ustunlar):
+            ustunlar = [u.nom for u in ast.ustunlar]
+            for u in ustunlar:
+                if schema.ustun(u) is None:
+                    raise ValueError(f"Ustun topilmadi: {u}")
+        for u, _ in ast.tartib or []:
+            if schema.ustun(u) is None:
+                raise ValueError(f"Ustun topilmadi: {u}")
+        for u in shart_ustunlari(ast.shart):
+            if schema.ustun(u) is None:
+                raise ValueError(f"Ustun topilmadi: {u}")
+        return ustunlar
+
+    def _reja(self, ast) -> Operator:
+        """TANLASH ning jismoniy rejasi: skan yo'li va TARTIBLA/CHEGARA usuli narx taxmini bo'yicha tanlanadi."""
+        if ast.qoshilishlar or ast.taxallus is not None or _nuqtali(ast):
+            return self._qoshilish_rejasi(ast)
+        if ast.guruh is not None or any(isinstance(u, Agregat) for u in ast.ustunlar):
+            return self._agregat_rejasi(ast)
+        ustunlar = self._tanlash_ustunlari(ast)
+        schema = self.jadvallar[ast.jadval]
+        # skan faqat natija va tartib uchun kerakli ustunlarni dekodlaydi
+        kerakli = None
+        if ustunlar is not None:
+            kerakli = list(dict.fromkeys(ustunlar + [u for u, _ in ast.tartib or []]))
+        op = self._skan_operatori(ast.jadval, ast.shart, kerakli, parallel=ast.chegara is None or bool(ast.tartib))
+        if ast.tartib and ast.chegara is not None and isinstance(op, SeqScan) and op.shart is None:
+            # Shart yo'q: uyumda kodlangan qatorlar, faqat g'oliblar to'liq dekodlanadi
+            op.xom = True
+            kalit_oqi = schema.kodek.oquvchi(list(dict.fromkeys(u for u, _ in ast.tartib)))
+            op = self._tartib_chegara(op, ast.tartib, ast.chegara, oqi=kalit_oqi,
+                                      yakun=schema.kodek.oquvchi(kerakli))
+        else:
+            op = self._tartib_chegara(op, ast.tartib, ast.chegara)
+        if ast.tartib and ast.chegara is not None:
+            tartibli = self._tartibli_skan(ast, kerakli)
+            if tartibli is not None and tartibli.baho()[1] < op.baho()[1]:
+                op = tartibli
+        if ustunlar is not None:
+            op = Proyeksiya(op, ustunlar)
+        return op
+
+    def _tartibli_skan(self, ast, ustunlar: Optional[List[str]]) -> Optional[Operator]:
+        """`TARTIBLA u OSHISH CHEGARA k` va u da indeks: qatorlar indeks tartibida o'qiladi,
+        k ta mos qator topilgach to'xtaydi - saralash ham, butun jadvalni o'qish ham yo'q."""
+        if len(ast.tartib) != 1 or ast.tartib[0][1] != 'OSHISH':
+            return None
+        jadval, ustun = ast.jadval, ast.tartib[0][0]
+        ind = next((i for i in self._jadval_indekslari(jadval) if i.ustun == ustun), None)
+        if ind is None:
+            return None
+        oraliq = next((tuple(o) for i, *o in self._indeks_rejalari(jadval, ast.shart) if i.nom == ind.nom),
+                      (None, True, None, True))
+        n, storage = self._qatorlar_soni(jadval), self.storage[jadval]
+        m = n * self._oraliq_tanlanuvchanligi(jadval, ustun, *oraliq)
+        mos = n * self._tanlanuvchanlik(jadval, ast.shart)
+        # oraliqdagi qatorlarning qancha qismi shartdan o'tadi -> k ta uchun nechtasini o'qish kerak
+        ulush = min(1.0, mos / m) if m > 0 else 1.0
+        oqiladi = min(m, ast.chegara / ulush) if ulush > 0 else m
+        narx = self._indeks_narxi(storage.sahifalar_soni, oqiladi)
+        if ustunlar is not None:
+            ustunlar = list(dict.fromkeys(ustunlar + shart_ustunlari(ast.shart)))
+        op = IndeksScan(jadval, storage, self.jadvallar[jadval], ind, self.daraxtlar[ind.nom], oraliq,
+                        ustunlar).baholash(oqiladi, narx)
+        if ast.shart is not None:
+            op = Filtr(op, predikat_yarat(ast.shart)).baholash(oqiladi * ulush, narx)
+        return Chegara(op, ast.chegara).baholash(min(ast.chegara, mos), narx)
+
+    def _guruhlar_soni(self, guruh: List[Tuple[str, str]], qatorlar: float) -> float:
+        """GURUHLA natijasidagi guruhlar taxmini; `guruh` - (jadval, ustun) juftlari."""
+        if not guruh:
+            return 1.0
+        n = 1.0
+        for jadval, ustun in guruh:
+            n *= self._farqli_soni(jadval, ustun)
+        return max(1.0, min(n, qatorlar))
+    
+    def _agregat_rejasi(self, ast) -> Operator:
+        """Agregatli/GURUHLA li TANLASH: HashAgregat; shartsiz faqat SANASH(*) - sahifa sarlavhalaridan."""
+        if ast.jadval not in self.jadvallar:
+            raise ValueError(f"Jadval topilmadi: {ast.jadval}")
+        schema = self.jadvallar[ast.jadval]
+        guruh = ast.guruh or []
+        agregatlar = [u for u in ast.ustunlar if isinstance(u, Agregat)]
+        for u in guruh + [a.ustun for a in agregatlar if a.ustun] + shart_ustunlari(ast.shart):
+            if schema.ustun(u) is None:
+                raise ValueError(f"Ustun topilmadi: {u}")
+        for u in ast.ustunlar:
+            if isinstance(u, Yulduzcha):
+                raise ValueError("GURUHLA/agregat bilan * ishlatib bo'lmaydi")
+            if isinstance(u, Ustun) and u.nom not in guruh:
+                raise ValueError(f"{u.nom} GURUHLA da yoki agregat ichida bo'lishi kerak")
+            if isinstance(u, Agregat) and u.funksiya in ('YIGINDI', 'ORTACHA') and schema.ustun(u.ustun).tur == 'MATN':
+                raise ValueError(f"{u.nom}: son ustun kutiladi")
+        natija = [u.nom for u in ast.ustunlar]
+        for u, _ in ast.tartib or []:
+            if u not in natija and u not in guruh:
+                raise ValueError(f"Ustun topilmadi: {u}")
+        if not guruh and ast.shart is None and all(a.ustun is None for a in agregatlar):
+            storage = self.storage[ast.jadval]
+            op = SahifaSanash(ast.jadval, storage, natija).baholash(1, storage.sahifalar_soni * NARX_SAHIFA)
+        else:
+            kerakli = list(dict.fromkeys(guruh + [a.ustun for a in agregatlar if a.ustun]))
+            bola = self._skan_operatori(ast.jadval, ast.shart, kerakli, agregat=True)
+            qatorlar, narx = bola.baho()
+            turi = ParallelAgregat if isinstance(bola, ParallelSeqScan) else HashAgregat
+            op = turi(bola, guruh, agregatlar).baholash(
+                self._guruhlar_soni([(ast.jadval, g) for g in guruh], qatorlar), narx + qatorlar * NARX_XESH)
+        return Proyeksiya(self._tartib_chegara(op, ast.tartib, ast.chegara), natija)
+    
+    def _qoshilish_rejasi(self, ast) -> Operator:
+        """QO'SHILISH li (yoki taxallusli) TANLASH.
+
+        Barcha nomlar `taxallus.ustun` ga keltiriladi. QAYERDA ning bitta jadvalga tegishli
+        VA-qismlari o'sha jadval skaniga tushiriladi (CHAP qo'shilishning o'ng tomoniga emas).
+        Har bir qo'shilish uchun narx taxmini bo'yicha: ichki jadval kalitida indeks bo'lsa
+        IndeksliQoshilish, aks holda (yoki u qimmatroq bo'lsa) kichik tomonda qurilgan HashQoshilish.
+        """
+        manbalar = [(ast.taxallus or ast.jadval, ast.jadval)]
+        manbalar += [(q.taxallus or q.jadval, q.jadval) for q in ast.qoshilishlar or []]
+        jadvallar: Dict[str, str] = {}
+        for taxallus, jadval in manbalar:
+            if jadval not in self.jadvallar:
+                raise ValueError(f"Jadval topilmadi: {jadval}")
+            if taxallus in jadvallar:
+                raise ValueError(f"Takroriy jadval nomi: {taxallus} (taxallus bering)")
+            jadvallar[taxallus] = jadval
+        barcha = {f"{t}.{u.nom}": u for t, j in jadvallar.items() for u in self.jadvallar[j].ustunlar}
+
+        def hal(nom: str) -> str:
+            if '.' in nom:
+                if nom.split('.', 1)[0] not in jadvallar:
+                    raise ValueError(f"Jadval topilmadi: {nom.split('.', 1)[0]}")
+                if nom not in barcha:
+                    raise ValueError(f"Ustun topilmadi: {nom}")
+                return nom
+            egalar = [t for t in jadvallar if f"{t}.{nom}" in barcha]
+            if not egalar:
+                raise ValueError(f"Ustun topilmadi: {nom}")
+            if len(egalar) > 1:
+                raise ValueError(f"Noaniq ustun: {nom} ({', '.join(egalar)})")
+            return f"{egalar[0]}.{nom}"
+
+        def taxallusi(nom: str) -> str:
+            return nom.split('.', 1)[0]
+
+        def oddiy(shart):
+            return nomlarni_almashtir(shart, lambda n: n.split('.', 1)[1])
+
+        # natija: (so'rovdagi nom, ichki kalit)
+        guruh = [hal(g) for g in ast.guruh or []]
+        agregatli = ast.guruh is not None or any(isinstance(u, Agregat) for u in ast.ustunlar)
+        chiqish, agregatlar = [], []
+        for u in ast.ustunlar:
+            if isinstance(u, Yulduzcha):
+                if agregatli:
+                    raise ValueError("GURUHLA/agregat bilan * ishlatib bo'lmaydi")
+                chiqish += [(q, q) for q in barcha]
+            elif isinstance(u, Agregat):
+                a = Agregat(u.funksiya, hal(u.ustun) if u.ustun else None)
+                if a.funksiya in ('YIGINDI', 'ORTACHA') and barcha[a.ustun].tur == 'MATN':
+                    raise ValueError(f"{u.nom}: son ustun kutiladi")
+                agregatlar.append(a)
+                chiqish.append((u.nom, a.nom))
+            else:
+                q = hal(u.nom)
+                if agregatli and q not in guruh:
+                    raise ValueError(f"{u.nom} GURUHLA da yoki agregat ichida bo'lishi kerak")
+                chiqish.append((u.nom, q))
+        nomlar = dict(chiqish)
+        tartib = []
+        for u, y in ast.tartib or []:
+            q = nomlar[u] if u in nomlar else hal(u)
+            if agregatli and q not in nomlar.values() and q not in guruh:
+                raise ValueError(f"Ustun topilmadi: {u}")
+            tartib.append((q, y))
+        qismlar = [nomlarni_almashtir(p, hal) for p in _va_qismlari(ast.shart)]
+        ustidalar = [nomlarni_almashtir(q.shart, hal) for q in ast.qoshilishlar or []]
+        kerakli = {q for _, q in chiqish if q in barcha} | set(guruh) | {q for q, _ in tartib if q in barcha}
+        kerakli |= {a.ustun for a in agregatlar if a.ustun}
+        for p in qismlar + ustidalar:
+            kerakli.update(shart_ustunlari(p))
+        ustunlari = {t: [u.nom for u in self.jadvallar[j].ustunlar if f"{t}.{u.nom}" in kerakli]
+                     for t, j in jadvallar.items()}
+        # QAYERDA qismlarini taqsimlash: CHAP qo'shilgan jadval qismlari qo'shilishdan keyin
+        null_tomon = {q.taxallus or q.jadval for q in ast.qoshilishlar or [] if q.chap}
+        tushir: Dict[str, list] = {t: [] for t in jadvallar}
+        keyin = []
+        for p in qismlar:
+            egalar = {taxallusi(n) for n in shart_ustunlari(p)}
+            if len(egalar) == 1 and not egalar & null_tomon:
+                tushir[egalar.pop()].append(p)
+            else:
+                keyin.append(p)
+
+        def skan(t: str, qoshimcha=()):
+            shart = va_birlashtir([oddiy(p) for p in tushir[t] + list(qoshimcha)])
+            return Taxallus(self._skan_operatori(jadvallar[t], shart, ustunlari[t]), t)
+
+        def farqli(nom: str) -> float:
+            t, u = nom.split('.', 1)
+            return self._farqli_soni(jadvallar[t], u)
+
+        def ulush(p) -> float:
+            egalar = {taxallusi(n) for n in shart_ustunlari(p)}
+            if len(egalar) == 1:
+                return self._tanlanuvchanlik(jadvallar[egalar.pop()], oddiy(p))
+            return 1 / FARQLI_STANDART if getattr(p, 'operator', None) == '=' else ORALIQ_STANDART
+
+        birinchi = manbalar[0][0]
+        op, chapdagilar = skan(birinchi), {birinchi}
+        for q, ustida in zip(ast.qoshilishlar or [], ustidalar):
+            t = q.taxallus or q.jadval
+            chap_k, ong_k, ong_qismlar, qolgan = [], [], [], []
+            for p in _va_qismlari(ustida):
+                egalar = {taxallusi(n) for n in shart_ustunlari(p)}
+                if (isinstance(p, Taqqoslash) and p.operator == '=' and isinstance(p.chap, Ustun)
+                        and isinstance(p.ong, Ustun)):
+                    a, b = p.chap.nom, p.ong.nom
+                    if taxallusi(a) == t:
+                        a, b = b, a
+                    if taxallusi(a) in chapdagilar and taxallusi(b) == t:
+                        chap_k.append(a)
+                        ong_k.append(b)
+                        continue
+                if egalar == {t}:
+                    ong_qismlar.append(p)
+                elif egalar <= chapdagilar | {t}:
+                    qolgan.append(p)
+                else:
+                    raise ValueError(f"USTIDA faqat oldingi jadvallar va {t} ustunlarini ishlatishi mumkin")
+            if not chap_k:
+                raise ValueError(f"{t} uchun USTIDA da tenglik sharti kerak (chap.ustun = {t}.ustun)")
+            qoshimcha = predikat_yarat(va_birlashtir(qolgan), null_bilan=True) if qolgan else None
+            jadval = jadvallar[t]
+            # taxmin: har bir kalit juftligi 1/max(farqli) ulush qoldiradi
+            chap_q, chap_narx = op.baho()
+            ong = skan(t, ong_qismlar)
+            ong_q, ong_narx = ong.baho()
+            chiqadi = chap_q * ong_q
+            for a, b in zip(chap_k, ong_k):
+                chiqadi /= max(farqli(a), farqli(b))
+            for p in qolgan:
+                chiqadi *= ulush(p)
+            if q.chap:
+                chiqadi = max(chiqadi, chap_q)
+            qurish_chap = not q.chap and chap_q < ong_q
+            qurish = chap_q if qurish_chap else ong_q
+            narx = chap_narx + ong_narx + (chap_q + ong_q + chiqadi) * NARX_XESH
+            if qurish * 64 * (len(ustunlari[t]) + 2) > self.qoshilish_xotirasi:
+                narx += (chap_q + ong_q) * 2 * NARX_QATOR  # Grace: ikkala tomon diskka yoziladi va o'qiladi
+            op_ = HashQoshilish(op, ong, chap_k, ong_k, [f"{t}.{u}" for u in ustunlari[t]], q.chap,
+                                qurish_chap, qoshimcha, self.db_path, self.qoshilish_xotirasi).baholash(chiqadi, narx)
+            indeks = None
+            if len(chap_k) == 1 and barcha[chap_k[0]].tur == barcha[ong_k[0]].tur:
+                ustun = ong_k[0].split('.', 1)[1]
+                indeks = next((ind for ind in self._jadval_indekslari(jadval) if ind.ustun == ustun), None)
+            if indeks is not None:
+                # har bir tashqi qator uchun indeksdan tushish + mos qatorlarni o'qish
+                oqiladi = chap_q * self._qatorlar_soni(jadval) / self._farqli_soni(jadval, ustun)
+                inarx = (chap_narx + chap_q * NARX_INDEKS_QIDIRUV + oqiladi * (NARX_INDEKS_QATOR + NARX_QATOR)
+                         + _sahifalar_taxmini(self.storage[jadval].sahifalar_soni, oqiladi) * NARX_TASODIFIY)
+                if inarx < narx:
+                    op_ = IndeksliQoshilish(op, jadval, t, self.storage[jadval], self.jadvallar[jadval], indeks,
+                                            self.daraxtlar[indeks.nom], chap_k[0], ustunlari[t],
+                                            va_birlashtir([oddiy(p) for p in tushir[t] + ong_qismlar]),
+                                            qoshimcha, q.chap).baholash(chiqadi, inarx)
+            op = op_
+            chapdagilar.add(t)
+        if keyin:
+            qatorlar, narx = op.baho()
+            for p in keyin:
+                qatorlar *= ulush(p)
+            op = Filtr(op, predikat_yarat(va_birlashtir(keyin), null_bilan=True)).baholash(qatorlar, narx)
+        if agregatli:
+            qatorlar, narx = op.baho()
+            guruhlar = self._guruhlar_soni([(jadvallar[taxallusi(g)], g.split('.', 1)[1]) for g in guruh], qatorlar)
+            op = HashAgregat(op, guruh, agregatlar).baholash(guruhlar, narx + qatorlar * NARX_XESH)
+        op = self._tartib_chegara(op, tartib, ast.chegara)
+        return Proyeksiya(op, [i for _, i in chiqish], [n for n, _ in chiqish])
+    
+    def _tartib_chegara(self, op: Operator, tartib, chegara, oqi=None, yakun=None) -> Operator:
+        """TARTIBLA/CHEGARA: ikkalasi bo'lsa TopK, aks holda Saralash va/yoki Chegara."""
+        qatorlar, narx = op.baho()
+        if tartib and chegara is not None:
+            narx += qatorlar * math.log2(max(chegara, 2)) * NARX_TAQQOSLASH
+            return TopK(op, tartib, chegara, oqi, yakun).baholash(min(chegara, qatorlar), narx)
+        if tartib:
+            narx += qatorlar * math.log2(max(qatorlar, 2)) * NARX_TAQQOSLASH
+            op = Saralash(op, tartib, self.db_path, self.saralash_xotirasi).baholash(qatorlar, narx)
+        if chegara is not None:
+            if not tartib:  # oqim erta to'xtaydi
+                narx *= min(1.0, chegara / max(qatorlar, 1.0))
+            op = Chegara(op, chegara).baholash(min(chegara, qatorlar), narx)
+        return op
+    
+    def tanlash_ustunli(self, sql: str, numpy_bilan: Optional[bool] = None, parametrlar=None) -> Dict[str, Any]:
+        """TANLASH natijasini ustunlar ko'rinishida qaytaradi: {ustun: massiv}.
+
+        BUTUN_SON/HAQIQIY ustunlar NumPy bo'lsa `ndarray` (int64/float64), aks holda
+        `array.array` ('q'/'d'), MATN ustunlar esa object-massiv yoki ro'yxat bo'ladi.
+        `numpy_bilan=False` NumPy o'rnatilgan bo'lsa ham array.array rejimini tanlaydi.
+        """
+        ast = self._boglangan(sql, parametrlar)
+        if not isinstance(ast, TanlashBuyruq):
+            raise ValueError("tanlash_ustunli faqat TANLASH uchun")
+        with self._qulflangan(ast):
+            if ast.guruh is not None or any(isinstance(u, Agregat) for u in ast.ustunlar):
+                raise ValueError("tanlash_ustunli agregatlarni qo'llamaydi - bajar() ishlatilsin")
+            if ast.qoshilishlar or ast.taxallus is not None or _nuqtali(ast):
+                raise ValueError("tanlash_ustunli qo'shilishlarni qo'llamaydi - bajar() ishlatilsin")
+            ustunlar = self._tanlash_ustunlari(ast)
+            schema = self.jadvallar[ast.jadval]
+            if ustunlar is None:
+                ustunlar = [u.nom for u in schema.ustunlar]
+            nomlar = list(dict.fromkeys(ustunlar + [u for u, _ in ast.tartib or []]))
+            skan = UstunliSkan(ast.jadval, self.storage[ast.jadval], schema, nomlar, ast.shart, numpy_bilan)
+            qismlar: Dict[str, list] = {n: [] for n in nomlar}
+            soni = 0
+            for b in skan:
+                for nom, q in b.items():
+                    qismlar[nom].append(q)
+                soni += len(b[nomlar[0]])
+                if ast.chegara is not None and not ast.tartib and soni >= ast.chegara:
+                    break
+            natija = {n: skan.birlashtir(n, q) for n, q in qismlar.items()}
+        tartib = None
+        if ast.tartib:
+            tartib = list(range(soni)) if skan.np is None else skan.np.arange(soni)
+            for u, y in reversed(ast.tartib):
+                qiymatlar = natija[u]
+                if skan.np is None:
+                    tartib.sort(key=qiymatlar.__getitem__, reverse=(y == "KAMAYISH"))
+                elif y == "KAMAYISH":
+                    # barqaror kamayish: teskari ketma-ketlikni o'sish bo'yicha saralab, yana teskari
+                    teskari = qiymatlar[tartib][::-1]
+                    tartib = tartib[::-1][skan.np.argsort(teskari, kind='stable')][::-1]
+                else:
+                    tartib = tartib[skan.np.argsort(qiymatlar[tartib], kind='stable')]
+        if ast.chegara is not None:
+            tartib = (tartib if tartib is not None else range(soni))[:max(ast.chegara, 0)]
+            if skan.np is not None and isinstance(tartib, range):
+                tartib = slice(tartib.start, tartib.stop)
+        if tartib is not None:
+            natija = {n: skan.ol(n, natija[n], tartib) for n in ustunlar}
+        return {n: natija[n] for n in ustunlar}
+
+    def _skan(self, jadval: str, ustunlar: Optional[List[str]] = None):
+        """Jadvalning barcha qatorlari: ((page_id, slot), row)."""
+        return iter(SeqScan(jadval, self.storage[jadval], self.jadvallar[jadval], ustunlar, rid_bilan=True))
+    
+    def _skan_operatori(self, jadval: str, shart, ustunlar: Optional[List[str]] = None,
+                        rid_bilan: bool = False, agregat: bool = False, parallel: bool = True) -> Operator:
+        """Shartga mos qatorlar manbai - narxi eng kichik yo'l: filtrli SeqScan (katta jadvalda
+        parallel ham) yoki indeks oralig'i. `agregat=True` - natija ishchilarning o'zida
+        agregatlanadi, qatorlar jarayonlar orasida uzatilmaydi; `parallel=False` - erta to'xtaydigan
+        iste'molchi (TARTIBLA siz CHEGARA) uchun."""
+        schema, storage = self.jadvallar[jadval], self.storage[jadval]
+        n, sahifalar = self._qatorlar_soni(jadval), storage.sahifalar_soni
+        natija = n * self._tanlanuvchanlik(jadval, shart)
+        narx, eng = sahifalar * NARX_SAHIFA + n * NARX_QATOR, None
+        ishchilar = self._parallel_darajasi(sahifalar) if parallel and not rid_bilan else 1
+        if ishchilar > 1:
+            pnarx = narx / ishchilar + NARX_PARALLEL_BOSHLASH + (0 if agregat else natija * NARX_PARALLEL_QATOR)
+            if pnarx < narx:
+                narx, eng = pnarx, 'parallel'
+        for ind, *oraliq in self._indeks_rejalari(jadval, shart):
+            m = n * self._oraliq_tanlanuvchanligi(jadval, ind.ustun, *oraliq)
+            inarx = self._indeks_narxi(sahifalar, m)
+            if inarx < narx:
+                narx, eng = inarx, (ind, oraliq, m)
+        if eng is None:
+            return SeqScan(jadval, storage, schema, ustunlar, shart, rid_bilan).baholash(natija, narx)
+        if eng == 'parallel':
+            return ParallelSeqScan(jadval, storage, schema, ustunlar, shart, self._ishchilar_havzasi,
+                                   ishchilar).baholash(natija, narx)
+        ind, oraliq, m = eng
+        if ustunlar is not None:
+            ustunlar = list(dict.fromkeys(ustunlar + shart_ustunlari(shart)))
+        op = IndeksScan(jadval, storage, schema, ind, self.daraxtlar[ind.nom], tuple(oraliq), ustunlar, rid_bilan)
+        predikat = predikat_yarat(shart)
+        op = Filtr(op.baholash(m, narx), (lambda x: predikat(x[1])) if rid_bilan else predikat)
+        return op.baholash(natija, narx)
+
+    def _parallel_darajasi(self, sahifalar: int) -> int:
+        if self.parallel_ishchilar > 1 and sahifalar >= self.parallel_chegara:
+            return self.parallel_ishchilar
+        return 1
+
+    def _ishchilar_havzasi(self) -> concurrent.futures.ProcessPoolExecutor:
+        # spawn: fork qilingan bola checkpointer oqimi ushlab turgan qulflarni meros olmasin
+        with self._ichki_qulf:
+            if self._havza is None:
+                self._havza = concurrent.futures.ProcessPoolExecutor(
+                    self.parallel_ishchilar, mp_context=multiprocessing.get_context('spawn'))
+            return self._havza
+
+    @staticmethod
+    def _indeks_narxi(sahifalar: int, qatorlar: float) -> float:
+        """B+Tree oralig'idan `qatorlar` tasini o'qish: tushish, barg yozuvlari va tasodifiy sahifalar."""
+        return (NARX_INDEKS_QIDIRUV + qatorlar * (NARX_INDEKS_QATOR + NARX_QATOR)
+                + _sahifalar_taxmini(sahifalar, qatorlar) * NARX_TASODIFIY)
+
+    def _indeks_rejalari(self, jadval: str, shart) -> List[tuple]:
+        """QAYERDA dagi VA-qismlardan har bir indeksli ustun uchun (indeks, past, past_teng, yuqori, yuqori_teng)."""
+        indekslar = {ind.ustun: ind for ind in self._jadval_indekslari(jadval)}
+        if not indekslar or shart is None:
+            return []
+        schema = self.jadvallar[jadval]
+        oraliqlar: Dict[str, list] = {}
+        for s in _va_qismlari(shart):
+            t = _ustun_literal(s)
+            if t is None or t[0] not in indekslar or t[1] == '!=':
+                continue
+            ustun, op, v = t
+            if isinstance(v, str) != (schema.ustun(ustun).tur == 'MATN'):
+                continue
+            _chegara_qosh(oraliqlar.setdefault(ustun, [None, True, None, True]), op, v)
+        return [(indekslar[u], *o) for u, o in oraliqlar.items()]
+
+    # --- tanlanuvchanlik va hajm taxminlari ---
+
+    def _qatorlar_soni(self, jadval: str) -> float:
+        """Jadval qatorlari: indeks bo'lsa B+Tree yozuvlari soni, statistika bo'lsa uning zichligi
+        bo'yicha, aks holda sahifa sarlavhalari namunasidan."""
+        for ind in self._jadval_indekslari(jadval):
+            return float(self.daraxtlar[ind.nom].soni)
+        storage = self.storage[jadval]
+        n = storage.sahifalar_soni
+        st = self._statistika(jadval)
+        if st is not None and st.sahifalar:
+            return st.qatorlar * n / st.sahifalar
+        if n == 0:
+            return 0.0
+        namuna = range(0, n, max(1, n // 16))
+        return sum(storage.page(i).tirik_soni() for i in namuna) * n / len(namuna)
+
+    def _farqli_soni(self, jadval: str, ustun: str) -> float:
+        """Ustundagi farqli qiymatlar taxmini: yagona ustunda - qatorlar soni."""
+        n = self._qatorlar_soni(jadval)
+        if (self.jadvallar[jadval].ustun(ustun).asosiy_kalit
+                or any(ind.yagona and ind.ustun == ustun for ind in self._jadval_indekslari(jadval))):
+            return max(n, 1.0)
+        us = self._ustun_statistikasi(jadval, ustun)
+        if us is not None:
+            return max(min(us.farqli, n), 1.0)
+        return max(min(n, FARQLI_STANDART), 1.0)
+
+    def _oraliq_tanlanuvchanligi(self, jadval: str, ustun: str, past, past_teng: bool,
+                                 yuqori, yuqori_teng: bool) -> float:
+        """`past <(=) ustun <(=) yuqori` ga mos qatorlar ulushi; None - chegarasiz."""
+        if past is not None and past == yuqori:
+            return self._ustun_tanlanuvchanligi(jadval, ustun, '=', past) if past_teng and yuqori_teng else 0.0
+        us = self._ustun_statistikasi(jadval, ustun)
+        matn = self.jadvallar[jadval].ustun(ustun).tur == 'MATN'
+        if us is None or not us.chegaralar or any(
+                v is not None and isinstance(v, str) != matn for v in (past, yuqori)):
+            return ORALIQ_STANDART ** ((past is not None) + (yuqori is not None))
+        # gistogramma: F(v) - v dan kichiklar ulushi; teng chegara uchun tenglik ulushi qo'shiladi
+        farqli = self._farqli_soni(jadval, ustun)
+        yuqori_f = 1.0 if yuqori is None else us.kichik_ulushi(yuqori) + (
+            us.teng_ulushi(yuqori, farqli) if yuqori_teng else 0.0)
+        past_f = 0.0 if past is None else us.kichik_ulushi(past) + (
+            0.0 if past_teng else us.teng_ulushi(past, farqli))
+        return max(0.0, min(yuqori_f, 1.0) - past_f) * (1 - us.null_ulush)
+
+    def _ustun_tanlanuvchanligi(self, jadval: str, ustun: str, op: str, v) -> float:
+        """`ustun op v` ga mos qatorlar ulushi."""
+        if op in ('=', '!='):
+            teng, tirik = 1 / self._farqli_soni(jadval, ustun), 1.0
+            us = self._ustun_statistikasi(jadval, ustun)
+            if us is not None:
+                tirik = 1 - us.null_ulush
+                teng = us.teng_ulushi(v, 1 / teng) * tirik
+            return teng if op == '=' else tirik - teng
+        if op in ('>', '>='):
+            return self._oraliq_tanlanuvchanligi(jadval, ustun, v, op == '>=', None, True)
+        return self._oraliq_tanlanuvchanligi(jadval, ustun, None, True, v, op == '<=')
+
+    def _tanlanuvchanlik(self, jadval: str, shart) -> float:
+        """Shartga mos qatorlar ulushi (0..1). Qismlar mustaqil deb olinadi: VA - ko'paytma, YOKI -
+        birlashma; bitta ustunning `<`/`>` chegaralari esa bitta oraliq sifatida baholanadi."""
+        if shart is None:
+            return 1.0
+        if isinstance(shart, MantiqiyIfoda) and shart.operator != 'VA':
+            a, b = self._tanlanuvchanlik(jadval, shart.chap), self._tanlanuvchanlik(jadval, shart.ong)
+            return a + b - a * b
+        schema = self.jadvallar[jadval]
+        ulush, oraliqlar = 1.0, {}
+        for p in _va_qismlari(shart):
+            if isinstance(p, MantiqiyIfoda):
+                ulush *= self._tanlanuvchanlik(jadval, p)
+                continue
+            t = _ustun_literal(p)
+            if t is None or schema.ustun(t[0]) is None:
+                ulush *= 1 / FARQLI_STANDART if getattr(p, 'operator', None) == '=' else ORALIQ_STANDART
+            elif t[1] in ('=', '!=') or isinstance(t[2], str) != (schema.ustun(t[0]).tur == 'MATN'):
+                ulush *= self._ustun_tanlanuvchanligi(jadval, *t)
+            else:
+                _chegara_qosh(oraliqlar.setdefault(t[0], [None, True, None, True]), t[1], t[2])
+        for ustun, o in oraliqlar.items():
+            ulush *= self._oraliq_tanlanuvchanligi(jadval, ustun, *o)
+        return ulush
+
+    def _yangilash(self, ast):
+        if ast.jadval not in self.jadvallar:
+            raise ValueError(f"Jadval topilmadi: {ast.jadval}")
+        self._versiya_oshir(ast.jadval)
+        schema, storage = self.jadvallar[ast.jadval], self.storage[ast.jadval]
+        yangi: Dict[str, Any] = {}
+        for nom, v in ast.ozgarishlar:
+            ustun = schema.ustun(nom)
+            if ustun is None:
+                raise ValueError(f"Ustun topilmadi: {nom}")
+            yangi[nom] = _qiymat_moslash(ustun, v)
+        for u in shart_ustunlari(ast.shart):
+            if schema.ustun(u) is None:
+                raise ValueError(f"Ustun topilmadi: {u}")
+        # Avval nishonlar yig'iladi - yozish paytida skan ko'chirilgan qatorga qayta duch kelmaydi
+        nishonlar = list(self._skan_operatori(ast.jadval, ast.shart, None, rid_bilan=True))
+        indekslar = [(ind, schema.ustun(ind.ustun).tur, self.daraxtlar[ind.nom])
+                     for ind in self._jadval_indekslari(ast.jadval) if ind.ustun in yangi]
+        for ind, tur, daraxt in indekslar:
+            if not ind.yagona or not nishonlar:
+                continue
+            kalit = _indeks_kaliti(tur, yangi[ind.ustun])
+            eskilar = {_indeks_kaliti(tur, row.get(ind.ustun)) for _, row in nishonlar}
+            if len(nishonlar) > 1 or (kalit not in eskilar and daraxt.bormi(kalit)):
+                raise ValueError(f"Takroriy kalit: {ind.ustun} = {kalit}")
+        eski_kalitlar = {ind.nom: [(rid, _indeks_kaliti(tur, row.get(ind.ustun))) for rid, row in nishonlar]
+                         for ind, tur, _ in indekslar}
+        kodek = schema.kodek
+        kodlangan = []
+        for rid, row in nishonlar:
+            row.update(yangi)
+            q = kodek.normallash(row)
+            hajm = kodek.hajm(q)
+            if hajm > PAGE_SIZE - HEADER_SIZE - SLOT_SIZE - RID.size:
+                raise ValueError("Qator sahifaga sig'maydi")
+            kodlangan.append((rid, q, hajm))
+        lsn = 0
+        for rid, q, hajm in kodlangan:
+            tegilgan = storage.qator_yangilash(rid, kodek, q, hajm)
+            try:  # sahifalar WAL'ga yozilguncha qadalgan
+                for page in tegilgan:
+                    storage.fsm_yangila(page)
+                    lsn = self.wal.yoz(ast.jadval, page)
+            finally:
+                for page in tegilgan:
+                    storage.yech(page)
+        for ind, tur, daraxt in indekslar:
+            kalit = _indeks_kaliti(tur, yangi[ind.ustun])
+            for rid, eski in eski_kalitlar[ind.nom]:
+                if eski != kalit:
+                    daraxt.ochir(eski, rid)
+                    daraxt.qosh(kalit, rid, tekshir=False)
+        self.wal.tasdiqla(lsn)
+        self._ozgardi(ast.jadval, len(nishonlar))
+        return f"✅ {len(nishonlar)} ta qator yangilandi"
+    
+    def _ochir(self, ast):
+        """Mos qatorlar slotini (0, 0) qiladi; joy FSM orqali keyingi qo'shishlarga beriladi."""
+        if ast.jadval not in self.jadvallar:
+            raise ValueError(f"Jadval topilmadi: {ast.jadval}")
+        self._versiya_oshir(ast.jadval)
+        schema, storage = self.jadvallar[ast.jadval], self.storage[ast.jadval]
+        for u in shart_ustunlari(ast.shart):
+            if schema.ustun(u) is None:
+                raise ValueError(f"Ustun topilmadi: {u}")
+        indekslar = [(ind, schema.ustun(ind.ustun).tur, self.daraxtlar[ind.nom])
+                     for ind in self._jadval_indekslari(ast.jadval)]
+        ustunlar = list(dict.fromkeys(ind.ustun for ind, _, _ in indekslar))
+        nishonlar = list(self._skan_operatori(ast.jadval, ast.shart, ustunlar, rid_bilan=True))
+        tegilgan, lsn = set(), 0
+        for rid, _ in nishonlar:
+            uy = storage.page(rid[0], qada=True)
+            try:
+                joy = uy.yonaltirish(rid[1])
+                if joy is not None:
+                    # ko'chirib kelingan nusxa ham bo'shaydi
+                    page = storage.page(joy[0], qada=True)
+                    try:
+                        page.slot_yoz(joy[1], 0, 0)
+                        lsn = self.wal.yoz(ast.jadval, page)
+                    finally:
+                        storage.yech(page)
+                    tegilgan.add(joy[0])
+                uy.slot_yoz(rid[1], 0, 0)
+                lsn = self.wal.yoz(ast.jadval, uy)
+            finally:
+                storage.yech(uy)
+            tegilgan.add(rid[0])
+        for page_id in sorted(tegilgan):
+            storage.fsm_yangila(storage.page(page_id))
+        for ind, tur, daraxt in indekslar:
+            for rid, row in nishonlar:
+                daraxt.ochir(_indeks_kaliti(tur, row.get(ind.ustun)), rid)
+        self.wal.tasdiqla(lsn)
+        self._ozgardi(ast.jadval, len(nishonlar))
+        return f"✅ {len(nishonlar)} ta qator o'chirildi"
+    
+    def _siqish(self, ast):
+        """Jadvalni yangi faylga zich qayta yozadi va eski fayl o'rniga qo'yadi.
+
+        O'chirilgan joylar va yo'naltirishlar yo'qoladi, rid'lar o'zgaradi - indeks
+        fayllari avval o'chiriladi va yangi heap'dan qayta quriladi (crash bo'lsa ham
+        ochilishda qayta quriladi).
+        """
+        if ast.jadval not in self.jadvallar:
+            raise ValueError(f"Jadval topilmadi: {ast.jadval}")
+        self._versiya_oshir(ast.jadval)
+        schema = self.jadvallar[ast.jadval]
+        # WAL'da eski page_id'li yozuvlar qolmasligi kerak
+        self.checkpoint()
+        storage = self.storage[ast.jadval]
+        eski_soni = storage.sahifalar_soni
+        vaqtincha = storage.filename + '.yangi'
+        with open(vaqtincha, 'wb') as f:
+            page, tirik = Page(0), 0
+            for data in SeqScan(ast.jadval, storage, schema, xom=True):
+                tirik += 1
+                if page.insert(data) is None:
+                    f.write(page.data)
+                    page = Page(page.page_id + 1)
+                    page.insert(data)
+            if page.num_rows:
+                f.write(page.data)
+            f.flush()
+            os.fsync(f.fileno())
+        yangi_soni = page.page_id + (1 if page.num_rows else 0)
+        indekslar = self._jadval_indekslari(ast.jadval)
+        for ind in indekslar:
+            daraxt = self.daraxtlar.pop(ind.nom)
+            daraxt.close()
+            os.remove(daraxt.filename)
+        storage.close()
+        if os.path.exists(storage.fsm_fayl):
+            os.remove(storage.fsm_fayl)
+        os.replace(vaqtincha, storage.filename)
+        self._storage_ochish(ast.jadval)
+        for ind in indekslar:
+            self._indeks_ochish(ind)
+        st = self.statistikalar.get(ast.jadval)
+        if st is not None:  # ustunlar o'zgarmadi, faqat zichlik
+            st.qatorlar, st.sahifalar = tirik, yangi_soni
+            self._statistika_saqlash()
+        return f"✅ {ast.jadval} siqildi: {eski_soni} → {yangi_soni} sahifa"
+
+    def _tahlil_qil(self, ast):
+        if ast.jadval not in self.jadvallar:
+            raise ValueError(f"Jadval topilmadi: {ast.jadval}")
+        st = self._jadval_tahlili(ast.jadval)
+        return f"✅ {ast.jadval} tahlil qilindi: ~{st.qatorlar:.0f} qator, {len(st.ustunlar)} ustun"
+
+    def _jadval_tahlili(self, jadval: str) -> JadvalStatistikasi:
+        """Ustun statistikasini namunadan yig'adi va katalogga yozadi.
+
+        Sahifalar rezervuar usulida tanlanadi; ularning barcha qatorlari NULL ulushi, min/max va
+        HyperLogLog ga, qatorlar rezervuari esa gistogrammalarga ketadi. Jadval to'liq ko'rilmagan
+        bo'lsa, farqli qiymatlar soni qatorlar namunasidan Haas-Stokes (Duj1) bahosi bilan
+        kengaytiriladi (HyperLogLog bahosi - quyi chegara).
+        """
+        schema, storage = self.jadvallar[jadval], self.storage[jadval]
+        tasodif = random.Random(jadval)
+        sahifalar = sorted(_rezervuar(range(len(storage.pages)), STAT_SAHIFALAR, tasodif))
+        nomlar = [u.nom for u in schema.ustunlar]
+        hll = {n: HyperLogLog() for n in nomlar}
+        nullar = dict.fromkeys(nomlar, 0)
+        kichik: Dict[str, Any] = {}
+        katta: Dict[str, Any] = {}
+        oqi = schema.kodek.oquvchi()
+        korilgan = 0
+
+        def qatorlar():
+            nonlocal korilgan
+            for page_id in sahifalar:
+                for _, data in storage.sahifa_qatorlari(storage.page(page_id)):
+                    row = oqi(data)
+                    korilgan += 1
+                    for n in nomlar:
+                        v = row[n]
+                        if v is None:
+                            nullar[n] += 1
+                            continue
+                        hll[n].qosh(v)
+                        if n not in kichik or v < kichik[n]:
+                            kichik[n] = v
+                        if n not in katta or v > katta[n]:
+                            katta[n] = v
+                    yield row
+
+        namuna = _rezervuar(qatorlar(), STAT_QATORLAR, tasodif)
+        toliq = len(sahifalar) == storage.sahifalar_soni
+        jami = korilgan if toliq else korilgan * storage.sahifalar_soni / max(len(sahifalar), 1)
+        ustunlar = {}
+        for n in nomlar:
+            qiymatlar = sorted(row[n] for row in namuna if row[n] is not None)
+            tirik = korilgan - nullar[n]
+            farqli = min(hll[n].baho(), tirik)
+            if not toliq and qiymatlar:
+                r, jami_tirik = len(qiymatlar), jami * tirik / korilgan
+                takrorlar = [len(list(g)) for _, g in itertools.groupby(qiymatlar)]
+                f1 = takrorlar.count(1)
+                duj1 = r * len(takrorlar) / (r - f1 + f1 * r / jami_tirik)
+                farqli = min(max(farqli, duj1), jami_tirik)
+            chegaralar = []
+            if qiymatlar:
+                b = min(STAT_BOLAKLAR, len(qiymatlar) - 1) or 1
+                chegaralar = [qiymatlar[round(i * (len(qiymatlar) - 1) / b)] for i in range(b + 1)]
+            ustunlar[n] = UstunStatistikasi(nullar[n] / korilgan if korilgan else 0.0, max(farqli, 1.0),
+                                            kichik.get(n), katta.get(n), chegaralar)
+        st = JadvalStatistikasi(jami, storage.sahifalar_soni, ustunlar)
+        with self._stat_qulf:
+            self.statistikalar[jadval] = st
+            self._ozgarishlar.pop(jadval, None)
+            self._statistika_saqlash()
+        return st
+
+    def _ozgardi(self, jadval: str, n: int):
+        """Statistikani avtomatik yangilash uchun o'zgargan qatorlar hisobi."""
+        if n:
+            with self._stat_qulf:
+                self._ozgarishlar[jadval] = self._ozgarishlar.get(jadval, 0) + n
+
+    def _statistika(self, jadval: str) -> Optional[JadvalStatistikasi]:
+        # Qulfsiz: katalogga faqat tayyor obyekt bitta amal bilan qo'yiladi, rejalovchilar kutmaydi
+        return self.statistikalar.get(jadval)
+
+    def _statistika_yangilash(self):
+        """Ko'p o'zgargan jadvallarning mavjud statistikasini qayta yig'adi (fon oqimidan).
+
+        Hech qachon TAHLIL_QIL qilinmagan jadvallarga tegilmaydi. Har bir jadval oddiy
+        TAHLIL_QIL kabi - uning o'qish qulfi ostida tahlil qilinadi.
+        """
+        if self.statistika_ulushi is None:
+            return
+        with self._stat_qulf:
+            eskilar = [j for j, st in self.statistikalar.items()
+                       if self._ozgarishlar.get(j, 0) > STAT_AVTO_CHEGARA + self.statistika_ulushi * st.qatorlar]
+        for jadval in eskilar:
+            if not self._toxta.is_set():
+                self._bajar_qulfli(TahlilQilBuyruq(jadval))
+
+    def _ustun_statistikasi(self, jadval: str, ustun: str) -> Optional[UstunStatistikasi]:
+        st = self._statistika(jadval)
+        return st.ustunlar.get(ustun) if st is not None else None
+    
+    def _serialize(self, schema, row):
+        return schema.kodek.kodla(row)
+    
+    def _deserialize(self, schema, data):
+        if not data or len(data) < 4:
+            return None
+        try:
+            return schema.kodek.oquvchi()(data)
+        except (struct.error, UnicodeDecodeError):
+            return None
+    
+    def jadvallar_royxati(self):
+        return list(self.jadvallar.keys())
+    
+    def yopish(self):
+        if self.wal.fd is None:
+            return
+        self._toxta.set()
+        if self._checkpointer is not None:
+            self._checkpointer.join()
+        if self.wal.yozuvlar_soni:
+            self.checkpoint()
+        if self._havza is not None:
+            self._havza.shutdown(cancel_futures=True)
+            self._havza = None
+        with self._qulf.yozish():
+            if self._ozgarishlar:
+                self._statistika_saqlash()
+            for storage in self.storage.values():
+                storage.close()
+            for daraxt in self.daraxtlar.values():
+                daraxt.close()
+            self.wal.close()
+            self._qulf_boshatish()  # qulf fd bilan birga bo'shaydi
+
+
+def _executor_yopish(ref):
+    executor = ref()
+    if executor is not None:
+        executor.yopish()
+
+
+def _checkpoint_oqimi(ref, toxta: threading.Event, oraliq: float):
+    kutish = oraliq
+    while not toxta.wait(kutish):
+        executor = ref()
+        if executor is None:
+            return
+        kutish = executor._checkpoint_qadami(oraliq, kutish)
+        del executor
+
+
+# ============================================================
+# 7. CLI
+# ============================================================
+
+class CLI:
+    def __init__(self, db_path="uzdb_data"):
+        # CLI foydalanuvchisi mahalliy: joriy papkadagi fayllarni ham yuklay oladi
+        self.executor = Executor(db_path, yuklash_papkasi=os.getcwd())
+        self.running = True
+    
+    def boshlash(self):
+        print("""
+╔═══════════════════════════════════════════════════════════╗
+║      🗄️  UZDB - O'ZBEKCHA DATABASE ENGINE                 ║
+║      .yordam - yo'riqnoma  |  .chiqish - chiqish          ║
+╚═══════════════════════════════════════════════════════════╝
+        """)
+        while self.running:
+            try:
+                sql = input("\033[32muzdb\033[0m> ").strip()
                 if not sql:
                     continue
                 if sql.startswith('.'):
@@ -704,6 +4697,7 @@ class CLI:
                 print()
             except EOFError:
                 break
+        self.executor.yopish()
         print("\n👋 Xayr!")
     
     def _bajar(self, sql):
@@ -741,16 +4735,29 @@ class CLI:
 BUYRUQLAR:
   TANLASH * JADVALDAN jadval
   TANLASH ustun1, ustun2 JADVALDAN jadval QAYERDA shart
-  QO'SH ICHIGA jadval (ustunlar) QIYMATLAR (qiymatlar)
+  TANLASH a.ustun, b.ustun JADVALDAN jadval1 a [CHAP] QO'SHILISH jadval2 b USTIDA a.x = b.y
+  QO'SH ICHIGA jadval (ustunlar) QIYMATLAR (qiymatlar), (qiymatlar), ...
   YANGILASH jadval BELGILASH ustun = qiymat QAYERDA shart
   O'CHIR jadval QAYERDA shart
   JADVAL_YARAT jadval (ustun TUR CHEKLOV, ...)
+  INDEKS_YARAT indeks JADVALDA jadval (ustun)
+  YUKLASH jadval FAYLDAN 'fayl.csv'   (yoki .jsonl)
+  SIQISH jadval
+  TAHLIL_QIL jadval
+  TUSHUNTIR [TAHLIL] TANLASH ...
   
-SHELL: .jadvallar, .yordam, .chiqish
+SHELL: .jadvallar, .yuklash jadval fayl, .yordam, .chiqish
             """)
         elif cmd in ('.jadvallar', '.j'):
             for j in self.executor.jadvallar_royxati():
                 print(f"   • {j}")
+        elif cmd.startswith('.yuklash '):
+            qismlar = cmd.split(None, 2)
+            if len(qismlar) != 3:
+                print("   Foydalanish: .yuklash jadval fayl.csv")
+            else:
+                fayl = qismlar[2].replace("'", "''")
+                self._bajar(f"YUKLASH {qismlar[1]} FAYLDAN '{fayl}'")
         else:
             print(f"   Noma'lum: {cmd}")
 
@@ -773,8 +4780,6 @@ if __name__ == "__main__":
         if os.path.exists("demo_db"):
             shutil.rmtree("demo_db")
         
-        ex = Executor("demo_db")
-        
         commands = [
             "JADVAL_YARAT users (id BUTUN_SON ASOSIY_KALIT, ism MATN, yosh BUTUN_SON)",
             "QO'SH ICHIGA users (id, ism, yosh) QIYMATLAR (1, 'Ali', 25)",
@@ -13,7 +13,9 @@ if sys.platform == 'win32':
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
 
 app = Flask(__name__)
-db = Executor("web_db")
+# dashboard so'rovlari qayta-qayta keladi: TANLASH natijalari xotirada keshlanadi
+# YUKLASH server fayllarini o'qiydi - web orqali o'chirilgan (yuklash_papkasi=None)
+db = Executor("web_db", natija_kesh_hajmi=1024, yuklash_papkasi=None)
 
 @app.route('/')
 def index():
@@ -383,7 +385,8 @@ def execute():
         if not sql:
             return jsonify({'success': False, 'error': 'SQL so\'rov bo\'sh'})
 
-        result = db.bajar(sql)
+        # ixtiyoriy: ?/:nom parametrlari uchun ro'yxat yoki lug'at
+        result = db.bajar(sql, data.get('parametrlar'))
 
         if isinstance(result, list):
             return jsonify({'success': True, 'result': result, 'type': 'table'})
@@ -401,6 +404,10 @@ def tables():
     except Exception as e:
         return jsonify({'tables': [], 'error': str(e)})
 
+@app.route('/kesh')
+def kesh():
+    return jsonify(db.kesh_holati())
+
 if __name__ == '__main__':
     print("""
 ╔═══════════════════════════════════════════════════════════════╗
@@ -414,4 +421,6 @@ if __name__ == '__main__':
 ║                                                               ║
 ╚═══════════════════════════════════════════════════════════════╝
     """)
-    app.run(debug=True, host='0.0.0.0', port=5001)
+    # threaded: so'rovlar parallel oqimlarda - Executor jadval qulflari bilan himoyalangan.
+    # use_reloader=False: reloader bazani ikkinchi jarayonda ochib fayl qulfiga urilardi.
+    app.run(debug=True, host='0.0.0.0', port=5001, threaded=True, use_reloader=False)